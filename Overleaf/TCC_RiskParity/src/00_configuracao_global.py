@@ -31,11 +31,14 @@ class ConfiguracaoGlobal:
         self.tables_dir = self.projeto_root / "docs" / "Overleaf" / "tables"
         self.robustez_dir = self.projeto_root / "docs" / "Overleaf" / "robustez"
         self.src_dir = self.projeto_root / "src"
+        self.data_dir = self.projeto_root / "data" / "DataBase"
+        self.cache_dir = self.projeto_root / "data" / "cache"
         
         # Criar diretórios se não existirem
         dirs_to_create = [
             self.results_dir, self.figures_dir, 
-            self.tables_dir, self.robustez_dir
+            self.tables_dir, self.robustez_dir,
+            self.cache_dir
         ]
         for directory in dirs_to_create:
             directory.mkdir(parents=True, exist_ok=True)
@@ -136,6 +139,27 @@ class ConfiguracaoGlobal:
             'autocorr_min': -0.30            # Autocorrelação mínima
         }
         
+        # === MOTOR DE SINAIS (LOOKBACKS EM MESES) ===
+        self.MOTOR_SINAIS = {
+            'momentum': [3, 6, 12],            # Momentum L-1 (exclui o último mês)
+            'volatilidade': [6, 12, 24, 48],
+            'max_drawdown': [12, 24, 48],
+            'downside': [12, 24, 48]           # 48 = janela da seleção (SELECAO_ROLLING)
+        }
+        
+        # === ÍNDICE DATADO DE LIQUIDEZ ===
+        self.INDICE_LIQUIDEZ = {
+            'janela_dias': 252    # Pregões da janela móvel dos filtros de liquidez (~1 ano)
+        }
+        
+        # === CAPACIDADE DAS ESTRATÉGIAS ===
+        self.CAPACIDADE = {
+            'janela_dias': 63,              # Pregões das médias móveis (ADTV e Amihud, ~3 meses)
+            'participacao_max': 0.10,       # Fração máxima do volume diário negociado pela carteira
+            'dias_liquidacao': 1,           # Pregões para montar/desmontar as posições
+            'aum_referencia': 100_000_000   # R$ 100M para dias de negociação e impacto
+        }
+        
         # === RESTRIÇÕES DE CARTEIRA ===
         self.WEIGHT_CONSTRAINTS = {
             'peso_min': 0.00,           # 0% mínimo por ativo
@@ -144,6 +168,15 @@ class ConfiguracaoGlobal:
             'setores_min': 3            # Mínimo 3 setores
         }
         
+        # === CLASSIFICAÇÃO SETORIAL ===
+        self.SETORES = {
+            'arquivo': 'economatica (1).xlsx',        # Cadastro de ativos em data/DataBase
+            'linha_cabecalho': 3,                     # Cabeçalho na 4ª linha do export
+            'coluna_codigo': 'Código',
+            'coluna_setor': 'Setor Econômico Bovespa',  # 12 setores B3 (quebras de linha ignoradas)
+            'setor_ausente': 'Desconhecido'           # Ativos fora do cadastro
+        }
+        
         # === PERÍODOS TEMPORAIS ===
         self.PERIODOS = {
             'estimacao_inicio': '2016-01-01',
@@ -153,10 +186,28 @@ class ConfiguracaoGlobal:
             'rebalance_meses': [1, 7]  # Janeiro e Julho
         }
         
+        # === SELEÇÃO ROLLING (POINT-IN-TIME) ===
+        self.SELECAO_ROLLING = {
+            'janela_meses': 48,   # Meses anteriores ao rebalanceamento (2014-2017 na seleção estática)
+            'n_ativos': 10        # Top N por data de rebalanceamento
+        }
+        
         # === CONFIGURAÇÕES FINANCEIRAS ===
         self.TAXA_LIVRE_RISCO = {
             'mensal': 0.0052,     # 0,52% a.m. (CDI médio 2018-2019)
-            'anual': 0.065        # ~6,5% a.a.
+            'anual': 0.065,       # ~6,5% a.a.
+            'arquivo_cdi': 'cdi_diario.csv'  # CDI diário em data/DataBase (ausente = taxa constante)
+        }
+        
+        # === INGESTÃO DE DADOS ===
+        self.INGESTAO = {
+            'streaming': False,           # Ler xlsx em chunks (exports muito grandes)
+            'tamanho_chunk': 50_000,      # Linhas por chunk no modo streaming
+            'limite_memoria_mb': None,    # Teto do buffer tipado (None = sem limite)
+            'modo_compacto': False,       # Tickers categóricos e float32 no frame longo
+            'ajustar_eventos': False,     # Ajustar preços por desdobramentos e proventos
+            'arquivo_eventos': 'eventos_corporativos.csv',  # Tabela de eventos em data/DataBase
+            'exports': None               # Manifesto (.json/.txt) ou glob de exports a mesclar
         }
         
         # === ANÁLISES DE VALIDAÇÃO ===
@@ -174,6 +225,8 @@ class ConfiguracaoGlobal:
             'tables': self.tables_dir,
             'robustez': self.robustez_dir,
             'src': self.src_dir,
+            'dados': self.data_dir,
+            'cache': self.cache_dir,
             'dados_economática': self.results_dir / "dados_economática_2014_2019.csv",
             'ativos_selecionados': self.results_dir / "01_ativos_selecionados.csv",
             'retornos_mensais': self.results_dir / "02_retornos_mensais_2018_2019.csv",
@@ -186,7 +239,7 @@ class ConfiguracaoGlobal:
         Função de conveniência para obter caminhos de arquivos.
         
         Args:
-            categoria (str): 'results', 'figures', 'tables', 'robustez'
+            categoria (str): 'results', 'figures', 'tables', 'robustez', 'cache'
             arquivo (str): Nome do arquivo
             
         Returns:
@@ -196,7 +249,8 @@ class ConfiguracaoGlobal:
             'results': self.results_dir,
             'figures': self.figures_dir, 
             'tables': self.tables_dir,
-            'robustez': self.robustez_dir
+            'robustez': self.robustez_dir,
+            'cache': self.cache_dir
         }
         
         if categoria not in mapeamento:
@@ -214,9 +268,15 @@ class ConfiguracaoGlobal:
             'seed_reprodutibilidade': self.SEED,
             'score_weights': self.SCORE_WEIGHTS,
             'liquidez_criteria': self.LIQUIDEZ_CRITERIA,
+            'indice_liquidez': self.INDICE_LIQUIDEZ,
+            'capacidade': self.CAPACIDADE,
             'weight_constraints': self.WEIGHT_CONSTRAINTS,
+            'setores': self.SETORES,
             'periodos': self.PERIODOS,
+            'selecao_rolling': self.SELECAO_ROLLING,
+            'motor_sinais': self.MOTOR_SINAIS,
             'taxa_livre_risco': self.TAXA_LIVRE_RISCO,
+            'ingestao': self.INGESTAO,
             'validacao_config': self.VALIDACAO_CONFIG
         }
         
@@ -30,6 +30,17 @@ except ImportError:
     sys.path.append(os.path.dirname(__file__))
     from _00_configuracao_global import get_logger, get_path, get_config, get_rng
 
+from leitores_economatica import PADROES_EXPORT, compactar_frame_economatica, relatorio_memoria_modos
+from armazem_precos import ArmazemPrecos
+from ingestao_multipla import normalizar_fonte
+from calendario_negociacao import CalendarioNegociacao
+from selecao_rolling import SelecaoRolling
+from varredura_pesos_score import executar_varredura
+from selecao_setorial import carregar_mapa_setores, selecionar_com_setores
+from metricas_selecao import percentis_metricas, score_composto, tabela_metricas_performance
+from base_mercado import BaseMercadoIncremental
+from banco_mercado import BancoMercado
+
 class CarregadorEconomaticaProfissional:
     """
     Carregador científico da Economática com critérios objetivos reprodutíveis.
@@ -46,6 +57,7 @@ class CarregadorEconomaticaProfissional:
         self.logger = get_logger(__name__)
         self.config = get_config()
         self.rng = get_rng()
+        self.chave_dados = None  # Chave (hash) do último arquivo carregado
         
         # Detectar automaticamente o arquivo Economática
         self.excel_path = self._detectar_arquivo_economatica()
@@ -60,16 +72,22 @@ class CarregadorEconomaticaProfissional:
         """
         Detecta automaticamente arquivo da Economática no diretório data.
         
+        Com CONFIG.INGESTAO['exports'] definido, a fonte é o manifesto/glob
+        de exports a mesclar (ver ingestao_multipla).
+        
         Returns:
-            Path: Caminho para arquivo .xlsx da Economática
+            Path: Caminho para arquivo .xlsx ou .csv da Economática (ou fonte múltipla)
         """
         data_dir = self.config.projeto_root / "data" / "DataBase"
         
+        if self.config.INGESTAO.get('exports'):
+            return normalizar_fonte(self.config.INGESTAO['exports'])
+        
         if not data_dir.exists():
             raise FileNotFoundError(f"Diretório data não encontrado: {data_dir}")
         
-        # Procurar por arquivos .xlsx que contenham "Economatica"
-        xlsx_files = list(data_dir.glob("*Economatica*.xlsx"))
+        # Procurar por arquivos .xlsx ou .csv que contenham "Economatica"
+        xlsx_files = [p for padrao in PADROES_EXPORT for p in data_dir.glob(padrao)]
         
         if not xlsx_files:
             raise FileNotFoundError("Arquivo Economática não encontrado no diretório data")
@@ -81,53 +99,35 @@ class CarregadorEconomaticaProfissional:
         
         return xlsx_files[0]
     
-    def carregar_dados_economática(self):
+    def carregar_dados_economática(self, usar_cache=True):
         """
         Carrega dados da Economática com validação robusta.
         
+        A leitura passa pelo ArmazemPrecos do processo: o xlsx é lido e tipado
+        uma única vez e fica disponível para as etapas seguintes (ex.: 02) sem
+        nova leitura. O frame tipado também é gravado em cache colunar (Parquet),
+        com chave no hash do conteúdo do arquivo e no mapeamento de colunas.
+        Com CONFIG.INGESTAO['modo_compacto'] o frame é devolvido com tickers
+        categóricos e preços/volumes em float32 quando a conversão não perde
+        precisão na unidade da coluna (ver TOLERANCIA_FLOAT32).
+        
+        Args:
+            usar_cache (bool): Ler/gravar o cache colunar em data/cache
+        
         Returns:
             pd.DataFrame: Dados de ações com preços e volumes validados
         """
         self.logger.info("1. Carregando dados Economática...")
         
         try:
-            # Carregar Excel (assumindo que dados estão na primeira planilha)
-            df_raw = pd.read_excel(self.excel_path, sheet_name=0)
-            
-            # Log básico sobre os dados carregados
-            self.logger.info(f"   Dados carregados: {len(df_raw)} linhas x {len(df_raw.columns)} colunas")
-            
-            # Validar estrutura mínima esperada
-            colunas_esperadas = ['Data', 'Ativo', 'Preço', 'Volume$']
+            armazem = ArmazemPrecos.obter(self.excel_path)
+            df = armazem.frame(usar_cache=usar_cache)
+            self.chave_dados = armazem.chave
             
-            # Verificar se existem colunas similares (flexibilidade nos nomes)
-            colunas_encontradas = []
-            for col_esperada in colunas_esperadas:
-                colunas_similares = [col for col in df_raw.columns if col_esperada.lower() in col.lower()]
-                if colunas_similares:
-                    colunas_encontradas.append(colunas_similares[0])
-                else:
-                    raise ValueError(f"Coluna esperada '{col_esperada}' não encontrada")
+            if self.config.INGESTAO['modo_compacto']:
+                df = self._compactar_dados(df)
             
-            # Renomear colunas para padrão
-            rename_dict = dict(zip(colunas_encontradas, colunas_esperadas))
-            df = df_raw.rename(columns=rename_dict)
-            
-            # Converter tipos de dados
-            df['Data'] = pd.to_datetime(df['Data'])
-            df['Preço'] = pd.to_numeric(df['Preço'], errors='coerce')
-            df['Volume$'] = pd.to_numeric(df['Volume$'], errors='coerce')
-            
-            # Filtrar dados válidos
-            df = df.dropna(subset=['Data', 'Ativo', 'Preço', 'Volume$'])
-            
-            # Validar período de dados
-            data_min = df['Data'].min()
-            data_max = df['Data'].max()
-            
-            self.logger.info(f"   Período dos dados: {data_min.strftime('%Y-%m-%d')} a {data_max.strftime('%Y-%m-%d')}")
-            self.logger.info(f"   Ativos únicos: {df['Ativo'].nunique()}")
-            self.logger.info(f"   Observações válidas: {len(df)}")
+            self._registrar_resumo_dados(df)
             
             return df
             
@@ -135,10 +135,134 @@ class CarregadorEconomaticaProfissional:
             self.logger.error(f"Erro ao carregar dados Economática: {e}")
             raise
     
+    def _compactar_dados(self, df):
+        """
+        Converte o frame para o modo compacto e registra o relatório de memória.
+        
+        Args:
+            df (pd.DataFrame): Frame longo padrão
+            
+        Returns:
+            pd.DataFrame: Frame com tickers categóricos e float32 quando possível
+        """
+        df_compacto = compactar_frame_economatica(df)
+        relatorio = relatorio_memoria_modos(df, df_compacto)
+        
+        self.logger.info("   Modo compacto - memória por coluna (MB):")
+        for coluna, linha in relatorio.iterrows():
+            self.logger.info(
+                f"     {coluna:<8} {linha['mb_padrao']:>9.2f} → {linha['mb_compacto']:>9.2f} "
+                f"({linha['reducao_pct']:.0f}% menor)"
+            )
+        
+        return df_compacto
+    
+    def _registrar_resumo_dados(self, df):
+        """Registra no log o período, ativos e observações do frame carregado"""
+        data_min = df['Data'].min()
+        data_max = df['Data'].max()
+        
+        self.logger.info(f"   Período dos dados: {data_min.strftime('%Y-%m-%d')} a {data_max.strftime('%Y-%m-%d')}")
+        self.logger.info(f"   Ativos únicos: {df['Ativo'].nunique()}")
+        self.logger.info(f"   Observações válidas: {len(df)}")
+    
+    def salvar_painel_mercado(self):
+        """
+        Persiste preços e volumes como painel datas x ativos em memória mapeada.
+        
+        O painel fica em data/cache/painel_mercado e é reaproveitado pelas
+        etapas seguintes; só é reconstruído quando o arquivo de origem muda.
+        
+        Returns:
+            PainelMercado: Painel aberto em memória mapeada
+        """
+        return ArmazemPrecos.obter(self.excel_path).painel()
+    
+    def escanear_qualidade_dados(self):
+        """
+        Escaneia o painel de mercado em busca de lacunas, preços parados,
+        volume zero, retornos outliers e datas duplicadas.
+        
+        As máscaras ficam em data/cache/qualidade_painel para reuso pelas
+        etapas seguintes sem novo escaneamento.
+        
+        Returns:
+            pd.DataFrame: Relatório de qualidade por ativo
+        """
+        self.logger.info("   Escaneando qualidade do painel de mercado...")
+        return ArmazemPrecos.obter(self.excel_path).qualidade()
+    
+    def indexar_universo_liquidez(self):
+        """
+        Constrói o índice datado (datas x ativos) de elegibilidade aos filtros
+        de liquidez em janelas móveis, complementar à lista única de
+        filtrar_por_liquidez e livre de viés de sobrevivência.
+        
+        O índice fica compactado em bits em data/cache/indice_liquidez.
+        
+        Returns:
+            IndiceLiquidez: Índice aberto para consultas por data e por ativo
+        """
+        self.logger.info("   Indexando universo de liquidez por data...")
+        return ArmazemPrecos.obter(self.excel_path).indice_liquidez()
+    
+    def salvar_banco_mercado(self, df):
+        """
+        Grava o frame longo no banco SQLite indexado (data/mercado.sqlite).
+        
+        O banco atende consultas por ativo/janela e o universo líquido em uma
+        data sem reabrir o xlsx; só é regravado quando o arquivo de origem muda.
+        
+        Args:
+            df (pd.DataFrame): Frame longo carregado
+        
+        Returns:
+            BancoMercado: Banco aberto
+        """
+        banco = BancoMercado()
+        
+        if self.chave_dados is not None and banco.origem() == self.chave_dados:
+            self.logger.info(f"   Banco de mercado atualizado: {banco.caminho}")
+            return banco
+        
+        banco.carregar_frame(df, origem=self.chave_dados)
+        return banco
+    
+    def atualizar_base_incremental(self, df_export=None):
+        """
+        Ingere o export atual na base de mercado incremental (data/cache/base_mercado).
+        
+        Apenas linhas posteriores ao watermark de cada ativo são anexadas;
+        a base só é recarregada por completo se linhas antigas mudaram
+        (detectado pelo checksum de cada partição mensal).
+        
+        Args:
+            df_export (pd.DataFrame): Frame já carregado (None = carregar o export)
+            
+        Returns:
+            dict: Resumo da ingestão (modo, linhas novas, partições atualizadas)
+        """
+        self.logger.info("Atualizando base de mercado incremental...")
+        
+        if df_export is None:
+            df_export = self.carregar_dados_economática()
+        
+        base = BaseMercadoIncremental()
+        resumo = base.ingerir(df_export)
+        
+        self.logger.info(f"   Modo: {resumo['modo']} | linhas novas: {resumo['linhas_novas']} | "
+                         f"partições atualizadas: {len(resumo['particoes_atualizadas'])}")
+        
+        return resumo
+    
     def calcular_metricas_liquidez(self, df):
         """
         Calcula métricas de liquidez por ativo usando critérios científicos.
         
+        Uma única ordenação estável por (ativo, data) seguida de agregações
+        agrupadas; os ativos saem na ordem de aparição no frame e ativos com
+        menos de negocios_min_diario observações são descartados.
+        
         Args:
             df (pd.DataFrame): Dados de preços e volumes
             
@@ -147,52 +271,74 @@ class CarregadorEconomaticaProfissional:
         """
         self.logger.info("2. Calculando métricas de liquidez...")
         
-        metricas_liquidez = []
-        
-        for ativo in df['Ativo'].unique():
-            df_ativo = df[df['Ativo'] == ativo].sort_values('Data')
-            
-            if len(df_ativo) < self.config.LIQUIDEZ_CRITERIA['negocios_min_diario']:
-                continue
-            
-            # Métricas básicas de liquidez
-            volume_medio = df_ativo['Volume$'].mean()
-            volume_mediano = df_ativo['Volume$'].median()
-            dias_com_volume = (df_ativo['Volume$'] > 0).sum()
-            total_dias = len(df_ativo)
-            presenca_bolsa = dias_com_volume / total_dias
-            
-            # Calcular retornos para métricas de qualidade
-            df_ativo = df_ativo.copy()
-            df_ativo['Retorno'] = df_ativo['Preço'].pct_change()
-            
-            # Métricas de qualidade dos dados
-            dias_sem_retorno = (df_ativo['Retorno'] == 0).sum()
-            pct_dias_sem_retorno = dias_sem_retorno / len(df_ativo.dropna())
-            
-            # Autocorrelação de retornos (indicador de microestrutura)
-            autocorr = df_ativo['Retorno'].autocorr() if len(df_ativo) > 10 else np.nan
-            
-            metricas = {
-                'ativo': ativo,
-                'volume_medio_diario': volume_medio,
-                'volume_mediano_diario': volume_mediano,
-                'presenca_bolsa': presenca_bolsa,
-                'pct_dias_sem_retorno': pct_dias_sem_retorno,
-                'autocorr_retornos': autocorr if not pd.isna(autocorr) else -999,
-                'observacoes_totais': total_dias,
-                'periodo_inicio': df_ativo['Data'].min(),
-                'periodo_fim': df_ativo['Data'].max()
-            }
-            
-            metricas_liquidez.append(metricas)
+        # Ordenar uma vez por (ativo, data); códigos na ordem de aparição
+        codigos, ativos = pd.factorize(df['Ativo'])
+        ordem = np.lexsort((df['Data'].to_numpy(), codigos))
+        codigo = codigos[ordem]
+        dados = df.iloc[ordem].reset_index(drop=True)
+        inicio_ativo = np.r_[True, codigo[1:] != codigo[:-1]] if len(codigo) else np.zeros(0, dtype=bool)
+        
+        # Retornos dentro de cada ativo (sem atravessar a fronteira entre ativos)
+        preco = dados['Preço']
+        retorno = (preco / preco.shift(1) - 1).mask(inicio_ativo)
+        retorno_anterior = retorno.shift(1).mask(inicio_ativo)
+        
+        grupos = dados.groupby(codigo, sort=True)
+        total_dias = grupos.size()
+        
+        # Linhas sem nenhum NaN (inclusive o retorno) como denominador da qualidade
+        linhas_completas = dados.notna().all(axis=1) & retorno.notna()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_dias_sem_retorno = ((retorno == 0).groupby(codigo).sum()
+                                    / linhas_completas.groupby(codigo).sum())
+        
+        # Autocorrelação de retornos (indicador de microestrutura)
+        autocorr = self._autocorrelacao_agrupada(retorno, retorno_anterior, codigo)
+        autocorr = autocorr.where(total_dias > 10).fillna(-999)
+        
+        df_liquidez = pd.DataFrame({
+            'ativo': np.asarray(ativos)[total_dias.index],
+            'volume_medio_diario': grupos['Volume$'].mean(),
+            'volume_mediano_diario': grupos['Volume$'].median(),
+            'presenca_bolsa': (dados['Volume$'] > 0).groupby(codigo).sum() / total_dias,
+            'pct_dias_sem_retorno': pct_dias_sem_retorno,
+            'autocorr_retornos': autocorr,
+            'observacoes_totais': total_dias,
+            'periodo_inicio': grupos['Data'].min(),
+            'periodo_fim': grupos['Data'].max()
+        })
         
-        df_liquidez = pd.DataFrame(metricas_liquidez)
+        minimo = self.config.LIQUIDEZ_CRITERIA['negocios_min_diario']
+        df_liquidez = df_liquidez[df_liquidez['observacoes_totais'] >= minimo].reset_index(drop=True)
         
         self.logger.info(f"   Métricas calculadas para {len(df_liquidez)} ativos")
         
         return df_liquidez
     
+    @staticmethod
+    def _autocorrelacao_agrupada(x, y, codigo):
+        """
+        Correlação de Pearson entre x e y por ativo, nos pares sem NaN
+        (equivalente a Series.autocorr(1) com y = retorno defasado).
+        
+        Returns:
+            pd.Series: Correlação por código de ativo (NaN sem pares suficientes)
+        """
+        validos = x.notna() & y.notna()
+        x = x.where(validos)
+        y = y.where(validos)
+        
+        desvio_x = x - x.groupby(codigo).transform('mean')
+        desvio_y = y - y.groupby(codigo).transform('mean')
+        
+        cov = (desvio_x * desvio_y).groupby(codigo).sum()
+        var_x = (desvio_x ** 2).groupby(codigo).sum()
+        var_y = (desvio_y ** 2).groupby(codigo).sum()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.sqrt(var_x * var_y)
+        return corr.where(validos.groupby(codigo).sum() >= 2).clip(-1, 1).astype(np.float64)
+    
     def filtrar_por_liquidez(self, df_liquidez):
         """
         Aplica filtros de liquidez baseados em critérios científicos.
@@ -251,55 +397,31 @@ class CarregadorEconomaticaProfissional:
         
         df_periodo = df[(df['Data'] >= data_inicio) & (df['Data'] <= data_fim)]
         
-        metricas_performance = []
+        # Matriz datas x ativos elegíveis montada por códigos inteiros
+        # (em (Data, Ativo) duplicados prevalece a última linha)
+        posicao_ativo = pd.Index(ativos_elegíveis).get_indexer(df_periodo['Ativo'])
+        no_universo = posicao_ativo >= 0
+        posicao_ativo = posicao_ativo[no_universo]
+        posicao_data, datas = pd.factorize(df_periodo['Data'].to_numpy()[no_universo], sort=True)
         
-        for ativo in ativos_elegíveis:
-            df_ativo = df_periodo[df_periodo['Ativo'] == ativo].sort_values('Data')
-            
-            if len(df_ativo) < 24:  # Mínimo 2 anos de dados
-                continue
-            
-            # Calcular retornos mensais
-            df_ativo = df_ativo.set_index('Data')
-            precos_mensais = df_ativo['Preço'].resample('M').last()
-            retornos_mensais = precos_mensais.pct_change().dropna()
-            
-            if len(retornos_mensais) < 12:  # Mínimo 1 ano
-                continue
-            
-            # Métrica 1: Momentum 12-1 (Jegadeesh & Titman, 1993)
-            if len(retornos_mensais) >= 12:
-                momentum_12_1 = (retornos_mensais.iloc[-12:-1] + 1).prod() - 1
-            else:
-                momentum_12_1 = np.nan
-            
-            # Métrica 2: Volatilidade anualizada
-            volatilidade = retornos_mensais.std() * np.sqrt(12)
-            
-            # Métrica 3: Maximum Drawdown
-            precos_cum = (retornos_mensais + 1).cumprod()
-            running_max = precos_cum.expanding().max()
-            drawdowns = (precos_cum / running_max - 1)
-            max_drawdown = drawdowns.min()
-            
-            # Métrica 4: Downside Deviation (Sortino & van der Meer, 1991)
-            retornos_negativos = retornos_mensais[retornos_mensais < 0]
-            downside_dev = retornos_negativos.std() * np.sqrt(12) if len(retornos_negativos) > 0 else 0
-            
-            metricas = {
-                'ativo': ativo,
-                'momentum_12_1': momentum_12_1,
-                'volatilidade_anual': volatilidade,
-                'max_drawdown': abs(max_drawdown),  # Valor absoluto
-                'downside_deviation': downside_dev,
-                'retorno_medio_mensal': retornos_mensais.mean(),
-                'observacoes_performance': len(retornos_mensais)
-            }
-            
-            metricas_performance.append(metricas)
+        precos = np.full((len(datas), len(ativos_elegíveis)), np.nan)
+        precos[posicao_data, posicao_ativo] = df_periodo['Preço'].to_numpy()[no_universo]
         
-        df_performance = pd.DataFrame(metricas_performance)
-        df_performance = df_performance.dropna()  # Remover ativos com dados insuficientes
+        # Mínimo 2 anos de dados diários
+        observacoes_diarias = np.bincount(posicao_ativo, minlength=len(ativos_elegíveis))
+        com_historico = observacoes_diarias >= 24
+        
+        # Uma amostragem de fim de mês e as quatro métricas de todos os ativos de uma vez
+        precos_diarios = pd.DataFrame(precos[:, com_historico], index=pd.DatetimeIndex(datas, name='Data'),
+                                      columns=np.asarray(ativos_elegíveis, dtype=object)[com_historico])
+        calendario = CalendarioNegociacao(precos_diarios.index)
+        precos_fim_mes = calendario.amostrar_fim_mes(precos_diarios)
+        
+        df_performance = tabela_metricas_performance(precos_fim_mes)
+        
+        # Mínimo 1 ano de retornos mensais
+        df_performance = df_performance[df_performance['observacoes_performance'] >= 12]
+        df_performance = df_performance.dropna().reset_index(drop=True)  # Remover ativos com dados insuficientes
         
         self.logger.info(f"   Performance calculada para {len(df_performance)} ativos")
         
@@ -319,23 +441,16 @@ class CarregadorEconomaticaProfissional:
         
         df_scores = df_performance.copy()
         
-        # Calcular percentis (0-1) para cada métrica
-        df_scores['momentum_rank'] = df_scores['momentum_12_1'].rank(pct=True)
-        df_scores['volatility_rank'] = (1 - df_scores['volatilidade_anual'].rank(pct=True))  # Invertido: menor vol = melhor
-        df_scores['drawdown_rank'] = (1 - df_scores['max_drawdown'].rank(pct=True))  # Invertido: menor DD = melhor  
-        df_scores['downside_rank'] = (1 - df_scores['downside_deviation'].rank(pct=True))  # Invertido: menor downside = melhor
+        # Calcular percentis (0-1) para cada métrica (vol, DD e downside invertidos: menor = melhor)
+        percentis = percentis_metricas(df_scores)
+        df_scores[percentis.columns] = percentis
         
         # Score Composto com pesos consistentes (35/25/20/20)
         weights = self.config.SCORE_WEIGHTS
-        df_scores['score_composto'] = (
-            weights['momentum'] * df_scores['momentum_rank'] +
-            weights['volatility'] * df_scores['volatility_rank'] + 
-            weights['max_drawdown'] * df_scores['drawdown_rank'] +
-            weights['downside_dev'] * df_scores['downside_rank']
-        )
-        
-        # Ranking final
-        df_scores = df_scores.sort_values('score_composto', ascending=False)
+        df_scores['score_composto'] = score_composto(percentis, weights)
+        
+        # Ranking final (empates na ordem de df_performance, como em posicoes_top_n)
+        df_scores = df_scores.sort_values('score_composto', ascending=False, kind='stable')
         df_scores['ranking_final'] = range(1, len(df_scores) + 1)
         
         self.logger.info(f"   Score calculado com pesos: {weights}")
@@ -343,21 +458,45 @@ class CarregadorEconomaticaProfissional:
         
         return df_scores
     
-    def selecionar_top_ativos(self, df_scores, n_ativos=10):
+    def selecionar_top_ativos(self, df_scores, n_ativos=10, setores=None):
         """
         Seleciona top N ativos com controles de diversificação.
         
+        Respeita o teto por setor (peso_setor_max) e o mínimo de setores
+        (setores_min) de CONFIG.WEIGHT_CONSTRAINTS; sem cadastro setorial,
+        seleciona o top N puro.
+        
         Args:
             df_scores (pd.DataFrame): Scores calculados
             n_ativos (int): Número de ativos a selecionar
+            setores (dict): Mapa ativo → setor (None = cadastro de CONFIG.SETORES)
             
         Returns:
             dict: Resultado da seleção com metadados
         """
         self.logger.info(f"6. Selecionando top {n_ativos} ativos...")
         
-        # Selecionar top N baseado no score
-        top_ativos = df_scores.head(n_ativos)
+        if setores is None:
+            try:
+                setores = carregar_mapa_setores()
+            except FileNotFoundError as e:
+                self.logger.warning(f"   {e} - seleção sem restrições setoriais")
+        
+        selecao_setorial = None
+        if setores is None:
+            # Selecionar top N baseado no score
+            top_ativos = df_scores.head(n_ativos)
+        else:
+            # Top N por score sujeito aos limites setoriais
+            selecao_setorial = selecionar_com_setores(
+                df_scores['ativo'].tolist(), df_scores['score_composto'].to_numpy(), setores, n_ativos
+            )
+            top_ativos = df_scores[df_scores['ativo'].isin(selecao_setorial['ativos'])]
+            self.logger.info(
+                f"   Restrições setoriais: {selecao_setorial['n_setores']} setores, "
+                f"máx. {selecao_setorial['limite_por_setor']} ativos por setor "
+                f"({selecao_setorial['trocas_reparo']} trocas de reparo)"
+            )
         
         # Preparar resultado
         resultado = {
@@ -377,6 +516,14 @@ class CarregadorEconomaticaProfissional:
                 'periodo_avaliacao': '2014-2017',
                 'n_ativos_selecionados': n_ativos
             },
+            'restricoes_setoriais': None if selecao_setorial is None else {
+                'setores': selecao_setorial['setores'],
+                'n_setores': selecao_setorial['n_setores'],
+                'folga_setores_min': selecao_setorial['folga_setores_min'],
+                'limite_por_setor': selecao_setorial['limite_por_setor'],
+                'viavel': selecao_setorial['viavel'],
+                'folgas': selecao_setorial['folgas'].to_dict('records')
+            },
             'metadados': {
                 'data_selecao': datetime.now().isoformat(),
                 'versao_script': '2.0_profissional',
@@ -406,6 +553,8 @@ class CarregadorEconomaticaProfissional:
             'score_composto': [s['score_composto'] for s in resultado_selecao['scores']],
             'ranking': [s['ranking_final'] for s in resultado_selecao['scores']]
         })
+        if resultado_selecao.get('restricoes_setoriais'):
+            ativos_df['setor'] = ativos_df['ativo'].map(resultado_selecao['restricoes_setoriais']['setores'])
         
         path_ativos = get_path('results', '01_ativos_selecionados.csv')
         ativos_df.to_csv(path_ativos, index=False)
@@ -422,6 +571,65 @@ class CarregadorEconomaticaProfissional:
         df_scores_completo.to_csv(path_scores, index=False)
         self.logger.info(f"   Scores completos salvos: {path_scores}")
     
+    def executar_selecao_rolling(self, n_ativos=None):
+        """
+        Seleção point-in-time em cada data de rebalanceamento (janela móvel).
+        
+        Liquidez e Score Composto são recalculados com os
+        CONFIG.SELECAO_ROLLING['janela_meses'] meses anteriores a cada
+        rebalanceamento; a composição datada é salva em
+        results/01_selecao_rolling.csv.
+        
+        Args:
+            n_ativos (int): Ativos por data (None = CONFIG.SELECAO_ROLLING['n_ativos'])
+        
+        Returns:
+            pd.DataFrame: Composição do top N por data de rebalanceamento
+        """
+        self.logger.info("Executando seleção rolling point-in-time...")
+        
+        armazem = ArmazemPrecos.obter(self.excel_path)
+        selecao = SelecaoRolling(armazem.precos(), armazem.volumes())
+        membros = selecao.executar(n_ativos)
+        
+        path_rolling = get_path('results', '01_selecao_rolling.csv')
+        membros.to_csv(path_rolling, index=False)
+        self.logger.info(f"   Seleção rolling salva: {path_rolling}")
+        
+        return membros
+    
+    def executar_varredura_pesos(self, df_performance=None, modo='dirichlet', n_pesos=10_000, n_ativos=10):
+        """
+        Estabilidade da seleção top N sob ponderações alternativas do Score Composto.
+        
+        Todas as ponderações são avaliadas de uma vez sobre a matriz de
+        scores (ativos x K), sem reexecutar o pipeline; o resumo por
+        ponderação e a frequência de seleção por ativo são salvos em results/.
+        
+        Args:
+            df_performance (pd.DataFrame): Métricas de performance (None = results/01_scores_completos.csv)
+            modo (str): 'dirichlet' (n_pesos sorteios) ou 'simplex' (grade de passo 0,05)
+            n_pesos (int): Ponderações no modo Dirichlet
+            n_ativos (int): Tamanho da seleção
+            
+        Returns:
+            dict: Resumo por ponderação, frequência por ativo e estatísticas
+        """
+        self.logger.info("Executando varredura de pesos do Score Composto...")
+        
+        if df_performance is None:
+            df_performance = pd.read_csv(get_path('results', '01_scores_completos.csv'))
+        
+        resultado = executar_varredura(df_performance, modo=modo, n_pesos=n_pesos, n_ativos=n_ativos)
+        
+        path_varredura = get_path('results', '01_varredura_pesos.csv')
+        resultado['resumo'].to_csv(path_varredura, index=False)
+        path_frequencia = get_path('results', '01_frequencia_selecao_pesos.csv')
+        resultado['frequencia'].rename_axis('ativo').reset_index().to_csv(path_frequencia, index=False)
+        self.logger.info(f"   Varredura salva: {path_varredura}")
+        
+        return resultado
+    
     def executar_selecao_completa(self):
         """
         Executa pipeline completo de seleção científica de ativos.
@@ -432,6 +640,10 @@ class CarregadorEconomaticaProfissional:
         try:
             # Pipeline completo
             df_dados = self.carregar_dados_economática()
+            self.salvar_painel_mercado()
+            self.escanear_qualidade_dados()
+            self.indexar_universo_liquidez()
+            self.salvar_banco_mercado(df_dados).fechar()
             df_liquidez = self.calcular_metricas_liquidez(df_dados)
             ativos_elegíveis = self.filtrar_por_liquidez(df_liquidez)['ativo'].tolist()
             df_performance = self.calcular_metricas_performance(df_dados, ativos_elegíveis)
@@ -18,13 +18,52 @@ import json
 import os
 import logging
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
+from taxa_livre_risco import obter_taxa_livre_risco
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Resolução que o pandas instalado dá a datas montadas a partir de Timestamps
+# ('ns' até o pandas 2.x, 'us' no 3.x): o índice das séries segue a mesma
+UNIDADE_DATAS = np.datetime_data(pd.DatetimeIndex([datetime(2000, 1, 1)]).dtype)[0]
+
+
+def _extrair_sheets_workbook(excel_path, asset_list, inicio, fim):
+    """
+    Abre o workbook uma única vez e extrai as sheets dos ativos informados
+    
+    Função de módulo para poder ser executada em processos do pool.
+    Os erros não são impressos aqui: são devolvidos para que o processo
+    principal os reporte na ordem dos ativos selecionados.
+    
+    Returns:
+        list: Tuplas (ativo, DataFrame ou None, mensagem de erro ou None)
+    """
+    resultados = []
+    
+    with pd.ExcelFile(excel_path) as workbook:
+        sheets_disponiveis = set(workbook.sheet_names)
+        
+        for asset_name in asset_list:
+            if asset_name not in sheets_disponiveis:
+                resultados.append((asset_name, None, f"Worksheet named '{asset_name}' not found"))
+                continue
+            
+            try:
+                df_sheet = workbook.parse(sheet_name=asset_name)
+                asset_df = ExtratorDadosHistoricos._limpar_dados_sheet(df_sheet, inicio, fim)
+                resultados.append((asset_name, asset_df, None))
+            except Exception as e:
+                resultados.append((asset_name, None, str(e)))
+    
+    return resultados
+
+
 class ExtratorDadosHistoricos:
     """
     Extrai dados históricos dos ativos selecionados cientificamente
@@ -69,64 +108,249 @@ class ExtratorDadosHistoricos:
             print(f"   ERRO: {e}")
             return []
     
-    def extrair_dados_ativo(self, asset_name, inicio='2017-12-01', fim='2019-12-31'):
+    def extrair_dados_ativo(self, asset_name, inicio='2017-12-01', fim='2019-12-31', df_sheet=None):
         """
         Extrai dados históricos de um ativo específico
         Inclui Dez 2017 para calcular retorno de Jan 2018
+        
+        Se df_sheet for informado (sheet já lida do workbook aberto),
+        o arquivo Excel não é reaberto.
         """
         try:
             # Ler dados da sheet do ativo
-            df = pd.read_excel(self.excel_path, sheet_name=asset_name)
-            
-            # Encontrar linha de cabeçalho
-            header_row = None
-            for i in range(min(10, len(df))):
-                row_vals = df.iloc[i].astype(str).str.lower()
-                if any('data' in str(val) for val in row_vals):
-                    header_row = i
-                    break
+            if df_sheet is None:
+                df_sheet = pd.read_excel(self.excel_path, sheet_name=asset_name)
             
-            if header_row is None:
-                return None
+            return self._limpar_dados_sheet(df_sheet, inicio, fim)
             
-            # Extrair dados
-            data_rows = df.iloc[header_row + 1:].copy()
-            dates_col = data_rows.iloc[:, 0]
-            prices_col = data_rows.iloc[:, -1]
-            
-            # Limpar dados
-            clean_data = []
-            for i in range(len(dates_col)):
-                try:
-                    date_val = pd.to_datetime(dates_col.iloc[i], errors='coerce')
-                    price_val = pd.to_numeric(prices_col.iloc[i], errors='coerce')
-                    
-                    if pd.notna(date_val) and pd.notna(price_val) and price_val > 0:
-                        if inicio <= date_val.strftime('%Y-%m-%d') <= fim:
-                            clean_data.append({
-                                'Date': date_val,
-                                'Price': price_val
-                            })
-                except:
-                    continue
-            
-            if len(clean_data) < 20:
-                return None
+        except Exception as e:
+            print(f"   ERRO {asset_name}: {e}")
+            return None
+    
+    def extrair_dados_multiplos_ativos(self, asset_list, inicio='2017-12-01', fim='2019-12-31', n_processos=1):
+        """
+        Extrai dados históricos de vários ativos abrindo o workbook uma única vez
+        
+        O arquivo xlsx (zip + shared strings) é aberto uma vez e cada sheet
+        é lida em sequência, de modo que o tempo cresce com o total de linhas
+        e não com (número de ativos x tamanho do workbook).
+        
+        Com n_processos > 1 os ativos são divididos em lotes e cada processo
+        do pool abre o workbook uma vez e processa o seu lote. O resultado é
+        sempre montado na ordem de asset_list.
+        
+        Args:
+            asset_list (list): Ativos (nomes das sheets) a extrair
+            n_processos (int): Processos do pool (None = todos os núcleos)
+        
+        Returns:
+            dict: {ativo: DataFrame com coluna 'Price' ou None se falhou}
+        """
+        if n_processos is None:
+            n_processos = os.cpu_count() or 1
+        n_processos = max(1, min(n_processos, len(asset_list)))
+        
+        if n_processos == 1:
+            extraidos = _extrair_sheets_workbook(self.excel_path, asset_list, inicio, fim)
+        else:
+            # Lotes intercalados equilibram ativos com históricos de tamanhos diferentes
+            lotes = [asset_list[i::n_processos] for i in range(n_processos)]
+            extraidos = []
+            with ProcessPoolExecutor(max_workers=n_processos) as pool:
+                futuros = [
+                    pool.submit(_extrair_sheets_workbook, self.excel_path, lote, inicio, fim)
+                    for lote in lotes
+                ]
+                for futuro in futuros:
+                    extraidos.extend(futuro.result())
+        
+        por_ativo = {asset_name: (asset_df, erro) for asset_name, asset_df, erro in extraidos}
+        
+        resultados = {}
+        for asset_name in asset_list:
+            asset_df, erro = por_ativo[asset_name]
+            if erro is not None:
+                print(f"   ERRO {asset_name}: {erro}")
+            resultados[asset_name] = asset_df
+        
+        return resultados
+    
+    def extrair_dados_armazem(self, asset_list, inicio='2017-12-01', fim='2019-12-31'):
+        """
+        Extrai as séries de preço do ArmazemPrecos do processo
+        
+        Usa o export longo já lido pela etapa 01 no mesmo processo (ou o
+        cache colunar/xlsx mais recente), sem abrir as sheets por ativo.
+        Aplica os mesmos critérios da limpeza das sheets (preço > 0 e pelo
+        menos 20 observações no período).
+        
+        Returns:
+            dict: {ativo: DataFrame com coluna 'Price' ou None se falhou}
+        """
+        from armazem_precos import ArmazemPrecos
+        
+        armazem = ArmazemPrecos.obter()
+        disponiveis = set(armazem.ativos())
+        
+        resultados = {}
+        for asset_name in asset_list:
+            if asset_name not in disponiveis:
+                print(f"   ERRO {asset_name}: ativo ausente no armazém de preços")
+                resultados[asset_name] = None
+                continue
             
-            # Criar DataFrame
-            asset_df = pd.DataFrame(clean_data)
-            asset_df = asset_df.drop_duplicates('Date').sort_values('Date')
-            asset_df = asset_df.set_index('Date')
+            serie = armazem.serie_precos(asset_name, inicio, fim)
+            serie = serie[serie > 0]
             
-            return asset_df
+            if len(serie) < 20:
+                resultados[asset_name] = None
+                continue
             
-        except Exception as e:
-            print(f"   ERRO {asset_name}: {e}")
+            asset_df = serie.rename('Price').to_frame()
+            asset_df.index.name = 'Date'
+            resultados[asset_name] = asset_df
+        
+        return resultados
+    
+    def extrair_dados_banco(self, asset_list, inicio='2017-12-01', fim='2019-12-31', caminho_banco=None):
+        """
+        Extrai as séries de preço do banco SQLite indexado (data/mercado.sqlite)
+        
+        Alternativa às sheets por ativo: cada ativo é uma varredura na chave
+        primária (ativo, data), sem abrir o workbook. O banco é gravado pela
+        etapa 01 (CarregadorEconomaticaProfissional.salvar_banco_mercado).
+        Aplica os mesmos critérios da limpeza das sheets (preço > 0 e pelo
+        menos 20 observações no período).
+        
+        Returns:
+            dict: {ativo: DataFrame com coluna 'Price' ou None se falhou}
+        """
+        from banco_mercado import BancoMercado
+        
+        resultados = {}
+        with BancoMercado(caminho_banco) as banco:
+            for asset_name in asset_list:
+                serie = banco.precos_ativo(asset_name, inicio, fim)['Preço']
+                serie = serie[serie > 0]
+                
+                if len(serie) < 20:
+                    print(f"   ERRO {asset_name}: ativo sem dados suficientes no banco")
+                    resultados[asset_name] = None
+                    continue
+                
+                asset_df = serie.rename('Price').to_frame()
+                asset_df.index.name = 'Date'
+                resultados[asset_name] = asset_df
+        
+        return resultados
+    
+    @staticmethod
+    def _encontrar_linha_cabecalho(df):
+        """
+        Encontra a linha de cabeçalho (primeira linha contendo 'data')
+        """
+        for i in range(min(10, len(df))):
+            row_vals = df.iloc[i].astype(str).str.lower()
+            if any('data' in str(val) for val in row_vals):
+                return i
+        return None
+    
+    @staticmethod
+    def _converter_data_celula(valor):
+        """
+        Converte uma célula como o parsing original (pd.to_datetime por célula)
+        """
+        try:
+            data = pd.to_datetime(valor, errors='coerce')
+        except Exception:
+            return pd.NaT
+        if isinstance(data, pd.Timestamp) and data.tzinfo is not None:
+            data = data.tz_localize(None)
+        return data
+    
+    @staticmethod
+    def _converter_datas(dates_col):
+        """
+        Converte a coluna de datas sem impor um único formato a todas as células
+        
+        pd.to_datetime na coluna inteira infere o formato da primeira data em
+        texto e descarta as demais ('13/01/2018' ao lado de '2018-01-20').
+        Células que já são datas (o caso comum nas sheets) são convertidas de
+        uma vez; texto e números são interpretados célula a célula, como antes.
+        """
+        if pd.api.types.is_datetime64_any_dtype(dates_col):
+            return pd.to_datetime(dates_col, errors='coerce')
+        
+        valores = dates_col.to_numpy(dtype=object)
+        eh_data = np.fromiter(
+            (isinstance(v, datetime) and v.tzinfo is None for v in valores),
+            dtype=bool, count=len(valores)
+        )
+        
+        datas = np.full(len(valores), np.datetime64('NaT'), dtype='datetime64[ns]')
+        if eh_data.any():
+            datas[eh_data] = pd.to_datetime(valores[eh_data], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        if not eh_data.all():
+            outras = [ExtratorDadosHistoricos._converter_data_celula(v) for v in valores[~eh_data]]
+            datas[~eh_data] = pd.to_datetime(pd.Series(outras, dtype=object), errors='coerce').to_numpy(dtype='datetime64[ns]')
+        
+        return pd.Series(datas, index=dates_col.index)
+    
+    @staticmethod
+    def _limpar_dados_sheet(df, inicio, fim):
+        """
+        Converte uma sheet bruta da Economática na série de preços do período
+        """
+        # Encontrar linha de cabeçalho
+        header_row = ExtratorDadosHistoricos._encontrar_linha_cabecalho(df)
+        
+        if header_row is None:
+            return None
+        
+        # Extrair dados
+        data_rows = df.iloc[header_row + 1:]
+        dates_col = data_rows.iloc[:, 0]
+        prices_col = data_rows.iloc[:, -1]
+        
+        # Limpar dados (operações vetorizadas por coluna)
+        datas = ExtratorDadosHistoricos._converter_datas(dates_col)
+        precos = pd.to_numeric(prices_col, errors='coerce')
+        
+        datas_dia = datas.dt.normalize()
+        validos = (
+            datas.notna() & precos.notna() & (precos > 0) &
+            (datas_dia >= pd.Timestamp(inicio)) & (datas_dia <= pd.Timestamp(fim))
+        )
+        
+        if validos.sum() < 20:
             return None
+        
+        # Reconverter apenas as células válidas preserva a inferência de dtype
+        # (int64 quando todos os preços válidos são inteiros)
+        clean_data = {
+            'Date': datas[validos].to_numpy().astype(f'datetime64[{UNIDADE_DATAS}]'),
+            'Price': pd.to_numeric(prices_col[validos].to_numpy(), errors='coerce')
+        }
+        
+        # Criar DataFrame
+        asset_df = pd.DataFrame(clean_data)
+        asset_df = asset_df.drop_duplicates('Date').sort_values('Date')
+        asset_df = asset_df.set_index('Date')
+        
+        return asset_df
     
-    def processar_todos_ativos(self):
+    def processar_todos_ativos(self, abrir_uma_vez=True, n_processos=1, fonte='armazem'):
         """
         Processa dados históricos de todos os ativos selecionados
+        
+        Args:
+            fonte (str): 'armazem' (ArmazemPrecos compartilhado com a etapa 01,
+                padrão), 'banco' (SQLite da etapa 01) ou 'excel' (caminho
+                legado: sheets por ativo do workbook)
+            abrir_uma_vez (bool): Fonte 'excel': abrir o workbook uma única vez
+                para todas as sheets (recomendado). Se False, reabre o arquivo por ativo.
+            n_processos (int): Fonte 'excel': processos para o parsing das sheets
+                (None = todos os núcleos; requer abrir_uma_vez=True)
         """
         print("2. Extraindo dados históricos de todos os ativos...")
         
@@ -134,13 +358,22 @@ class ExtratorDadosHistoricos:
         if not asset_list:
             return None
         
+        if fonte == 'armazem':
+            dados_extraidos = self.extrair_dados_armazem(asset_list)
+        elif fonte == 'banco':
+            dados_extraidos = self.extrair_dados_banco(asset_list)
+        elif abrir_uma_vez:
+            dados_extraidos = self.extrair_dados_multiplos_ativos(asset_list, n_processos=n_processos)
+        else:
+            dados_extraidos = {asset: self.extrair_dados_ativo(asset) for asset in asset_list}
+        
         all_prices = {}
         successful_extractions = 0
         
         for asset in asset_list:
             print(f"   Processando {asset}...")
             
-            asset_data = self.extrair_dados_ativo(asset)
+            asset_data = dados_extraidos.get(asset)
             if asset_data is not None:
                 all_prices[asset] = asset_data['Price']
                 successful_extractions += 1
@@ -164,8 +397,10 @@ class ExtratorDadosHistoricos:
         # Criar DataFrame de preços
         prices_df = pd.DataFrame(prices_dict)
         
-        # Resample para mensal (último dia do mês)
-        monthly_prices = prices_df.resample('M').last()
+        # Último preço de cada mês via calendário de pregões (equivale a resample('M').last())
+        from calendario_negociacao import CalendarioNegociacao
+        calendario = CalendarioNegociacao(prices_df.index)
+        monthly_prices = calendario.amostrar_fim_mes(prices_df)
         
         # Calcular retornos mensais
         returns_df = monthly_prices.pct_change().dropna()
@@ -246,7 +481,9 @@ class ExtratorDadosHistoricos:
         """
         print("4. Calculando estatísticas básicas...")
         
-        rf_rate = 0.0624  # 6.24% CDI médio
+        # Taxa livre de risco anual do período (CDI diário composto por mês)
+        rf_rate = obter_taxa_livre_risco().media_mensal(returns_df.index) * 12
+        self.rf_anual = rf_rate
         stats_list = []
         
         for asset in returns_df.columns:
@@ -307,7 +544,7 @@ class ExtratorDadosHistoricos:
             "periodo": "2018-01-01 a 2019-12-31",
             "total_ativos": len(returns_df.columns),
             "total_observacoes": len(returns_df),
-            "taxa_livre_risco": 0.0624,
+            "taxa_livre_risco": self.rf_anual,
             "ativos_processados": returns_df.columns.tolist(),
             "fonte": "Economática (dados reais)"
         }
@@ -322,13 +559,17 @@ class ExtratorDadosHistoricos:
         
         return True
     
-    def executar_extracao_completa(self):
+    def executar_extracao_completa(self, n_processos=1, fonte='armazem'):
         """
         Executa processo completo de extração
+        
+        Args:
+            n_processos (int): Processos para o parsing das sheets (fonte 'excel')
+            fonte (str): 'armazem' (padrão), 'banco' ou 'excel' (legado)
         """
         try:
             # Processar dados
-            prices_dict = self.processar_todos_ativos()
+            prices_dict = self.processar_todos_ativos(n_processos=n_processos, fonte=fonte)
             returns_df = self.criar_matriz_retornos(prices_dict)
             stats_df = self.calcular_estatisticas_basicas(returns_df)
             
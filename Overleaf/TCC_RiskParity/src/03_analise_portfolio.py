@@ -22,6 +22,9 @@ from scipy.optimize import minimize
 import warnings
 warnings.filterwarnings('ignore')
 
+from taxa_livre_risco import obter_taxa_livre_risco
+from serie_ibovespa import SerieBenchmarkIbovespa, metricas_relativas
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -36,7 +39,15 @@ class AnalisadorPortfolio:
 
     def __init__(self):
         self.results_dir = "../results"
-        self.rf_rate = 0.0624 / 12  # 6.24% CDI anual ÷ 12 = 0.52% mensal
+        # Taxa livre de risco: série mensal do CDI (ou constante da configuração)
+        self.taxa_livre_risco = obter_taxa_livre_risco()
+        periodos = self.taxa_livre_risco.config.PERIODOS
+        # Otimização (MVO e fallback analítico): só o período de estimação, sem look-ahead
+        self.rf_estimacao = self.taxa_livre_risco.media_mensal(pd.date_range(
+            periodos['estimacao_inicio'], periodos['estimacao_fim'], freq=pd.offsets.MonthEnd()))
+        # Relatórios: média mensal do período de teste (out-of-sample)
+        self.rf_rate = self.taxa_livre_risco.media_mensal(pd.date_range(
+            periodos['teste_inicio'], periodos['teste_fim'], freq=pd.offsets.MonthEnd()))
 
         print("="*60)
         print("ANALISADOR DE PORTFOLIO - TRES ESTRATEGIAS CORRIGIDO")
@@ -46,6 +57,7 @@ class AnalisadorPortfolio:
         print("OK Equal Risk Contribution (ERC)")
         print("OK Período: 2018-2019 (out-of-sample)")
         print(f"OK Taxa RF: {self.rf_rate:.4f} mensal ({self.rf_rate*12:.4f} anual)")
+        print(f"OK Taxa RF otimização (estimação): {self.rf_estimacao:.4f} mensal")
         print()
 
     def carregar_dados_historicos(self):
@@ -84,7 +96,7 @@ class AnalisadorPortfolio:
         annual_vol = portfolio_returns.std() * np.sqrt(12)
 
         # Calcular Sharpe com retornos mensais e anualizar corretamente
-        excess_returns = portfolio_returns - self.rf_rate
+        excess_returns = self.taxa_livre_risco.excesso(portfolio_returns)
         sharpe_mensal = excess_returns.mean() / excess_returns.std()
         sharpe_ratio = sharpe_mensal * np.sqrt(12)  # Anualizar multiplicando por √12
 
@@ -136,7 +148,7 @@ class AnalisadorPortfolio:
             if portfolio_vol < 1e-8:  # Evitar divisão por zero
                 return 1e6  # Penalidade alta
             # RF já está em base mensal, mu está anualizado, então converter RF para anual
-            rf_anual = self.rf_rate * 12
+            rf_anual = self.rf_estimacao * 12
             sharpe_ratio = (portfolio_return - rf_anual) / portfolio_vol
             return -sharpe_ratio  # Minimizar negativo = maximizar
 
@@ -184,7 +196,7 @@ class AnalisadorPortfolio:
         annual_vol = portfolio_returns.std() * np.sqrt(12)
 
         # Calcular Sharpe com retornos mensais e anualizar corretamente
-        excess_returns = portfolio_returns - self.rf_rate
+        excess_returns = self.taxa_livre_risco.excesso(portfolio_returns)
         sharpe_mensal = excess_returns.mean() / excess_returns.std()
         sharpe_ratio = sharpe_mensal * np.sqrt(12)  # Anualizar multiplicando por √12
 
@@ -229,7 +241,7 @@ class AnalisadorPortfolio:
             ones = np.ones((n, 1))
 
             # Excess returns (mu - rf) - converter RF para anual
-            rf_anual = self.rf_rate * 12
+            rf_anual = self.rf_estimacao * 12
             excess_returns = (mu.values - rf_anual).reshape(-1, 1)
 
             # Tangency Portfolio (Maximum Sharpe Ratio)
@@ -313,7 +325,7 @@ class AnalisadorPortfolio:
         annual_vol = portfolio_returns.std() * np.sqrt(12)
 
         # Calcular Sharpe com retornos mensais e anualizar corretamente
-        excess_returns = portfolio_returns - self.rf_rate
+        excess_returns = self.taxa_livre_risco.excesso(portfolio_returns)
         sharpe_mensal = excess_returns.mean() / excess_returns.std()
         sharpe_ratio = sharpe_mensal * np.sqrt(12)  # Anualizar multiplicando por √12
 
@@ -353,8 +365,8 @@ class AnalisadorPortfolio:
         Referência: Jobson, J.D. and Korkie, B.M. (1981)
         """
         # Calcular excess returns
-        excess_returns1 = returns1 - self.rf_rate
-        excess_returns2 = returns2 - self.rf_rate
+        excess_returns1 = self.taxa_livre_risco.excesso(returns1)
+        excess_returns2 = self.taxa_livre_risco.excesso(returns2)
 
         # Sharpe ratios anualizados
         sharpe1 = (excess_returns1.mean() / excess_returns1.std()) * np.sqrt(12)
@@ -400,23 +412,49 @@ class AnalisadorPortfolio:
             'n_observacoes': n
         }
 
+    def carregar_benchmark(self, indice):
+        """
+        Retornos mensais do IBOVESPA alinhados ao índice (None sem as grades)
+        """
+        try:
+            return SerieBenchmarkIbovespa().retornos_mensais(indice)
+        except FileNotFoundError as e:
+            print(f"   AVISO: Benchmark IBOVESPA indisponível: {e}")
+            return None
+
     def comparar_estrategias(self, ew_results, mvo_results, erc_results):
         """
         Compara performance das três estratégias com testes de significância
         """
         print("5. Comparando estratégias...")
 
+        # Benchmark IBOVESPA no mesmo índice mensal (métricas relativas)
+        benchmark = self.carregar_benchmark(ew_results['portfolio_returns'].index)
+
         # Criar tabela comparativa
         comparison_data = []
         for results in [ew_results, mvo_results, erc_results]:
-            comparison_data.append({
+            linha = {
                 'Estratégia': results['strategy'],
                 'Retorno_Anual_Pct': results['annual_return'] * 100,
                 'Volatilidade_Anual_Pct': results['annual_volatility'] * 100,
                 'Sharpe_Ratio': results['sharpe_ratio'],
                 'Sortino_Ratio': results['sortino_ratio'],
                 'Max_Drawdown_Pct': results['max_drawdown'] * 100
-            })
+            }
+            if benchmark is not None:
+                relativas = metricas_relativas(results['portfolio_returns'], benchmark)
+                linha.update({
+                    'Retorno_Ativo_IBOV_Pct': relativas['retorno_ativo_anual'] * 100,
+                    'Tracking_Error_Pct': relativas['tracking_error_anual'] * 100,
+                    'Information_Ratio': relativas['information_ratio'],
+                    'Beta_IBOV': relativas['beta']
+                })
+                print(f"   {results['strategy']} vs IBOVESPA: "
+                      f"ativo {relativas['retorno_ativo_anual']:.1%} a.a., "
+                      f"IR {relativas['information_ratio']:.3f}, beta {relativas['beta']:.2f} "
+                      f"({relativas['n_meses']} meses)")
+            comparison_data.append(linha)
 
         comparison_df = pd.DataFrame(comparison_data)
 
@@ -507,6 +545,7 @@ class AnalisadorPortfolio:
             "periodo_analise": "2018-01-01 a 2019-12-31",
             "taxa_livre_risco_mensal": self.rf_rate,
             "taxa_livre_risco_anual": self.rf_rate * 12,
+            "taxa_livre_risco_otimizacao_mensal": self.rf_estimacao,
             "total_ativos": len(returns_df.columns),
             "ativos_analisados": list(returns_df.columns),
             "estrategias": {
@@ -23,6 +23,8 @@ import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
+from taxa_livre_risco import obter_taxa_livre_risco
+
 # Configurar plots - Padronização acadêmica
 plt.style.use('seaborn-v0_8-whitegrid')
 # Cores consistentes e acadêmicas
@@ -266,12 +268,13 @@ class GeradorRelatorios:
             return {}
         
         returns_df = resultados['retornos_portfolios']
-        rf_rate = 0.0624 / 12  # Taxa mensal
+        # Taxa livre de risco mensal alinhada aos retornos (CDI ou constante)
+        rf_rate = obter_taxa_livre_risco().alinhar(returns_df.index)
         
         # Calcular Sharpe Ratios mensais
-        ew_sharpe = (returns_df['EW_Returns'].mean() - rf_rate) / returns_df['EW_Returns'].std()
-        mvo_sharpe = (returns_df['MVO_Returns'].mean() - rf_rate) / returns_df['MVO_Returns'].std()
-        erc_sharpe = (returns_df['ERC_Returns'].mean() - rf_rate) / returns_df['ERC_Returns'].std()
+        ew_sharpe = (returns_df['EW_Returns'] - rf_rate).mean() / returns_df['EW_Returns'].std()
+        mvo_sharpe = (returns_df['MVO_Returns'] - rf_rate).mean() / returns_df['MVO_Returns'].std()
+        erc_sharpe = (returns_df['ERC_Returns'] - rf_rate).mean() / returns_df['ERC_Returns'].std()
         
         # Função para teste Jobson-Korkie
         def jobson_korkie_test(returns1, returns2, rf_rate):
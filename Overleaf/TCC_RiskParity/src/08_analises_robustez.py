@@ -20,6 +20,7 @@ warnings.filterwarnings('ignore')
 
 # Importar configuração global
 from configuracao_global import get_config, get_logger
+from taxa_livre_risco import obter_taxa_livre_risco
 
 class AnalisesRobustezV2:
     """
@@ -102,7 +103,7 @@ class AnalisesRobustezV2:
         retornos_alt = self.retornos_df.drop(columns=[ativo_remover])
 
         # Calcular métricas para universo alternativo
-        rf_mensal = self.config.TAXA_LIVRE_RISCO['mensal']
+        rf_mensal = obter_taxa_livre_risco().alinhar(self.retornos_df.index)
 
         def calc_metricas_estrategia(retornos):
             ret_anual = np.mean(retornos) * 12 * 100
@@ -170,7 +171,7 @@ class AnalisesRobustezV2:
         print("\n2. VALIDAÇÃO ESTATÍSTICA (JOBSON-KORKIE)")
         print("-" * 40)
 
-        rf_mensal = self.config.TAXA_LIVRE_RISCO['mensal']
+        rf_mensal = obter_taxa_livre_risco().alinhar(self.retornos_estrategias_df.index)
         estrategias = list(self.retornos_estrategias_df.columns)
 
         # Calcular Sharpe Ratios
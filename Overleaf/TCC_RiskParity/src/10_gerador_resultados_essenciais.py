@@ -33,6 +33,8 @@ get_logger = config_module.get_logger
 get_path = config_module.get_path
 get_config = config_module.get_config
 
+from taxa_livre_risco import obter_taxa_livre_risco
+
 warnings.filterwarnings('ignore')
 
 class GeradorResultadosEssenciais:
@@ -111,7 +113,7 @@ class GeradorResultadosEssenciais:
         print("\n1. TABELA DE PERFORMANCE COMPLETA")
         print("-" * 50)
 
-        rf_mensal = self.config.TAXA_LIVRE_RISCO['mensal']
+        rf_mensal = obter_taxa_livre_risco().alinhar(self.retornos_portfolios.index)
 
         # Calcular métricas para cada estratégia
         resultados = []
@@ -292,7 +294,7 @@ class GeradorResultadosEssenciais:
         print("\n4. TABELA DE SIGNIFICÂNCIA ESTATÍSTICA")
         print("-" * 50)
 
-        rf_mensal = self.config.TAXA_LIVRE_RISCO['mensal']
+        rf_mensal = obter_taxa_livre_risco().alinhar(self.retornos_portfolios.index)
         estrategias = list(self.retornos_portfolios.columns)
 
         # Calcular Sharpe Ratios - anualizados
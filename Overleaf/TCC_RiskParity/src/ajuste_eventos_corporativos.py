@@ -0,0 +1,194 @@
+"""
+AJUSTE POR EVENTOS CORPORATIVOS - TCC Risk Parity v2.0
+Fatores de ajuste (desdobramentos e proventos) aplicados ao painel inteiro.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Ajuste vetorizado do painel de preços
+
+Tabela de eventos (CSV, uma linha por evento):
+    Ativo;Data;Tipo;Valor
+    PETR4;2018-05-02;dividendo;0.35     (Valor = provento em R$ por ação)
+    VALE3;2019-03-15;desdobramento;2    (Valor = novas ações por ação antiga)
+    MGLU3;2019-08-01;grupamento;0.125   (mesma convenção: 8 → 1 vira 0.125)
+
+Convenção do ajuste (retroativo, preço mais recente inalterado):
+- Desdobramento/grupamento com razão r na data ex: fator 1/r
+- Provento D na data ex: fator 1 - D / P, com P o último fechamento bruto
+  anterior à data ex
+- Preço ajustado em t = preço bruto em t x produto dos fatores com data ex > t
+
+Funcionalidades:
+- Fatores de todos os ativos em uma matriz (datas x ativos) e um único
+  produto acumulado reverso
+- Painel ajustado gravado ao lado do painel bruto, com chave no hash da
+  tabela de eventos e na origem do painel bruto
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from cache_economatica import calcular_hash_arquivo
+from painel_mercado import PainelMercado, ler_metadados
+
+COLUNAS_EVENTOS = ['Ativo', 'Data', 'Tipo', 'Valor']
+TIPOS_SPLIT = {'desdobramento', 'grupamento', 'split'}
+TIPOS_PROVENTO = {'dividendo', 'jcp', 'provento'}
+
+
+def carregar_eventos(caminho) -> pd.DataFrame:
+    """
+    Lê e valida a tabela de eventos corporativos.
+
+    Args:
+        caminho (Path): CSV com colunas Ativo, Data, Tipo e Valor (sep ';' ou ',')
+
+    Returns:
+        pd.DataFrame: Eventos tipados e ordenados por (Ativo, Data)
+    """
+    eventos = pd.read_csv(caminho, sep=None, engine='python')
+
+    faltando = [col for col in COLUNAS_EVENTOS if col not in eventos.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes na tabela de eventos: {faltando}")
+
+    eventos = eventos[COLUNAS_EVENTOS].copy()
+    eventos['Ativo'] = eventos['Ativo'].astype(str)
+    eventos['Data'] = pd.to_datetime(eventos['Data'])
+    eventos['Tipo'] = eventos['Tipo'].astype(str).str.strip().str.lower()
+    eventos['Valor'] = pd.to_numeric(eventos['Valor'], errors='raise')
+
+    desconhecidos = set(eventos['Tipo']) - TIPOS_SPLIT - TIPOS_PROVENTO
+    if desconhecidos:
+        raise ValueError(f"Tipos de evento desconhecidos: {sorted(desconhecidos)}")
+
+    splits_invalidos = eventos['Tipo'].isin(TIPOS_SPLIT) & (eventos['Valor'] <= 0)
+    if splits_invalidos.any():
+        raise ValueError(f"Razões de desdobramento/grupamento não positivas: "
+                         f"{eventos.loc[splits_invalidos, 'Ativo'].tolist()}")
+
+    return eventos.sort_values(['Ativo', 'Data'], kind='mergesort').reset_index(drop=True)
+
+
+def calcular_fatores_ajuste(precos: np.ndarray, datas, ativos, eventos: pd.DataFrame) -> np.ndarray:
+    """
+    Multiplicadores de ajuste retroativo para o painel inteiro.
+
+    Cada evento vira um fator na linha do primeiro pregão >= data ex; o
+    multiplicador de cada linha é o produto dos fatores das linhas seguintes
+    (produto acumulado reverso deslocado de uma linha).
+
+    Args:
+        precos (np.ndarray): Preços brutos (datas x ativos, NaN sem cotação)
+        datas (DatetimeIndex): Datas das linhas (ordenadas)
+        ativos (list): Tickers das colunas
+        eventos (pd.DataFrame): Saída de carregar_eventos
+
+    Returns:
+        np.ndarray: Multiplicadores (datas x ativos); preço ajustado = bruto x multiplicador
+    """
+    n_datas, n_ativos = precos.shape
+    fatores = np.ones((n_datas, n_ativos), dtype=np.float64)
+
+    posicao_ativo = pd.Index(ativos).get_indexer(eventos['Ativo'])
+    linhas = np.searchsorted(pd.DatetimeIndex(datas).values,
+                             eventos['Data'].to_numpy(dtype='datetime64[ns]'), side='left')
+
+    # Eventos de ativos fora do painel ou posteriores ao último pregão não afetam preços
+    no_painel = (posicao_ativo >= 0) & (linhas < n_datas) & (linhas > 0)
+    eventos = eventos[no_painel]
+    colunas = posicao_ativo[no_painel]
+    linhas = linhas[no_painel]
+
+    tipos = eventos['Tipo'].to_numpy()
+    valores = eventos['Valor'].to_numpy(dtype=np.float64)
+    fator_evento = np.ones(len(eventos), dtype=np.float64)
+
+    eh_split = np.isin(tipos, list(TIPOS_SPLIT))
+    fator_evento[eh_split] = 1.0 / valores[eh_split]
+
+    eh_provento = np.isin(tipos, list(TIPOS_PROVENTO))
+    if eh_provento.any():
+        # Último fechamento bruto antes da data ex (forward fill por índice)
+        indices = np.arange(n_datas)[:, None]
+        ultimo_valido = np.where(~np.isnan(precos), indices, 0)
+        np.maximum.accumulate(ultimo_valido, axis=0, out=ultimo_valido)
+        linha_anterior = ultimo_valido[linhas[eh_provento] - 1, colunas[eh_provento]]
+        preco_anterior = precos[linha_anterior, colunas[eh_provento]]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fator_provento = 1.0 - valores[eh_provento] / preco_anterior
+        # Sem preço anterior ou provento >= preço: evento ignorado
+        fator_provento[~(fator_provento > 0)] = 1.0
+        fator_evento[eh_provento] = fator_provento
+
+    np.multiply.at(fatores, (linhas, colunas), fator_evento)
+
+    # multiplicador[t] = prod(fatores[t+1:]) por coluna
+    multiplicadores = np.ones_like(fatores)
+    multiplicadores[:-1] = np.cumprod(fatores[:0:-1], axis=0)[::-1]
+
+    return multiplicadores
+
+
+def ajustar_painel(painel: PainelMercado, caminho_eventos=None) -> PainelMercado:
+    """
+    Retorna o painel ajustado por eventos, reaproveitando o cache em disco.
+
+    O painel ajustado fica em data/cache/painel_mercado_ajustado com campos
+    'Preço' (ajustado), 'Volume$' e 'Fator' (multiplicador aplicado). Ele é
+    reconstruído quando muda a tabela de eventos ou o painel bruto.
+
+    Args:
+        painel (PainelMercado): Painel bruto
+        caminho_eventos (Path): Tabela de eventos (None = CONFIG.INGESTAO['arquivo_eventos'])
+
+    Returns:
+        PainelMercado: Painel ajustado aberto em memória mapeada
+    """
+    logger = get_logger(__name__)
+    config = get_config()
+
+    if caminho_eventos is None:
+        caminho_eventos = config.data_dir / config.INGESTAO['arquivo_eventos']
+    caminho_eventos = Path(caminho_eventos)
+
+    hash_eventos = calcular_hash_arquivo(caminho_eventos)
+    origem = hashlib.sha256(
+        f"{painel.metadados.get('origem')}|{hash_eventos}".encode('utf-8')
+    ).hexdigest()
+
+    diretorio = PainelMercado.diretorio_padrao("painel_mercado_ajustado")
+    metadados = ler_metadados(diretorio)
+    if painel.metadados.get('origem') is not None and metadados and metadados.get('origem') == origem:
+        logger.info(f"   Painel ajustado atualizado: {diretorio}")
+        return PainelMercado.abrir(diretorio)
+
+    eventos = carregar_eventos(caminho_eventos)
+    precos = np.asarray(painel.campos['Preço'])
+    multiplicadores = calcular_fatores_ajuste(precos, painel.datas, painel.ativos, eventos)
+
+    campos = {
+        'Preço': precos * multiplicadores,
+        'Volume$': np.asarray(painel.campos['Volume$']),
+        'Fator': multiplicadores
+    }
+    ajustado = PainelMercado.salvar(diretorio, painel.datas, painel.ativos, campos, origem=origem)
+
+    n_ajustados = int((multiplicadores[0] != 1.0).sum())
+    logger.info(f"   Painel ajustado salvo: {len(eventos)} eventos, {n_ajustados} ativos com "
+                f"ajuste em {diretorio}")
+
+    return ajustado
@@ -0,0 +1,351 @@
+"""
+ARMAZÉM DE PREÇOS - TCC Risk Parity v2.0
+Camada única de acesso a preços, volumes e retornos para as etapas 01 e 02.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Acesso compartilhado aos dados de mercado
+
+Funcionalidades:
+- Uma instância por arquivo de origem e por processo (memoizada)
+- Leitura do export longo uma única vez: memória → cache Parquet → xlsx
+- Fonte única ou vários exports mesclados (manifesto/glob, ver ingestao_multipla)
+- Painel datas x ativos (np.memmap) construído/aberto sob demanda
+- Consultas de preço, volume e retornos por ativo e janela de datas
+- Preços brutos ou ajustados por eventos corporativos (painel ajustado em cache)
+- Flags de qualidade do painel (máscaras em cache, ver scanner_qualidade)
+- Universo elegível por data (bitmap em cache, ver indice_liquidez)
+- Sinais de seleção por mês e lookback (painéis em cache, ver motor_sinais)
+
+Rodando a etapa 01 e depois a etapa 02 no mesmo processo, o arquivo de
+origem é lido e tipado exatamente uma vez.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from cache_economatica import CacheEconomatica
+from leitores_economatica import COLUNAS_ESPERADAS, PADROES_EXPORT, ler_export_economatica
+from ingestao_multipla import IngestaoMultipla, eh_fonte_multipla, normalizar_fonte
+from painel_mercado import PainelMercado, ler_metadados
+from calendario_negociacao import CalendarioNegociacao
+from ajuste_eventos_corporativos import ajustar_painel
+from scanner_qualidade import ScannerQualidade
+from indice_liquidez import IndiceLiquidez
+from motor_sinais import MotorSinais
+
+# Instâncias do processo: {caminho absoluto: ArmazemPrecos}
+_ARMAZENS: Dict[Path, 'ArmazemPrecos'] = {}
+_ULTIMO_CAMINHO: Optional[Path] = None
+
+
+class ArmazemPrecos:
+    """
+    Acesso memoizado ao export longo da Economática (Data, Ativo, Preço, Volume$).
+
+    Uso típico:
+        armazem = ArmazemPrecos.obter(caminho_xlsx)
+        df = armazem.frame()                              # frame longo tipado
+        precos = armazem.precos(['PETR4'], '2018-01-01')  # datas x ativos
+        retornos = armazem.retornos(frequencia='M')
+    """
+
+    def __init__(self, caminho):
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+        self.caminho = Path(caminho)
+        self.cache = CacheEconomatica(self.config.cache_dir)
+        self.multipla = IngestaoMultipla(self.caminho) if eh_fonte_multipla(self.caminho) else None
+
+        self.chave: Optional[str] = None  # Chave do cache do frame carregado
+        self._assinatura = None           # (tamanho, mtime) do arquivo lido
+        self._frame: Optional[pd.DataFrame] = None
+        self._painel: Optional[PainelMercado] = None
+        self._painel_ajustado: Optional[PainelMercado] = None
+        self.leituras_fonte = 0           # Quantas vezes o xlsx foi efetivamente lido
+
+    @classmethod
+    def obter(cls, caminho=None) -> 'ArmazemPrecos':
+        """
+        Retorna a instância do processo para o arquivo (criando se necessário).
+
+        Args:
+            caminho (Path): Export da Economática, manifesto ou glob de exports
+                (None = último usado no processo ou, se nenhum, o
+                export *Economatica*.xlsx/.csv mais recente)
+
+        Returns:
+            ArmazemPrecos: Instância compartilhada
+        """
+        global _ULTIMO_CAMINHO
+
+        if caminho is None:
+            caminho = _ULTIMO_CAMINHO or cls._detectar_export()
+
+        chave = normalizar_fonte(caminho) if eh_fonte_multipla(caminho) else Path(caminho).resolve()
+        if chave not in _ARMAZENS:
+            _ARMAZENS[chave] = cls(chave)
+        _ULTIMO_CAMINHO = chave
+
+        return _ARMAZENS[chave]
+
+    @staticmethod
+    def _detectar_export() -> Path:
+        """Export *Economatica*.xlsx/.csv mais recente em data/DataBase"""
+        data_dir = get_config().data_dir
+        candidatos = sorted((p for padrao in PADROES_EXPORT for p in data_dir.glob(padrao)),
+                            key=lambda x: x.stat().st_mtime, reverse=True)
+        if not candidatos:
+            raise FileNotFoundError("Arquivo Economática não encontrado no diretório data")
+        return candidatos[0]
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+
+    def _assinatura_arquivo(self):
+        if self.multipla is not None:
+            return self.multipla.assinatura()
+        estado = self.caminho.stat()
+        return (estado.st_size, estado.st_mtime_ns)
+
+    def _ler_fonte(self) -> pd.DataFrame:
+        """
+        Lê a fonte (export único ou vários exports mesclados) e tipa o frame.
+
+        Returns:
+            pd.DataFrame: Colunas Data, Ativo, Preço e Volume$ validadas
+        """
+        self.leituras_fonte += 1
+
+        if self.multipla is not None:
+            return self.multipla.ler()
+        return ler_export_economatica(self.caminho)
+
+    def frame(self, usar_cache: bool = True) -> pd.DataFrame:
+        """
+        Frame longo tipado, lido no máximo uma vez por processo.
+
+        A memória do processo é consultada primeiro; depois o cache colunar
+        (chave no hash do arquivo e no mapeamento de colunas); só então o xlsx.
+        Se o arquivo mudar no disco, a instância é recarregada.
+
+        Args:
+            usar_cache (bool): Ler/gravar o cache colunar em data/cache
+
+        Returns:
+            pd.DataFrame: Frame longo (Data, Ativo, Preço, Volume$)
+        """
+        assinatura = self._assinatura_arquivo()
+        if self._frame is not None and assinatura == self._assinatura:
+            return self._frame
+
+        self._painel = None
+        self._painel_ajustado = None
+        if usar_cache:
+            mapeamento = {'sheet_name': 0, 'colunas': COLUNAS_ESPERADAS}
+            if self.multipla is not None:
+                self.chave = self.multipla.calcular_chave(mapeamento)
+            else:
+                self.chave = self.cache.calcular_chave(self.caminho, mapeamento)
+            df = self.cache.ler(self.caminho, self.chave)
+
+            if df is not None:
+                self.logger.info("   Dados lidos do cache colunar")
+            else:
+                df = self._ler_fonte()
+                self.cache.salvar(self.caminho, self.chave, df)
+        else:
+            self.chave = None
+            df = self._ler_fonte()
+
+        self._frame = df
+        self._assinatura = assinatura
+        return df
+
+    def painel(self) -> PainelMercado:
+        """
+        Painel datas x ativos em memória mapeada (data/cache/painel_mercado).
+
+        O painel em disco é reaproveitado quando foi gerado a partir do mesmo
+        arquivo de origem; caso contrário é reconstruído a partir do frame.
+
+        Returns:
+            PainelMercado: Painel aberto
+        """
+        df = self.frame()
+        if self._painel is not None:
+            return self._painel
+
+        diretorio = PainelMercado.diretorio_padrao()
+        metadados = ler_metadados(diretorio)
+        if self.chave is not None and metadados and metadados.get('origem') == self.chave:
+            self.logger.info(f"   Painel de mercado atualizado: {diretorio}")
+            self._painel = PainelMercado.abrir(diretorio)
+            return self._painel
+
+        # Sem mapeamentos do painel antigo abertos por este armazém
+        self._painel_ajustado = None
+        self._painel = PainelMercado.construir_de_frame_longo(df, diretorio, origem=self.chave)
+        self.logger.info(f"   Painel de mercado salvo: {self._painel.forma[0]} datas x "
+                         f"{self._painel.forma[1]} ativos em {diretorio}")
+        return self._painel
+
+    def painel_ajustado(self, caminho_eventos=None) -> PainelMercado:
+        """
+        Painel com preços ajustados por desdobramentos e proventos.
+
+        Sem tabela de eventos no disco, o painel bruto é retornado.
+
+        Args:
+            caminho_eventos (Path): Tabela de eventos (None = CONFIG.INGESTAO['arquivo_eventos'])
+
+        Returns:
+            PainelMercado: Painel ajustado (ou bruto, sem eventos)
+        """
+        if self._painel_ajustado is not None and caminho_eventos is None:
+            return self._painel_ajustado
+
+        if caminho_eventos is None:
+            caminho = self.config.data_dir / self.config.INGESTAO['arquivo_eventos']
+        else:
+            caminho = Path(caminho_eventos)
+
+        if not caminho.exists():
+            self.logger.warning(f"   Tabela de eventos não encontrada ({caminho}); usando preços brutos")
+            return self.painel()
+
+        painel = ajustar_painel(self.painel(), caminho)
+        if caminho_eventos is None:
+            self._painel_ajustado = painel
+        return painel
+
+    def _painel_consulta(self, ajustado: Optional[bool]) -> PainelMercado:
+        """Painel bruto ou ajustado (None = CONFIG.INGESTAO['ajustar_eventos'])"""
+        if ajustado is None:
+            ajustado = self.config.INGESTAO['ajustar_eventos']
+        return self.painel_ajustado() if ajustado else self.painel()
+
+    def qualidade(self, limiares: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Relatório de qualidade por ativo do painel bruto.
+
+        As máscaras ficam em data/cache/qualidade_painel e são reaproveitadas
+        enquanto o painel e os limiares não mudarem (ScannerQualidade.mascaras()).
+
+        Args:
+            limiares (dict): Limiares do scanner (None = padrão)
+
+        Returns:
+            pd.DataFrame: Relatório compacto por ativo
+        """
+        return ScannerQualidade(limiares).escanear(self.painel(), self.frame())
+
+    def indice_liquidez(self, janela_dias: Optional[int] = None) -> IndiceLiquidez:
+        """
+        Índice datado de elegibilidade aos filtros de liquidez.
+
+        O índice fica em bits em data/cache/indice_liquidez e é reaproveitado
+        enquanto o painel, a janela e os critérios não mudarem.
+
+        Args:
+            janela_dias (int): Pregões da janela móvel (None = CONFIG.INDICE_LIQUIDEZ)
+
+        Returns:
+            IndiceLiquidez: Índice aberto para consultas
+        """
+        return IndiceLiquidez(janela_dias).construir(self.painel())
+
+    def sinais(self, lookbacks: Optional[Dict] = None) -> MotorSinais:
+        """
+        Painéis meses x ativos dos fatores de seleção (momentum, volatilidade,
+        drawdown e downside) para os lookbacks configurados.
+
+        Os painéis ficam em data/cache/sinais e são reaproveitados enquanto o
+        painel e os lookbacks não mudarem.
+
+        Args:
+            lookbacks (dict): Lookbacks em meses por fator (None = CONFIG.MOTOR_SINAIS)
+
+        Returns:
+            MotorSinais: Motor aberto para consultas
+        """
+        return MotorSinais(lookbacks).construir(self.painel())
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def ativos(self) -> List[str]:
+        """Tickers disponíveis (ordem das colunas do painel)"""
+        return list(self.painel().ativos)
+
+    def precos(self, ativos: Optional[List[str]] = None, inicio=None, fim=None,
+               ajustado: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Preços de fechamento (datas x ativos; NaN onde não há cotação).
+
+        Args:
+            ativos (list): Tickers (None = todos)
+            inicio, fim: Janela de datas inclusiva
+            ajustado (bool): Preços ajustados por eventos (None = configuração)
+
+        Returns:
+            pd.DataFrame: Preços indexados por data
+        """
+        return self._painel_consulta(ajustado).para_dataframe('Preço', inicio, fim, ativos)
+
+    def volumes(self, ativos: Optional[List[str]] = None, inicio=None, fim=None) -> pd.DataFrame:
+        """Volumes financeiros (datas x ativos; NaN onde não há cotação)"""
+        return self.painel().para_dataframe('Volume$', inicio, fim, ativos)
+
+    def serie_precos(self, ativo: str, inicio=None, fim=None,
+                     ajustado: Optional[bool] = None) -> pd.Series:
+        """
+        Série de preços de um ativo apenas nos dias com cotação.
+
+        Returns:
+            pd.Series: Preços indexados por data (sem NaNs)
+        """
+        return self.precos([ativo], inicio, fim, ajustado)[ativo].dropna()
+
+    def retornos(self, ativos: Optional[List[str]] = None, inicio=None, fim=None,
+                 frequencia: str = 'D', ajustado: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Retornos simples por ativo.
+
+        Diários ('D'): variação entre cotações consecutivas de cada ativo.
+        Mensais ('M'): variação do último preço de cada mês (calendário de
+        pregões), como nas etapas 01 e 02.
+        Para que o primeiro retorno da janela exista, inclua em inicio o
+        período anterior (ex.: dezembro para retornos a partir de janeiro).
+
+        Args:
+            ativos (list): Tickers (None = todos)
+            inicio, fim: Janela de datas inclusiva dos preços usados
+            frequencia (str): 'D' ou 'M'
+            ajustado (bool): Usar preços ajustados por eventos (None = configuração)
+
+        Returns:
+            pd.DataFrame: Retornos (datas x ativos)
+        """
+        precos = self.precos(ativos, inicio, fim, ajustado)
+
+        if frequencia == 'M':
+            precos_mensais = CalendarioNegociacao(precos.index).amostrar_fim_mes(precos)
+            return precos_mensais.pct_change(fill_method=None)
+        if frequencia == 'D':
+            return precos.apply(lambda serie: serie.dropna().pct_change()).reindex(precos.index)
+
+        raise ValueError(f"Frequência não suportada: {frequencia!r} (use 'D' ou 'M')")
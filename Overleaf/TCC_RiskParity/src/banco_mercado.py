@@ -0,0 +1,249 @@
+"""
+BANCO DE MERCADO (SQLite) - TCC Risk Parity v2.0
+Armazenamento indexado do frame longo para consultas pontuais no tempo.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Banco embarcado com consultas point-in-time
+
+Estrutura (arquivo único data/mercado.sqlite):
+- precos(ativo, data, preco, volume)  PRIMARY KEY (ativo, data), WITHOUT ROWID
+- idx_precos_data                     Índice (data, ativo) para cortes transversais
+- metadados(chave, valor)             Origem dos dados (chave do cache do export)
+
+Consultas disponíveis:
+- Série de um ativo entre duas datas (busca na chave primária)
+- Janela de vários ativos no formato do frame longo do carregador
+- Universo líquido em uma data, usando apenas a janela anterior a ela
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from leitores_economatica import COLUNAS_ESPERADAS
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS precos (
+    ativo  TEXT NOT NULL,
+    data   TEXT NOT NULL,
+    preco  REAL,
+    volume REAL,
+    PRIMARY KEY (ativo, data)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_precos_data ON precos (data, ativo);
+CREATE TABLE IF NOT EXISTS metadados (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+
+def _texto_data(data) -> str:
+    """Data no formato armazenado ('AAAA-MM-DD', ordenável como texto)"""
+    return pd.Timestamp(data).strftime('%Y-%m-%d')
+
+
+class BancoMercado:
+    """
+    Banco SQLite embarcado com o frame longo (Data, Ativo, Preço, Volume$).
+
+    Uso típico:
+        banco = BancoMercado()
+        banco.carregar_frame(df, origem=chave)
+        serie = banco.precos_ativo('PETR4', '2018-01-01', '2019-12-31')
+        universo = banco.universo_liquido('2017-12-29')
+    """
+
+    def __init__(self, caminho=None):
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+        self.caminho = Path(caminho) if caminho else self.config.projeto_root / "data" / "mercado.sqlite"
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conexao = sqlite3.connect(str(self.caminho))
+        self.conexao.executescript(ESQUEMA)
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+
+    def origem(self) -> Optional[str]:
+        """Identificador da fonte carregada por último (None se vazio)"""
+        linha = self.conexao.execute(
+            "SELECT valor FROM metadados WHERE chave = 'origem'"
+        ).fetchone()
+        return linha[0] if linha else None
+
+    def carregar_frame(self, df: pd.DataFrame, origem: Optional[str] = None) -> int:
+        """
+        Substitui o conteúdo do banco pelo frame longo informado.
+
+        A carga roda em uma única transação; em duplicatas (Ativo, Data)
+        vale a última linha.
+
+        Args:
+            df (pd.DataFrame): Frame longo do carregador Economática
+            origem (str): Identificador da fonte (ex.: chave do cache)
+
+        Returns:
+            int: Linhas gravadas
+        """
+        df = df[COLUNAS_ESPERADAS].drop_duplicates(['Ativo', 'Data'], keep='last')
+
+        linhas = zip(
+            df['Ativo'].astype(str).tolist(),
+            pd.to_datetime(df['Data']).dt.strftime('%Y-%m-%d').tolist(),
+            df['Preço'].to_numpy(dtype=np.float64).tolist(),
+            df['Volume$'].to_numpy(dtype=np.float64).tolist()
+        )
+
+        with self.conexao:
+            self.conexao.execute("DELETE FROM precos")
+            self.conexao.executemany(
+                "INSERT INTO precos (ativo, data, preco, volume) VALUES (?, ?, ?, ?)", linhas
+            )
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO metadados (chave, valor) VALUES ('origem', ?)", (origem,)
+            )
+        self.conexao.execute("ANALYZE")
+
+        self.logger.info(f"   Banco de mercado: {len(df)} linhas gravadas em {self.caminho}")
+        return len(df)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def precos_ativo(self, ativo: str, inicio=None, fim=None) -> pd.DataFrame:
+        """
+        Série de preço e volume de um ativo (varredura na chave primária).
+
+        Args:
+            ativo (str): Ticker
+            inicio, fim: Janela de datas inclusiva (None = sem limite)
+
+        Returns:
+            pd.DataFrame: Colunas Preço e Volume$ indexadas por Data
+        """
+        inicio = _texto_data(inicio) if inicio is not None else '0000-01-01'
+        fim = _texto_data(fim) if fim is not None else '9999-12-31'
+
+        linhas = self.conexao.execute(
+            "SELECT data, preco, volume FROM precos "
+            "WHERE ativo = ? AND data BETWEEN ? AND ? ORDER BY data",
+            (ativo, inicio, fim)
+        ).fetchall()
+
+        df = pd.DataFrame(linhas, columns=['Data', 'Preço', 'Volume$'])
+        df['Data'] = pd.to_datetime(df['Data'])
+        return df.set_index('Data')
+
+    def janela(self, ativos: Optional[List[str]] = None, inicio=None, fim=None) -> pd.DataFrame:
+        """
+        Janela de vários ativos no formato do frame longo do carregador.
+
+        Args:
+            ativos (list): Tickers (None = todos)
+            inicio, fim: Janela de datas inclusiva (None = sem limite)
+
+        Returns:
+            pd.DataFrame: Colunas Data, Ativo, Preço e Volume$ ordenadas por (Data, Ativo)
+        """
+        condicoes = ["data BETWEEN ? AND ?"]
+        parametros = [
+            _texto_data(inicio) if inicio is not None else '0000-01-01',
+            _texto_data(fim) if fim is not None else '9999-12-31'
+        ]
+        if ativos is not None:
+            condicoes.append(f"ativo IN ({','.join('?' * len(ativos))})")
+            parametros.extend(ativos)
+
+        linhas = self.conexao.execute(
+            "SELECT data, ativo, preco, volume FROM precos "
+            f"WHERE {' AND '.join(condicoes)} ORDER BY data, ativo",
+            parametros
+        ).fetchall()
+
+        df = pd.DataFrame(linhas, columns=COLUNAS_ESPERADAS)
+        df['Data'] = pd.to_datetime(df['Data'])
+        return df
+
+    def datas_negociacao(self, inicio=None, fim=None) -> pd.DatetimeIndex:
+        """Datas distintas do banco na janela (varredura do índice por data)"""
+        linhas = self.conexao.execute(
+            "SELECT DISTINCT data FROM precos WHERE data BETWEEN ? AND ? ORDER BY data",
+            (_texto_data(inicio) if inicio is not None else '0000-01-01',
+             _texto_data(fim) if fim is not None else '9999-12-31')
+        ).fetchall()
+        return pd.DatetimeIndex([linha[0] for linha in linhas])
+
+    def universo_liquido(self, data, janela_dias: int = 252,
+                         volume_min: Optional[float] = None,
+                         presenca_min: Optional[float] = None) -> pd.DataFrame:
+        """
+        Ativos líquidos em uma data, usando apenas os pregões até ela (sem look-ahead).
+
+        Na janela dos últimos janela_dias pregões do mercado até a data, com
+        as definições de calcular_metricas_liquidez (etapa 01), para que
+        presenca_min_bolsa selecione o mesmo universo nos dois caminhos:
+        - volume_medio_diario: média do Volume$ nos dias com cotação
+        - presenca_bolsa: dias com volume > 0 / observações do ativo na janela
+
+        Args:
+            data: Data de referência (inclusiva)
+            janela_dias (int): Pregões na janela móvel
+            volume_min (float): Volume médio mínimo (None = LIQUIDEZ_CRITERIA)
+            presenca_min (float): Presença mínima (None = LIQUIDEZ_CRITERIA)
+
+        Returns:
+            pd.DataFrame: Ativos elegíveis ordenados por volume médio decrescente
+        """
+        criterios = self.config.LIQUIDEZ_CRITERIA
+        volume_min = criterios['volume_min_diario'] if volume_min is None else volume_min
+        presenca_min = criterios['presenca_min_bolsa'] if presenca_min is None else presenca_min
+
+        fim = _texto_data(data)
+        datas_janela = self.conexao.execute(
+            "SELECT data FROM (SELECT DISTINCT data FROM precos WHERE data <= ? "
+            "ORDER BY data DESC LIMIT ?) ORDER BY data",
+            (fim, janela_dias)
+        ).fetchall()
+
+        colunas = ['ativo', 'volume_medio_diario', 'presenca_bolsa', 'observacoes']
+        if not datas_janela:
+            return pd.DataFrame(columns=colunas)
+
+        inicio = datas_janela[0][0]
+
+        linhas = self.conexao.execute(
+            "SELECT ativo, AVG(volume), SUM(volume > 0) * 1.0 / COUNT(*), COUNT(*) "
+            "FROM precos WHERE data BETWEEN ? AND ? GROUP BY ativo "
+            "HAVING AVG(volume) >= ? AND SUM(volume > 0) * 1.0 / COUNT(*) >= ? "
+            "ORDER BY AVG(volume) DESC",
+            (inicio, fim, volume_min, presenca_min)
+        ).fetchall()
+
+        return pd.DataFrame(linhas, columns=colunas)
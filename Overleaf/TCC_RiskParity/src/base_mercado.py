@@ -0,0 +1,372 @@
+"""
+BASE DE MERCADO INCREMENTAL - TCC Risk Parity v2.0
+Armazenamento particionado do frame longo com ingestão incremental.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Ingestão incremental com watermark por ativo
+
+Estrutura em disco:
+- particoes/AAAA-MM.parquet  Linhas (Data, Ativo, Preço, Volume$) do mês
+- manifesto.json             Watermark por ativo e checksums por partição
+                             (da partição e de cada ativo nela)
+
+Regras da ingestão incremental:
+- Linhas com Data > watermark do ativo (ou de ativos novos) são anexadas
+- Linhas com Data <= watermark são conferidas, ativo a ativo, contra a base
+  no intervalo coberto pelo export; só ativos presentes no export são
+  conferidos (um export parcial não apaga o histórico dos demais)
+- Qualquer divergência (linha alterada, removida ou inserida no passado)
+  dispara uma recarga mesclada: no intervalo do export, as linhas dos ativos
+  do export são substituídas pelas do export; os demais ativos e o histórico
+  anterior ao export são mantidos
+- Duplicatas (Ativo, Data) são resolvidas mantendo a última ocorrência
+"""
+
+import hashlib
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from leitores_economatica import COLUNAS_ESPERADAS
+
+
+def _normalizar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coloca o frame na forma canônica da base: tipos fixos, sem duplicatas
+    (Ativo, Data) e ordenado por (Ativo, Data).
+    """
+    df = df[COLUNAS_ESPERADAS].copy()
+    df['Data'] = pd.to_datetime(df['Data']).astype('datetime64[ns]')
+    df['Ativo'] = df['Ativo'].astype(str)
+    df['Preço'] = df['Preço'].astype(np.float64)
+    df['Volume$'] = df['Volume$'].astype(np.float64)
+
+    df = df.drop_duplicates(['Ativo', 'Data'], keep='last')
+    return df.sort_values(['Ativo', 'Data'], kind='mergesort').reset_index(drop=True)
+
+
+def calcular_checksum(df: pd.DataFrame) -> str:
+    """
+    Checksum determinístico de um conjunto de linhas já normalizado.
+
+    Args:
+        df (pd.DataFrame): Linhas na forma canônica (ordenadas por Ativo, Data)
+
+    Returns:
+        str: Hash SHA-256 hexadecimal
+    """
+    hashes = pd.util.hash_pandas_object(df[COLUNAS_ESPERADAS], index=False)
+    return hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest()
+
+
+def checksums_por_ativo(df: pd.DataFrame) -> Dict[str, str]:
+    """Checksum das linhas de cada ativo de um frame já normalizado"""
+    return {ativo: calcular_checksum(grupo) for ativo, grupo in df.groupby('Ativo', sort=True)}
+
+
+class BaseMercadoIncremental:
+    """
+    Base de mercado particionada por mês com watermark por ativo.
+
+    Uso típico:
+        base = BaseMercadoIncremental()
+        resumo = base.ingerir(df_export)   # inicial, incremental ou recarga
+        df = base.ler('2018-01-01', '2019-12-31')
+    """
+
+    def __init__(self, diretorio=None):
+        self.logger = get_logger(__name__)
+        self.diretorio = Path(diretorio) if diretorio else get_config().cache_dir / "base_mercado"
+        self.dir_particoes = self.diretorio / "particoes"
+        self.caminho_manifesto = self.diretorio / "manifesto.json"
+        self.manifesto = self._carregar_manifesto()
+
+    # ------------------------------------------------------------------
+    # Manifesto e partições
+    # ------------------------------------------------------------------
+
+    def _carregar_manifesto(self) -> Dict:
+        """Carrega o manifesto (ou um manifesto vazio)"""
+        if self.caminho_manifesto.exists():
+            with open(self.caminho_manifesto, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'watermarks': {}, 'particoes': {}, 'atualizado_em': None}
+
+    def _salvar_manifesto(self):
+        """Grava o manifesto de forma atômica"""
+        self.manifesto['atualizado_em'] = datetime.now().isoformat()
+        temporario = self.caminho_manifesto.with_suffix('.json.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto, f, indent=2, ensure_ascii=False)
+        temporario.replace(self.caminho_manifesto)
+
+    @staticmethod
+    def _chave_particao(datas: pd.Series) -> pd.Series:
+        """Partição mensal 'AAAA-MM' de cada linha"""
+        return datas.dt.strftime('%Y-%m')
+
+    def _caminho_particao(self, particao: str) -> Path:
+        return self.dir_particoes / f"{particao}.parquet"
+
+    def _ler_particao(self, particao: str) -> pd.DataFrame:
+        caminho = self._caminho_particao(particao)
+        if not caminho.exists():
+            return pd.DataFrame(columns=COLUNAS_ESPERADAS)
+        return _normalizar_frame(pd.read_parquet(caminho))
+
+    def _gravar_particao(self, particao: str, df: pd.DataFrame):
+        """Grava uma partição já normalizada e atualiza o manifesto"""
+        self.dir_particoes.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(self._caminho_particao(particao), index=False)
+        self.manifesto['particoes'][particao] = {
+            'checksum': calcular_checksum(df),
+            'checksums_ativos': checksums_por_ativo(df),
+            'linhas': int(len(df)),
+            'data_min': df['Data'].min().strftime('%Y-%m-%d'),
+            'data_max': df['Data'].max().strftime('%Y-%m-%d')
+        }
+
+    # ------------------------------------------------------------------
+    # Ingestão
+    # ------------------------------------------------------------------
+
+    def carga_completa(self, df: pd.DataFrame) -> Dict:
+        """
+        Reconstrói a base inteira a partir de um export.
+
+        Args:
+            df (pd.DataFrame): Frame longo tipado
+
+        Returns:
+            dict: Resumo da carga
+        """
+        df = _normalizar_frame(df)
+
+        if self.dir_particoes.exists():
+            shutil.rmtree(self.dir_particoes)
+        self.manifesto = {'watermarks': {}, 'particoes': {}, 'atualizado_em': None}
+
+        particoes = self._chave_particao(df['Data'])
+        for particao, grupo in df.groupby(particoes, sort=True):
+            self._gravar_particao(particao, grupo.reset_index(drop=True))
+
+        self.manifesto['watermarks'] = {
+            ativo: data.strftime('%Y-%m-%d')
+            for ativo, data in df.groupby('Ativo')['Data'].max().items()
+        }
+        self._salvar_manifesto()
+
+        self.logger.info(f"   Base recarregada: {len(df)} linhas em {particoes.nunique()} partições")
+        return {
+            'modo': 'completa',
+            'linhas_novas': int(len(df)),
+            'particoes_atualizadas': sorted(particoes.unique().tolist())
+        }
+
+    def _ativos_alterados(self, df: pd.DataFrame, antigos: pd.DataFrame) -> List[str]:
+        """
+        Confere, ativo a ativo, as linhas já ingeridas contra o export.
+
+        Só entram na conferência os ativos presentes no export, no intervalo
+        coberto por ele (da primeira data do export em diante). Partições
+        inteiramente cobertas são comparadas pelos checksums por ativo do
+        manifesto; a partição em que o export começa (cobertura parcial) é
+        lida e comparada no intervalo sobreposto.
+
+        Args:
+            df (pd.DataFrame): Export normalizado
+            antigos (pd.DataFrame): Linhas do export com Data <= watermark do ativo
+
+        Returns:
+            list: Ativos cujas linhas antigas divergem da base
+        """
+        if df.empty:
+            return []
+
+        inicio_export = df['Data'].min()
+        ativos_export = set(df['Ativo'].unique())
+        alterados = set()
+
+        particoes = self._chave_particao(antigos['Data'])
+        grupos = {particao: grupo for particao, grupo in antigos.groupby(particoes, sort=True)}
+
+        # Linhas antigas do export em meses que a base não tem: inseridas no passado
+        for particao, grupo in grupos.items():
+            if particao not in self.manifesto['particoes']:
+                alterados.update(grupo['Ativo'].unique())
+
+        for particao, meta in self.manifesto['particoes'].items():
+            if pd.Timestamp(meta['data_max']) < inicio_export:
+                continue
+
+            grupo = grupos.get(particao, antigos.iloc[:0])
+            do_export = checksums_por_ativo(grupo.reset_index(drop=True))
+
+            if inicio_export <= pd.Timestamp(meta['data_min']) and 'checksums_ativos' in meta:
+                da_base = meta['checksums_ativos']
+            else:
+                armazenado = self._ler_particao(particao)
+                armazenado = armazenado[armazenado['Data'] >= inicio_export].reset_index(drop=True)
+                da_base = checksums_por_ativo(armazenado)
+
+            for ativo in (set(do_export) | set(da_base)) & ativos_export:
+                if do_export.get(ativo) != da_base.get(ativo):
+                    alterados.add(ativo)
+
+        return sorted(alterados)
+
+    def recarga_mesclada(self, df: pd.DataFrame) -> Dict:
+        """
+        Substitui, no intervalo do export, as linhas dos ativos do export.
+
+        Ativos ausentes do export e linhas anteriores à primeira data do
+        export permanecem na base.
+
+        Args:
+            df (pd.DataFrame): Frame longo tipado
+
+        Returns:
+            dict: Resumo da recarga
+        """
+        df = _normalizar_frame(df)
+        inicio_export = df['Data'].min()
+        ativos_export = df['Ativo'].unique()
+
+        # Partições da base que o export pode alterar
+        afetadas = sorted(particao for particao, meta in self.manifesto['particoes'].items()
+                          if pd.Timestamp(meta['data_max']) >= inicio_export)
+        partes = [self._ler_particao(particao) for particao in afetadas]
+        armazenado = pd.concat(partes, ignore_index=True) if partes else df.iloc[:0]
+
+        substituidas = armazenado['Ativo'].isin(ativos_export) & (armazenado['Data'] >= inicio_export)
+        combinado = _normalizar_frame(pd.concat([armazenado[~substituidas], df], ignore_index=True))
+
+        particoes = self._chave_particao(combinado['Data'])
+        for particao in set(afetadas) - set(particoes.unique()):
+            self._caminho_particao(particao).unlink(missing_ok=True)
+            del self.manifesto['particoes'][particao]
+        for particao, grupo in combinado.groupby(particoes, sort=True):
+            self._gravar_particao(particao, grupo.reset_index(drop=True))
+
+        ultimas = combinado[combinado['Ativo'].isin(ativos_export)].groupby('Ativo')['Data'].max()
+        for ativo, data in ultimas.items():
+            self.manifesto['watermarks'][ativo] = data.strftime('%Y-%m-%d')
+        self._salvar_manifesto()
+
+        self.logger.info(f"   Recarga mesclada: {len(df)} linhas de {len(ativos_export)} ativos, "
+                         f"{int(substituidas.sum())} linhas da base substituídas, "
+                         f"{particoes.nunique()} partições regravadas")
+        return {
+            'modo': 'recarga',
+            'linhas_novas': int(len(df)),
+            'linhas_substituidas': int(substituidas.sum()),
+            'particoes_atualizadas': sorted(particoes.unique().tolist())
+        }
+
+    def ingerir(self, df_export: pd.DataFrame) -> Dict:
+        """
+        Ingere um export novo de forma incremental.
+
+        Args:
+            df_export (pd.DataFrame): Frame longo tipado do export mais recente
+
+        Returns:
+            dict: Resumo com modo ('inicial', 'incremental' ou 'recarga'),
+                linhas novas e partições atualizadas
+        """
+        if not self.manifesto['particoes']:
+            resumo = self.carga_completa(df_export)
+            resumo['modo'] = 'inicial'
+            return resumo
+
+        df = _normalizar_frame(df_export)
+
+        watermarks = pd.to_datetime(pd.Series(self.manifesto['watermarks'], dtype=object))
+        limite = df['Ativo'].map(watermarks)
+        eh_antiga = limite.notna() & (df['Data'] <= limite)
+
+        antigos = df[eh_antiga]
+        novos = df[~eh_antiga]
+
+        alterados = self._ativos_alterados(df, antigos)
+        if alterados:
+            self.logger.warning(f"   Linhas antigas alteradas em {len(alterados)} ativos "
+                                f"({alterados[:5]}...) - recarga mesclada")
+            return self.recarga_mesclada(df)
+
+        particoes_novas = self._chave_particao(novos['Data'])
+        atualizadas = []
+        for particao, grupo in novos.groupby(particoes_novas, sort=True):
+            armazenado = self._ler_particao(particao)
+            combinado = _normalizar_frame(pd.concat([armazenado, grupo]) if len(armazenado) else grupo)
+            self._gravar_particao(particao, combinado)
+            atualizadas.append(particao)
+
+        for ativo, data in novos.groupby('Ativo')['Data'].max().items():
+            self.manifesto['watermarks'][ativo] = data.strftime('%Y-%m-%d')
+        self._salvar_manifesto()
+
+        self.logger.info(f"   Ingestão incremental: {len(novos)} linhas novas, "
+                         f"{len(antigos)} conferidas, {len(atualizadas)} partições atualizadas")
+        return {
+            'modo': 'incremental',
+            'linhas_novas': int(len(novos)),
+            'particoes_atualizadas': atualizadas
+        }
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def watermark(self, ativo: str) -> Optional[pd.Timestamp]:
+        """Última data ingerida de um ativo (None se desconhecido)"""
+        data = self.manifesto['watermarks'].get(ativo)
+        return pd.Timestamp(data) if data else None
+
+    def ler(self, inicio=None, fim=None, ativos=None) -> pd.DataFrame:
+        """
+        Lê a base (ou uma janela dela) no formato do carregador.
+
+        Args:
+            inicio, fim: Janela de datas inclusiva (None = sem limite)
+            ativos (list): Subconjunto de tickers (None = todos)
+
+        Returns:
+            pd.DataFrame: Frame longo ordenado por (Data, Ativo)
+        """
+        p_inicio = pd.Timestamp(inicio).strftime('%Y-%m') if inicio is not None else None
+        p_fim = pd.Timestamp(fim).strftime('%Y-%m') if fim is not None else None
+
+        partes = []
+        for particao in sorted(self.manifesto['particoes']):
+            if (p_inicio and particao < p_inicio) or (p_fim and particao > p_fim):
+                continue
+            partes.append(pd.read_parquet(self._caminho_particao(particao)))
+
+        if not partes:
+            return pd.DataFrame(columns=COLUNAS_ESPERADAS)
+
+        df = pd.concat(partes, ignore_index=True)
+        if inicio is not None:
+            df = df[df['Data'] >= pd.Timestamp(inicio)]
+        if fim is not None:
+            df = df[df['Data'] <= pd.Timestamp(fim)]
+        if ativos is not None:
+            df = df[df['Ativo'].isin(ativos)]
+
+        return df.sort_values(['Data', 'Ativo'], kind='mergesort').reset_index(drop=True)
@@ -0,0 +1,223 @@
+"""
+BENCHMARK DE INGESTÃO - TCC Risk Parity v2.0
+Mede o tempo das etapas de leitura/limpeza de dados da Economática.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Benchmarks de ingestão
+
+Benchmarks disponíveis:
+- Limpeza de sheet por ativo (loop linha a linha vs. vetorizado)
+- Export longo: xlsx (openpyxl) vs. CSV (leitor colunar) com os mesmos dados
+"""
+
+import sys
+import time
+import tempfile
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Configuração global pelo caminho (os módulos de src/ a importam como _00_configuracao_global)
+if "_00_configuracao_global" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "_00_configuracao_global", Path(__file__).parent / "00_configuracao_global.py"
+    )
+    configuracao_module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = configuracao_module
+    spec.loader.exec_module(configuracao_module)
+
+# Importar extrator (módulo com prefixo numérico)
+spec = importlib.util.spec_from_file_location(
+    "extrator_dados_historicos", Path(__file__).parent / "02_extrator_dados_historicos.py"
+)
+extrator_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(extrator_module)
+ExtratorDadosHistoricos = extrator_module.ExtratorDadosHistoricos
+
+from leitores_economatica import ler_export_economatica
+
+
+def gerar_sheet_sintetica(anos=20, seed=42):
+    """
+    Gera uma sheet bruta no formato Economática (título, cabeçalho, dados diários)
+
+    Args:
+        anos (int): Anos de histórico diário
+        seed (int): Semente do gerador aleatório
+
+    Returns:
+        pd.DataFrame: Sheet como lida por pd.read_excel (colunas object)
+    """
+    rng = np.random.default_rng(seed)
+    datas = pd.bdate_range(end='2019-12-31', periods=252 * anos)
+
+    precos = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, len(datas))))
+    precos = precos.astype(object)
+    precos[::97] = '-'   # células sem cotação
+    precos[5] = 0.0      # preço inválido
+
+    datas_col = pd.Series(list(datas), dtype=object)
+    datas_col.iloc[10] = 'n/d'
+
+    corpo = pd.DataFrame({
+        'Economatica': datas_col,
+        'Unnamed: 1': rng.normal(size=len(datas)),
+        'Unnamed: 2': precos
+    })
+    topo = pd.DataFrame(
+        [[None, None, None], ['Data', 'Volume', 'Fechamento']],
+        columns=corpo.columns
+    )
+
+    # Linhas repetidas no final simulam datas duplicadas na exportação
+    return pd.concat([topo, corpo, corpo.iloc[-3:]], ignore_index=True)
+
+
+def _limpar_linha_a_linha(df, header_row, inicio, fim):
+    """Implementação de referência (loop por linha) usada antes da vetorização"""
+    data_rows = df.iloc[header_row + 1:].copy()
+    dates_col = data_rows.iloc[:, 0]
+    prices_col = data_rows.iloc[:, -1]
+
+    clean_data = []
+    for i in range(len(dates_col)):
+        try:
+            date_val = pd.to_datetime(dates_col.iloc[i], errors='coerce')
+            price_val = pd.to_numeric(prices_col.iloc[i], errors='coerce')
+
+            if pd.notna(date_val) and pd.notna(price_val) and price_val > 0:
+                if inicio <= date_val.strftime('%Y-%m-%d') <= fim:
+                    clean_data.append({'Date': date_val, 'Price': price_val})
+        except:
+            continue
+
+    if len(clean_data) < 20:
+        return None
+
+    asset_df = pd.DataFrame(clean_data)
+    asset_df = asset_df.drop_duplicates('Date').sort_values('Date')
+    return asset_df.set_index('Date')
+
+
+def _cronometrar(funcao, repeticoes):
+    """Retorna (melhor tempo em segundos, resultado da última execução)"""
+    melhor = np.inf
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def benchmark_limpeza_sheet(anos=20, inicio='1999-01-01', fim='2019-12-31', repeticoes=3):
+    """
+    Compara a limpeza linha a linha com a versão vetorizada do extrator
+
+    Returns:
+        dict: Tempos, speedup e verificação de igualdade das saídas
+    """
+    df_sheet = gerar_sheet_sintetica(anos)
+    header_row = ExtratorDadosHistoricos._encontrar_linha_cabecalho(df_sheet)
+
+    tempo_loop, saida_loop = _cronometrar(
+        lambda: _limpar_linha_a_linha(df_sheet, header_row, inicio, fim), repeticoes
+    )
+    tempo_vetorizado, saida_vetorizada = _cronometrar(
+        lambda: ExtratorDadosHistoricos._limpar_dados_sheet(df_sheet, inicio, fim), repeticoes
+    )
+
+    pd.testing.assert_frame_equal(saida_loop, saida_vetorizada)
+
+    return {
+        'linhas': len(df_sheet),
+        'tempo_loop_s': tempo_loop,
+        'tempo_vetorizado_s': tempo_vetorizado,
+        'speedup': tempo_loop / tempo_vetorizado,
+        'saidas_identicas': True
+    }
+
+
+def gerar_export_longo(n_ativos=50, anos=5, seed=42):
+    """
+    Gera um export longo sintético (Data, Ativo, Preço, Volume$)
+
+    Returns:
+        pd.DataFrame: Frame tipado como o retornado pelos leitores
+    """
+    rng = np.random.default_rng(seed)
+    datas = pd.bdate_range(end='2019-12-31', periods=252 * anos)
+    ativos = [f"ATV{i:03d}3" for i in range(n_ativos)]
+
+    precos = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(datas), n_ativos)), axis=0))
+    volumes = rng.lognormal(15, 1, (len(datas), n_ativos))
+
+    return pd.DataFrame({
+        'Data': np.tile(datas.values, n_ativos),
+        'Ativo': np.repeat(ativos, len(datas)),
+        'Preço': np.round(precos.T.ravel(), 2),
+        'Volume$': np.round(volumes.T.ravel(), 2)
+    })
+
+
+def benchmark_xlsx_vs_csv(n_ativos=50, anos=5, repeticoes=3):
+    """
+    Compara a leitura do mesmo export em xlsx e em CSV (formato brasileiro:
+    ';', vírgula decimal, datas dd/mm/aaaa e cabeçalhos em português)
+
+    Returns:
+        dict: Tempos, speedup e verificação de igualdade dos frames
+    """
+    df = gerar_export_longo(n_ativos, anos)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_xlsx = Path(diretorio) / "Economatica_bench.xlsx"
+        caminho_csv = Path(diretorio) / "Economatica_bench.csv"
+
+        df.to_excel(caminho_xlsx, index=False)
+        df.rename(columns={'Preço': 'Preço Fechamento', 'Volume$': 'Volume$ (R$)'}).to_csv(
+            caminho_csv, sep=';', decimal=',', date_format='%d/%m/%Y', index=False, encoding='utf-8'
+        )
+
+        tempo_xlsx, frame_xlsx = _cronometrar(
+            lambda: ler_export_economatica(caminho_xlsx, streaming=False), repeticoes
+        )
+        tempo_csv, frame_csv = _cronometrar(lambda: ler_export_economatica(caminho_csv), repeticoes)
+
+    pd.testing.assert_frame_equal(frame_xlsx, frame_csv)
+
+    return {
+        'linhas': len(df),
+        'tempo_xlsx_s': tempo_xlsx,
+        'tempo_csv_s': tempo_csv,
+        'speedup': tempo_xlsx / tempo_csv,
+        'saidas_identicas': True
+    }
+
+
+def main():
+    """
+    Execução principal
+    """
+    print("="*60)
+    print("BENCHMARK DE INGESTÃO")
+    print("="*60)
+
+    r = benchmark_limpeza_sheet()
+    print(f"Limpeza de sheet ({r['linhas']} linhas, 20 anos diários):")
+    print(f"   Loop linha a linha: {r['tempo_loop_s']*1000:.1f} ms")
+    print(f"   Vetorizado:         {r['tempo_vetorizado_s']*1000:.1f} ms")
+    print(f"   Speedup:            {r['speedup']:.0f}x (saídas idênticas)")
+
+    r = benchmark_xlsx_vs_csv()
+    print(f"Export longo ({r['linhas']} linhas, xlsx vs. CSV):")
+    print(f"   xlsx (openpyxl):    {r['tempo_xlsx_s']*1000:.1f} ms")
+    print(f"   CSV (colunar):      {r['tempo_csv_s']*1000:.1f} ms")
+    print(f"   Speedup:            {r['speedup']:.0f}x (frames idênticos)")
+
+
+if __name__ == "__main__":
+    main()
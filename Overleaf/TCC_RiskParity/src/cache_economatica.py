@@ -0,0 +1,189 @@
+"""
+CACHE COLUNAR ECONOMÁTICA - TCC Risk Parity v2.0
+Cache em disco (Parquet) do painel longo já tipado extraído da Economática.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Cache colunar do carregador
+
+Funcionalidades:
+- Chave do cache = hash SHA-256 do conteúdo do arquivo + mapeamento de colunas
+- Reconstrução automática quando o arquivo de origem é alterado
+- Leitura do frame tipado (Data, Ativo, Preço, Volume$) em milissegundos
+- Memo de (tamanho, mtime) para evitar re-hash de arquivos inalterados
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+# Incrementar quando o formato do frame em cache mudar
+VERSAO_CACHE = 1
+
+
+def calcular_hash_arquivo(caminho, tamanho_bloco: int = 1 << 20) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo em blocos.
+
+    Args:
+        caminho (Path): Arquivo de origem
+        tamanho_bloco (int): Tamanho do bloco de leitura em bytes
+
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+class CacheEconomatica:
+    """
+    Cache colunar para o frame longo carregado da planilha Economática.
+
+    Cada entrada é um arquivo Parquet nomeado pelo arquivo de origem (nome +
+    hash do caminho) e pela chave (hash do conteúdo + mapeamento de colunas).
+    Entradas antigas do mesmo arquivo de origem são removidas quando uma nova
+    é gravada.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.logger = get_logger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir else get_config().cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memo_hash_path = self.cache_dir / "hashes_arquivos.json"
+
+    def _prefixo(self, caminho_origem) -> str:
+        """
+        Prefixo seguro para nomes de arquivo derivado do arquivo de origem.
+
+        O nome saneado é legível mas não único ('economatica (1).xlsx' e
+        'economatica_1.xlsx', ou exports homônimos em pastas diferentes), por
+        isso o prefixo leva também um hash curto do caminho absoluto.
+        """
+        caminho_origem = Path(caminho_origem).resolve()
+        nome = re.sub(r'[^0-9A-Za-z_-]+', '_', caminho_origem.stem).strip('_')
+        hash_caminho = hashlib.sha256(str(caminho_origem).encode('utf-8')).hexdigest()[:8]
+        return f"{nome}_{hash_caminho}"
+
+    def _hash_memoizado(self, caminho_origem) -> str:
+        """
+        Retorna o hash do arquivo, reaproveitando o último cálculo quando
+        tamanho e mtime não mudaram.
+        """
+        caminho_origem = Path(caminho_origem).resolve()
+        stat = caminho_origem.stat()
+
+        memo = {}
+        if self._memo_hash_path.exists():
+            try:
+                with open(self._memo_hash_path, 'r', encoding='utf-8') as f:
+                    memo = json.load(f)
+            except (OSError, ValueError):
+                memo = {}
+
+        entrada = memo.get(str(caminho_origem))
+        if entrada and entrada['tamanho'] == stat.st_size and entrada['mtime_ns'] == stat.st_mtime_ns:
+            return entrada['hash']
+
+        hash_arquivo = calcular_hash_arquivo(caminho_origem)
+        memo[str(caminho_origem)] = {
+            'tamanho': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': hash_arquivo
+        }
+        with open(self._memo_hash_path, 'w', encoding='utf-8') as f:
+            json.dump(memo, f, indent=2, ensure_ascii=False)
+
+        return hash_arquivo
+
+    def calcular_chave(self, caminho_origem, mapeamento: Dict) -> str:
+        """
+        Calcula a chave do cache para um arquivo e um mapeamento de colunas.
+
+        Args:
+            caminho_origem (Path): Arquivo Economática de origem
+            mapeamento (dict): Parâmetros de leitura (planilha, colunas esperadas)
+
+        Returns:
+            str: Chave hexadecimal do cache
+        """
+        conteudo = json.dumps({
+            'hash_arquivo': self._hash_memoizado(caminho_origem),
+            'mapeamento': mapeamento,
+            'versao': VERSAO_CACHE
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def caminho_entrada(self, caminho_origem, chave: str) -> Path:
+        """Caminho do arquivo Parquet de uma entrada do cache"""
+        return self.cache_dir / f"{self._prefixo(caminho_origem)}_{chave[:16]}.parquet"
+
+    def ler(self, caminho_origem, chave: str) -> Optional[pd.DataFrame]:
+        """
+        Lê uma entrada do cache.
+
+        Args:
+            caminho_origem (Path): Arquivo Economática de origem
+            chave (str): Chave calculada por calcular_chave
+
+        Returns:
+            pd.DataFrame ou None: Frame em cache, ou None se ausente/ilegível
+        """
+        caminho = self.caminho_entrada(caminho_origem, chave)
+        if not caminho.exists():
+            return None
+
+        try:
+            return pd.read_parquet(caminho)
+        except ImportError as e:
+            self.logger.warning(f"   Cache Parquet indisponível (instale pyarrow): {e}")
+        except Exception as e:
+            self.logger.warning(f"   Cache corrompido, será reconstruído: {e}")
+        return None
+
+    def salvar(self, caminho_origem, chave: str, df: pd.DataFrame) -> Optional[Path]:
+        """
+        Grava uma entrada no cache e remove entradas antigas do mesmo arquivo.
+
+        Args:
+            caminho_origem (Path): Arquivo Economática de origem
+            chave (str): Chave calculada por calcular_chave
+            df (pd.DataFrame): Frame tipado a ser armazenado
+
+        Returns:
+            Path ou None: Caminho gravado, ou None se o Parquet não estiver disponível
+        """
+        caminho = self.caminho_entrada(caminho_origem, chave)
+        temporario = caminho.with_suffix('.parquet.tmp')
+
+        try:
+            df.to_parquet(temporario, index=False)
+        except ImportError as e:
+            self.logger.warning(f"   Cache Parquet indisponível (instale pyarrow): {e}")
+            return None
+
+        temporario.replace(caminho)
+
+        padrao = re.compile(rf"^{re.escape(self._prefixo(caminho_origem))}_[0-9a-f]{{16}}\.parquet$")
+        for antigo in self.cache_dir.glob("*.parquet"):
+            if antigo != caminho and padrao.match(antigo.name):
+                antigo.unlink()
+
+        self.logger.info(f"   Cache gravado: {caminho}")
+        return caminho
@@ -0,0 +1,164 @@
+"""
+CALENDÁRIO DE NEGOCIAÇÃO - TCC Risk Parity v2.0
+Posições inteiras pré-computadas de fins de mês, rebalanceamentos e períodos.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Calendário B3 a partir das datas observadas
+
+Funcionalidades:
+- Calendário construído uma vez a partir dos pregões observados
+- Último pregão de cada mês (rótulo = fim do mês civil, como resample('M'))
+- Pregões de rebalanceamento semestral (CONFIG.PERIODOS['rebalance_meses'])
+- Limites dos períodos de estimação e teste como fatias de linhas
+- Amostragem de fim de mês por take inteiro, equivalente a resample('M').last()
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+
+class CalendarioNegociacao:
+    """
+    Calendário de pregões com posições inteiras pré-computadas.
+
+    Uso típico:
+        calendario = CalendarioNegociacao(precos_diarios.index)
+        precos_mensais = calendario.amostrar_fim_mes(precos_diarios)
+        janela = calendario.periodos['estimacao']   # slice de linhas
+    """
+
+    def __init__(self, datas, periodos: Optional[Dict] = None):
+        """
+        Args:
+            datas (array-like): Datas observadas (repetições e ordem são ignoradas)
+            periodos (dict): Períodos do estudo (None = CONFIG.PERIODOS)
+        """
+        self.logger = get_logger(__name__)
+        self.periodos_config = periodos or get_config().PERIODOS
+
+        self.datas = pd.DatetimeIndex(pd.unique(pd.DatetimeIndex(datas))).sort_values()
+        if len(self.datas) == 0:
+            raise ValueError("Calendário sem datas")
+
+        valores = self.datas.values
+
+        # Meses civis do primeiro ao último pregão (inclui meses sem pregão)
+        meses = pd.period_range(self.datas[0], self.datas[-1], freq='M')
+        self.rotulos_fim_mes = pd.DatetimeIndex(meses.to_timestamp(how='end').normalize(),
+                                                freq=pd.offsets.MonthEnd())
+
+        inicio_meses = meses.to_timestamp(how='start').values
+        inicio_proximos = (meses + 1).to_timestamp(how='start').values
+
+        # Primeira linha de cada mês e último pregão (-1 relativo ao próximo mês)
+        self.posicoes_inicio_mes = np.searchsorted(valores, inicio_meses, side='left')
+        self.posicoes_fim_mes = np.searchsorted(valores, inicio_proximos, side='left') - 1
+        self.meses_com_pregao = self.posicoes_fim_mes >= self.posicoes_inicio_mes
+
+        # Rebalanceamento: primeiro pregão de cada mês configurado
+        eh_rebalance = np.isin(meses.month, self.periodos_config['rebalance_meses']) & self.meses_com_pregao
+        self.posicoes_rebalance = self.posicoes_inicio_mes[eh_rebalance]
+
+        self.periodos = {
+            'estimacao': self.posicoes_periodo(self.periodos_config['estimacao_inicio'],
+                                               self.periodos_config['estimacao_fim']),
+            'teste': self.posicoes_periodo(self.periodos_config['teste_inicio'],
+                                           self.periodos_config['teste_fim'])
+        }
+
+    # ------------------------------------------------------------------
+    # Posições
+    # ------------------------------------------------------------------
+
+    def posicoes_periodo(self, inicio=None, fim=None) -> slice:
+        """
+        Converte uma janela de datas inclusiva em fatia de linhas do calendário.
+
+        Returns:
+            slice: Linhas dentro da janela
+        """
+        i0 = 0 if inicio is None else int(np.searchsorted(
+            self.datas.values, pd.Timestamp(inicio).to_datetime64(), side='left'))
+        i1 = len(self.datas) if fim is None else int(np.searchsorted(
+            self.datas.values, (pd.Timestamp(fim) + pd.Timedelta(days=1)).to_datetime64(), side='left'))
+        return slice(i0, i1)
+
+    @property
+    def datas_fim_mes(self) -> pd.DatetimeIndex:
+        """Último pregão de cada mês com pregão"""
+        return self.datas[self.posicoes_fim_mes[self.meses_com_pregao]]
+
+    @property
+    def datas_rebalance(self) -> pd.DatetimeIndex:
+        """Primeiro pregão de cada mês de rebalanceamento"""
+        return self.datas[self.posicoes_rebalance]
+
+    def meses_periodo(self, nome: str) -> np.ndarray:
+        """
+        Máscara dos meses (linhas de amostrar_fim_mes) dentro de um período.
+
+        Args:
+            nome (str): 'estimacao' ou 'teste'
+
+        Returns:
+            np.ndarray: Máscara booleana sobre rotulos_fim_mes
+        """
+        inicio = pd.Timestamp(self.periodos_config[f'{nome}_inicio'])
+        fim = pd.Timestamp(self.periodos_config[f'{nome}_fim'])
+        return np.asarray((self.rotulos_fim_mes >= inicio) & (self.rotulos_fim_mes <= fim))
+
+    # ------------------------------------------------------------------
+    # Amostragem
+    # ------------------------------------------------------------------
+
+    def amostrar_fim_mes(self, dados):
+        """
+        Último valor válido de cada mês, por coluna.
+
+        Equivale a dados.resample('M').last() para dados indexados por datas
+        deste calendário: o índice do último valor não-NaN até cada linha é
+        propagado com np.maximum.accumulate e lido nas posições de fim de mês;
+        meses em que esse índice cai antes do início do mês ficam NaN.
+
+        Args:
+            dados (pd.DataFrame ou pd.Series): Valores diários indexados por datas
+
+        Returns:
+            Mesmo tipo de dados, indexado pelos fins de mês civis
+        """
+        eh_serie = isinstance(dados, pd.Series)
+        frame = dados.to_frame() if eh_serie else dados
+
+        if not frame.index.equals(self.datas):
+            frame = frame.reindex(self.datas)
+
+        valores = frame.to_numpy()
+        if valores.dtype.kind not in 'fc':
+            valores = valores.astype(np.float64)
+
+        linhas = np.arange(len(valores))[:, None]
+        ultimo_valido = np.where(~np.isnan(valores), linhas, -1)
+        np.maximum.accumulate(ultimo_valido, axis=0, out=ultimo_valido)
+
+        fim = np.maximum(self.posicoes_fim_mes, 0)
+        posicoes = ultimo_valido[fim]
+        validos = (posicoes >= self.posicoes_inicio_mes[:, None]) & self.meses_com_pregao[:, None]
+
+        amostra = np.take_along_axis(valores, np.maximum(posicoes, 0), axis=0)
+        amostra = np.where(validos, amostra, np.nan).astype(valores.dtype, copy=False)
+
+        resultado = pd.DataFrame(amostra, index=self.rotulos_fim_mes, columns=frame.columns)
+        resultado.index.name = frame.index.name
+        return resultado.iloc[:, 0].rename(dados.name) if eh_serie else resultado
@@ -0,0 +1,254 @@
+"""
+CAPACIDADE DAS ESTRATÉGIAS - TCC Risk Parity v2.0
+Iliquidez de Amihud, volume médio negociado e AUM máximo das carteiras EW/MVO/ERC.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Capacidade a partir do Volume$
+
+Métricas móveis (CONFIG.CAPACIDADE['janela_dias'] pregões, datas x ativos):
+- ADTV: volume financeiro médio diário (dias sem negócio contam como zero)
+- Amihud (2002): média de |r_t| / Volume$_t nos dias com retorno e volume,
+  em variação de preço por R$ 1 milhão negociado
+
+Capacidade (vetorizada em datas x ativos x estratégias):
+- Dias para negociar: AUM * w / (participacao_max * ADTV)
+- AUM máximo: menor participacao_max * ADTV * dias_liquidacao / w entre os
+  ativos da carteira (e o ativo que define o limite)
+- Impacto de Amihud: sum(w * Amihud * AUM * w), impacto médio ponderado de
+  negociar as posições em um pregão
+"""
+
+import warnings
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_path, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_path, get_config
+
+from armazem_precos import ArmazemPrecos
+
+
+def carregar_pesos_estrategias(caminho: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Pesos das estratégias gravados pela etapa 03.
+
+    Args:
+        caminho (Path): CSV longo Estratégia, Ativo, Peso_Pct (None = results/03_pesos_portfolios.csv)
+
+    Returns:
+        pd.DataFrame: Pesos em fração (estratégias x ativos, 0 fora da carteira)
+    """
+    caminho = Path(caminho) if caminho is not None else get_path('results', '03_pesos_portfolios.csv')
+    df = pd.read_csv(caminho)
+    pesos = df.pivot_table(index='Estratégia', columns='Ativo', values='Peso_Pct', aggfunc='sum', sort=False)
+    return pesos.fillna(0.0) / 100
+
+
+def metricas_liquidez_moveis(precos: pd.DataFrame, volumes: pd.DataFrame, janela_dias: int) -> Dict[str, pd.DataFrame]:
+    """
+    ADTV e iliquidez de Amihud em janelas móveis de pregões.
+
+    Retornos diários são calculados entre cotações consecutivas de cada ativo.
+    Datas sem janela completa ficam NaN.
+
+    Args:
+        precos (pd.DataFrame): Preços diários (datas x ativos, NaN sem cotação)
+        volumes (pd.DataFrame): Volumes financeiros diários (mesmo formato)
+        janela_dias (int): Pregões da janela móvel
+
+    Returns:
+        dict: {'adtv': R$ por dia, 'amihud': variação por R$ 1 milhão} (datas x ativos)
+    """
+    volumes = volumes.reindex(index=precos.index, columns=precos.columns)
+    retornos = precos / precos.ffill().shift(1) - 1
+
+    volume = volumes.where(precos.notna()).fillna(0.0)
+    adtv = volume.rolling(janela_dias, min_periods=janela_dias).mean()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        razao = (retornos.abs() / volume).where(volume > 0) * 1e6
+    validos = razao.notna().astype(np.float64)
+    soma = razao.fillna(0.0).rolling(janela_dias, min_periods=janela_dias).sum()
+    contagem = validos.rolling(janela_dias, min_periods=janela_dias).sum()
+    amihud = soma / contagem.where(contagem > 0)
+
+    return {'adtv': adtv, 'amihud': amihud}
+
+
+class EstimadorCapacidade:
+    """
+    Capacidade das estratégias a partir da liquidez diária dos ativos.
+
+    Uso típico:
+        armazem = ArmazemPrecos.obter()
+        estimador = EstimadorCapacidade(armazem.precos(), armazem.volumes())
+        resultado = estimador.estimar(carregar_pesos_estrategias())
+        resultado['aum_maximo']            # datas x estratégias (R$)
+        estimador.resumir(resultado, '2018-01-01', '2019-12-31')
+    """
+
+    def __init__(self, precos: pd.DataFrame, volumes: pd.DataFrame, janela_dias: Optional[int] = None,
+                 participacao_max: Optional[float] = None):
+        """
+        Args:
+            precos (pd.DataFrame): Preços diários (datas x ativos)
+            volumes (pd.DataFrame): Volumes financeiros diários (datas x ativos)
+            janela_dias (int): Pregões das médias móveis (None = CONFIG.CAPACIDADE)
+            participacao_max (float): Fração máxima do ADTV (None = CONFIG.CAPACIDADE)
+        """
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+        parametros = self.config.CAPACIDADE
+
+        self.janela_dias = janela_dias or parametros['janela_dias']
+        self.participacao_max = (parametros['participacao_max'] if participacao_max is None
+                                 else participacao_max)
+
+        metricas = metricas_liquidez_moveis(precos, volumes, self.janela_dias)
+        self.adtv = metricas['adtv']
+        self.amihud = metricas['amihud']
+
+    def estimar(self, pesos: pd.DataFrame, aum: Optional[float] = None,
+                dias_liquidacao: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Dias para negociar, AUM máximo e impacto de todas as estratégias em todas as datas.
+
+        Args:
+            pesos (pd.DataFrame): Pesos em fração (estratégias x ativos)
+            aum (float): Patrimônio para dias de negociação e impacto (None = CONFIG.CAPACIDADE)
+            dias_liquidacao (int): Pregões para negociar as posições (None = CONFIG.CAPACIDADE)
+
+        Returns:
+            dict: 'dias_para_negociar' (datas x (estratégia, ativo)), 'dias_carteira',
+                'aum_maximo', 'ativo_restritivo' e 'impacto_amihud' (datas x estratégias)
+        """
+        parametros = self.config.CAPACIDADE
+        aum = parametros['aum_referencia'] if aum is None else aum
+        dias_liquidacao = parametros['dias_liquidacao'] if dias_liquidacao is None else dias_liquidacao
+
+        # Apenas ativos presentes em alguma carteira
+        pesos = pesos.loc[:, (pesos != 0).any(axis=0)]
+        ausentes = pesos.columns.difference(self.adtv.columns)
+        if len(ausentes):
+            self.logger.warning(f"   Ativos sem dados de volume (capacidade indefinida): {list(ausentes)}")
+
+        estrategias = list(pesos.index)
+        ativos = list(pesos.columns)
+        w = pesos.to_numpy(dtype=np.float64)[None, :, :]                              # 1 x S x A
+        adtv = self.adtv.reindex(columns=ativos).to_numpy(dtype=np.float64)[:, None, :]  # T x 1 x A
+        amihud = self.amihud.reindex(columns=ativos).to_numpy(dtype=np.float64)[:, None, :]
+        na_carteira = w > 0
+
+        capacidade_diaria = self.participacao_max * adtv                             # R$ por pregão
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dias = np.where(na_carteira, aum * w / capacidade_diaria, 0.0)           # T x S x A
+            aum_ativo = np.where(na_carteira, capacidade_diaria * dias_liquidacao / w, np.inf)
+
+        # NaN (janela incompleta) em um ativo da carteira torna a estratégia indefinida
+        indefinida = np.isnan(aum_ativo).any(axis=2)
+        restritivo = np.argmin(np.nan_to_num(aum_ativo, nan=np.inf), axis=2)
+        aum_maximo = np.where(indefinida, np.nan, np.take_along_axis(aum_ativo, restritivo[:, :, None], axis=2)[:, :, 0])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Datas sem janela completa
+            dias_carteira = np.where(indefinida, np.nan, np.nanmax(np.where(na_carteira, dias, np.nan), axis=2))
+        impacto = np.sum(np.where(na_carteira, w * amihud * (aum * w) / 1e6, 0.0), axis=2)
+
+        datas = self.adtv.index
+        return {
+            'dias_para_negociar': pd.DataFrame(dias.reshape(len(datas), -1), index=datas,
+                                               columns=pd.MultiIndex.from_product([estrategias, ativos],
+                                                                                  names=['estrategia', 'ativo'])),
+            'dias_carteira': pd.DataFrame(dias_carteira, index=datas, columns=estrategias),
+            'aum_maximo': pd.DataFrame(aum_maximo, index=datas, columns=estrategias),
+            'ativo_restritivo': pd.DataFrame(np.asarray(ativos, dtype=object)[restritivo], index=datas,
+                                             columns=estrategias).where(~indefinida),
+            'impacto_amihud': pd.DataFrame(impacto, index=datas, columns=estrategias).where(~indefinida)
+        }
+
+    def resumir(self, resultado: Dict[str, pd.DataFrame], inicio=None, fim=None) -> pd.DataFrame:
+        """
+        Resumo da capacidade de cada estratégia no intervalo de datas.
+
+        Args:
+            resultado (dict): Saída de estimar
+            inicio, fim: Janela de datas inclusiva (None = todas)
+
+        Returns:
+            pd.DataFrame: Uma linha por estratégia
+        """
+        def janela(df):
+            return df.loc[inicio:fim]
+
+        aum_maximo = janela(resultado['aum_maximo'])
+        dias = janela(resultado['dias_carteira'])
+        impacto = janela(resultado['impacto_amihud'])
+        restritivo = janela(resultado['ativo_restritivo'])
+
+        return pd.DataFrame({
+            'Estratégia': aum_maximo.columns,
+            'AUM Máximo Inicial (R$ mi)': aum_maximo.bfill().iloc[0].to_numpy() / 1e6 if len(aum_maximo) else np.nan,
+            'AUM Máximo Mediano (R$ mi)': aum_maximo.median().to_numpy() / 1e6,
+            'AUM Máximo Mínimo (R$ mi)': aum_maximo.min().to_numpy() / 1e6,
+            'Dias p/ Negociar Mediano': dias.median().to_numpy(),
+            'Dias p/ Negociar Máximo': dias.max().to_numpy(),
+            'Impacto Amihud Mediano (%)': impacto.median().to_numpy() * 100,
+            'Ativo Restritivo (moda)': [restritivo[c].mode().iloc[0] if restritivo[c].notna().any() else None
+                                        for c in restritivo.columns]
+        })
+
+
+def executar_analise_capacidade(caminho_pesos: Optional[Path] = None) -> Dict:
+    """
+    Capacidade das estratégias da etapa 03 no período de teste.
+
+    Salva o resumo em results/03_capacidade_estrategias.csv e as séries
+    diárias de AUM máximo em results/03_capacidade_aum_maximo.csv.
+
+    Args:
+        caminho_pesos (Path): Pesos das estratégias (None = results/03_pesos_portfolios.csv)
+
+    Returns:
+        dict: Resultado de EstimadorCapacidade.estimar e resumo
+    """
+    logger = get_logger(__name__)
+    config = get_config()
+    parametros = config.CAPACIDADE
+    logger.info("Estimando capacidade das estratégias...")
+
+    pesos = carregar_pesos_estrategias(caminho_pesos)
+    armazem = ArmazemPrecos.obter()
+    ativos = [ativo for ativo in pesos.columns if ativo in set(armazem.ativos())]
+
+    estimador = EstimadorCapacidade(armazem.precos(ativos), armazem.volumes(ativos))
+    resultado = estimador.estimar(pesos)
+    resumo = estimador.resumir(resultado, config.PERIODOS['teste_inicio'], config.PERIODOS['teste_fim'])
+
+    path_resumo = get_path('results', '03_capacidade_estrategias.csv')
+    resumo.to_csv(path_resumo, index=False)
+    resultado['aum_maximo'].to_csv(get_path('results', '03_capacidade_aum_maximo.csv'))
+
+    logger.info(f"   Participação máxima {parametros['participacao_max']:.0%} do ADTV "
+                f"({parametros['janela_dias']} pregões), AUM de referência "
+                f"R$ {parametros['aum_referencia'] / 1e6:,.0f} mi")
+    for _, linha in resumo.iterrows():
+        logger.info(f"   {linha['Estratégia']}: AUM máximo mediano R$ {linha['AUM Máximo Mediano (R$ mi)']:,.1f} mi "
+                    f"(limitado por {linha['Ativo Restritivo (moda)']})")
+    logger.info(f"   Resumo salvo: {path_resumo}")
+
+    return {**resultado, 'resumo': resumo}
+
+
+if __name__ == "__main__":
+    resultado = executar_analise_capacidade()
+    print("\n📊 CAPACIDADE POR ESTRATÉGIA:")
+    print(resultado['resumo'].to_string(index=False))
@@ -0,0 +1,279 @@
+"""
+ÍNDICE DATADO DE LIQUIDEZ - TCC Risk Parity v2.0
+Elegibilidade aos filtros de liquidez em cada pregão (bitmap datas x ativos).
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Universo elegível point-in-time
+
+Critérios (CONFIG.LIQUIDEZ_CRITERIA) sobre os CONFIG.INDICE_LIQUIDEZ['janela_dias']
+pregões anteriores a cada data, inclusive:
+- Volume médio diário nos dias com cotação >= volume_min_diario
+- Presença: dias com volume > 0 / pregões da janela >= presenca_min_bolsa
+  (dias antes da listagem ou após o cancelamento contam como ausência)
+- Dias sem retorno / retornos da janela <= zero_return_days_max
+- Datas sem janela completa no painel não têm ativos elegíveis
+
+Funcionalidades:
+- Somas acumuladas das grandezas diárias: cada janela é uma diferença de
+  duas linhas, O(datas x ativos) para o índice inteiro
+- Matriz booleana compactada em bits (np.packbits, 1 bit por célula) em
+  data/cache/indice_liquidez, ao lado do painel de mercado
+- Consultas sem recálculo: elegibilidade de um ativo em uma data (O(1)),
+  universo elegível em uma data (uma linha) e dias/períodos de elegibilidade
+  de um ativo (uma coluna, O(T))
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from painel_mercado import PainelMercado, gravacao_atomica, ler_metadados, versao_atual
+
+# Ativos processados por bloco de colunas (limita a memória das somas acumuladas)
+ATIVOS_POR_BLOCO = 512
+
+# Número de bits 1 de cada byte (contagem do universo por data)
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _somas_janela(valores: np.ndarray, janela: int) -> np.ndarray:
+    """Soma móvel de `janela` linhas terminando em cada linha (acumulado com linha de zeros)"""
+    acumulado = np.zeros((len(valores) + 1, valores.shape[1]), dtype=np.float64)
+    np.cumsum(valores, axis=0, out=acumulado[1:])
+    inicio = np.maximum(np.arange(1, len(valores) + 1) - janela, 0)
+    return acumulado[1:] - acumulado[inicio]
+
+
+def matriz_elegibilidade(precos: np.ndarray, volumes: np.ndarray, janela_dias: int,
+                         criterios: Dict) -> np.ndarray:
+    """
+    Elegibilidade aos filtros de liquidez em cada data (janelas móveis).
+
+    Retornos diários são calculados entre cotações consecutivas de cada
+    ativo, como na etapa 01.
+
+    Args:
+        precos (np.ndarray): Preços diários (datas x ativos, NaN sem cotação)
+        volumes (np.ndarray): Volumes financeiros diários (mesmo formato)
+        janela_dias (int): Pregões da janela móvel
+        criterios (dict): Critérios de liquidez (formato de CONFIG.LIQUIDEZ_CRITERIA)
+
+    Returns:
+        np.ndarray: Máscara booleana (datas x ativos)
+    """
+    n_datas, n_ativos = precos.shape
+    elegivel = np.zeros((n_datas, n_ativos), dtype=bool)
+    if n_datas < janela_dias:
+        return elegivel
+
+    completas = slice(janela_dias - 1, None)  # Datas com janela completa
+
+    for inicio in range(0, n_ativos, ATIVOS_POR_BLOCO):
+        bloco = slice(inicio, inicio + ATIVOS_POR_BLOCO)
+        preco = np.asarray(precos[:, bloco], dtype=np.float64)
+        volume = np.asarray(volumes[:, bloco], dtype=np.float64)
+        cotado = ~np.isnan(preco)
+
+        # Preço da cotação anterior de cada ativo (forward fill por índice)
+        ultima_cotacao = np.where(cotado, np.arange(n_datas)[:, None], -1)
+        np.maximum.accumulate(ultima_cotacao, axis=0, out=ultima_cotacao)
+        anterior = np.full_like(ultima_cotacao, -1)
+        anterior[1:] = ultima_cotacao[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            retorno = np.where(cotado & (anterior >= 0),
+                               preco / np.take_along_axis(preco, np.maximum(anterior, 0), axis=0) - 1,
+                               np.nan)
+
+        volume = np.where(cotado, np.nan_to_num(volume), 0.0)
+        n_obs = _somas_janela(cotado.astype(np.float64), janela_dias)[completas]
+        soma_volume = _somas_janela(volume, janela_dias)[completas]
+        n_com_volume = _somas_janela((volume > 0).astype(np.float64), janela_dias)[completas]
+        n_retornos = _somas_janela((~np.isnan(retorno)).astype(np.float64), janela_dias)[completas]
+        n_sem_retorno = _somas_janela((retorno == 0).astype(np.float64), janela_dias)[completas]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            elegivel[completas, bloco] = (
+                (soma_volume / n_obs >= criterios['volume_min_diario'])
+                & (n_com_volume / janela_dias >= criterios['presenca_min_bolsa'])
+                & (n_sem_retorno / n_retornos <= criterios['zero_return_days_max'])
+            )
+
+    return elegivel
+
+
+class IndiceLiquidez:
+    """
+    Índice datado do universo elegível, persistido em bits.
+
+    Uso típico:
+        indice = IndiceLiquidez().construir(armazem.painel())
+        indice.universo('2018-01-02')             # tickers elegíveis na data
+        indice.elegivel('PETR4', '2018-01-02')
+        indice.periodos_elegivel('PETR4')         # intervalos contínuos
+    """
+
+    def __init__(self, janela_dias: Optional[int] = None, criterios: Optional[Dict] = None,
+                 diretorio=None):
+        self.logger = get_logger(__name__)
+        config = get_config()
+        self.janela_dias = janela_dias or config.INDICE_LIQUIDEZ['janela_dias']
+        self.criterios = criterios or config.LIQUIDEZ_CRITERIA
+        self.diretorio = Path(diretorio) if diretorio else config.cache_dir / "indice_liquidez"
+
+        self.bits: Optional[np.ndarray] = None
+        self.datas: Optional[pd.DatetimeIndex] = None
+        self.ativos: List[str] = []
+        self._coluna: Dict[str, int] = {}
+
+    def _origem(self, painel: PainelMercado) -> str:
+        """Identificador do índice: origem do painel + janela + critérios usados"""
+        criterios = {chave: self.criterios[chave]
+                     for chave in ('volume_min_diario', 'presenca_min_bolsa', 'zero_return_days_max')}
+        return json.dumps({'painel': painel.metadados.get('origem'), 'janela_dias': self.janela_dias,
+                           'criterios': criterios}, sort_keys=True)
+
+    def construir(self, painel: PainelMercado) -> 'IndiceLiquidez':
+        """
+        Constrói o índice a partir do painel (ou reaproveita o índice em disco).
+
+        Args:
+            painel (PainelMercado): Painel de preços e volumes
+
+        Returns:
+            IndiceLiquidez: O próprio índice, aberto
+        """
+        origem = self._origem(painel)
+        metadados = ler_metadados(self.diretorio)
+
+        if (painel.metadados.get('origem') is not None and metadados
+                and metadados.get('origem') == origem):
+            self.logger.info(f"   Índice de liquidez reaproveitado de {self.diretorio}")
+            return self.abrir()
+
+        elegivel = matriz_elegibilidade(painel.campos['Preço'], painel.campos['Volume$'],
+                                        self.janela_dias, self.criterios)
+        self._salvar(elegivel, painel, origem)
+        self.abrir()
+
+        contagem = elegivel.sum(axis=1)
+        self.logger.info(f"   Índice de liquidez: {len(self.datas)} datas x {len(self.ativos)} ativos, "
+                         f"janela de {self.janela_dias} pregões, universo de "
+                         f"{contagem.min()} a {contagem.max()} ativos "
+                         f"({self.bits.nbytes / 1024:.0f} KB em bits)")
+        return self
+
+    def _salvar(self, elegivel: np.ndarray, painel: PainelMercado, origem: str):
+        """Grava a matriz em bits (linhas = datas), datas, ativos e metadados (troca atômica)"""
+        with gravacao_atomica(self.diretorio) as temporario:
+            np.save(temporario / "elegibilidade_bits.npy", np.packbits(elegivel, axis=1))
+            np.save(temporario / "datas.npy", painel.datas.values.astype('datetime64[D]'))
+            with open(temporario / "ativos.json", 'w', encoding='utf-8') as f:
+                json.dump(list(painel.ativos), f, ensure_ascii=False)
+
+            with open(temporario / "metadados.json", 'w', encoding='utf-8') as f:
+                json.dump({'origem': origem, 'forma': list(elegivel.shape),
+                           'criado_em': datetime.now().isoformat()}, f, indent=2, ensure_ascii=False)
+
+    def abrir(self) -> 'IndiceLiquidez':
+        """Abre o índice gravado (bits em memória mapeada)"""
+        versao = versao_atual(self.diretorio)
+        if versao is None:
+            raise FileNotFoundError(f"Índice de liquidez não encontrado em {self.diretorio}")
+
+        self.bits = np.load(versao / "elegibilidade_bits.npy", mmap_mode='r')
+        self.datas = pd.DatetimeIndex(np.load(versao / "datas.npy").astype('datetime64[ns]'))
+        with open(versao / "ativos.json", 'r', encoding='utf-8') as f:
+            self.ativos = json.load(f)
+        self._coluna = {ativo: j for j, ativo in enumerate(self.ativos)}
+        return self
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _linha(self, data) -> int:
+        """Último pregão do índice em ou antes da data (-1 se anterior ao índice)"""
+        return int(self.datas.searchsorted(pd.Timestamp(data), side='right')) - 1
+
+    def _bits_coluna(self, ativo: str) -> np.ndarray:
+        """Coluna booleana do ativo (todas as datas)"""
+        j = self._coluna[ativo]
+        return (self.bits[:, j >> 3] & (0x80 >> (j & 7))) != 0
+
+    def elegivel(self, ativo: str, data) -> bool:
+        """True se o ativo atende os filtros de liquidez na data"""
+        linha = self._linha(data)
+        if linha < 0 or ativo not in self._coluna:
+            return False
+        j = self._coluna[ativo]
+        return bool(self.bits[linha, j >> 3] & (0x80 >> (j & 7)))
+
+    def universo(self, data) -> List[str]:
+        """
+        Tickers elegíveis na data (último pregão em ou antes dela).
+
+        Args:
+            data: Data da consulta
+
+        Returns:
+            list: Tickers na ordem das colunas do painel
+        """
+        linha = self._linha(data)
+        if linha < 0:
+            return []
+        mascara = np.unpackbits(self.bits[linha], count=len(self.ativos)).astype(bool)
+        return [ativo for ativo, ok in zip(self.ativos, mascara) if ok]
+
+    def contagem_por_data(self) -> pd.Series:
+        """Tamanho do universo elegível em cada pregão"""
+        return pd.Series(_BITS_POR_BYTE[self.bits].sum(axis=1), index=self.datas, name='ativos_elegiveis')
+
+    def dias_elegivel(self, ativo: str, inicio=None, fim=None) -> int:
+        """
+        Pregões em que o ativo esteve elegível no intervalo [inicio, fim].
+
+        Args:
+            ativo (str): Ticker
+            inicio, fim: Limites do intervalo (None = início/fim do índice)
+
+        Returns:
+            int: Número de pregões elegíveis
+        """
+        primeira = 0 if inicio is None else int(self.datas.searchsorted(pd.Timestamp(inicio), side='left'))
+        ultima = len(self.datas) - 1 if fim is None else self._linha(fim)
+        return int(self._bits_coluna(ativo)[primeira:ultima + 1].sum())
+
+    def periodos_elegivel(self, ativo: str) -> pd.DataFrame:
+        """
+        Intervalos contínuos de elegibilidade do ativo.
+
+        Returns:
+            pd.DataFrame: Colunas inicio, fim e pregoes (um intervalo por linha)
+        """
+        coluna = np.r_[False, self._bits_coluna(ativo), False]
+        mudancas = np.flatnonzero(coluna[1:] != coluna[:-1])
+        entradas, saidas = mudancas[0::2], mudancas[1::2] - 1
+        return pd.DataFrame({
+            'inicio': self.datas[entradas],
+            'fim': self.datas[saidas],
+            'pregoes': saidas - entradas + 1
+        })
+
+    def matriz(self, como_dataframe: bool = True):
+        """Matriz booleana completa (datas x ativos) descompactada"""
+        mascara = np.unpackbits(self.bits, axis=1, count=len(self.ativos)).astype(bool)
+        return pd.DataFrame(mascara, index=self.datas, columns=self.ativos) if como_dataframe else mascara
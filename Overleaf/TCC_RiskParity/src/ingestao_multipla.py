@@ -0,0 +1,243 @@
+"""
+INGESTÃO MÚLTIPLA ECONOMÁTICA - TCC Risk Parity v2.0
+Mescla de vários exports sobrepostos (grupos de ativos / janelas de datas).
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Ingestão de múltiplos exports
+
+Fonte (CONFIG.INGESTAO['exports']):
+- Manifesto .json (lista de caminhos) ou .txt (um caminho por linha, '#'
+  comenta); caminhos relativos ao diretório do manifesto
+- Ou padrão glob (ex.: 'economatica*.xlsx'), relativo a data/DataBase
+
+Regra de conflito (mesmo Ativo e Data em mais de um export):
+- Prevalece o export de maior prioridade: o último do manifesto ou, no
+  glob, o de modificação mais recente (mesma regra de
+  _detectar_arquivo_economatica)
+- Dentro de um mesmo export, prevalece a última linha
+
+Funcionalidades:
+- Cada export é lido uma vez e guardado no cache colunar próprio; um export
+  novo no manifesto não força a releitura dos demais
+- Mescla por ordenação estável (timsort) das chaves inteiras (ativo, data)
+  concatenadas: as sequências já ordenadas de cada export viram corridas
+  que o timsort funde, sem heap; em seguida, deduplicação linear
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from cache_economatica import CacheEconomatica, VERSAO_CACHE
+from leitores_economatica import COLUNAS_ESPERADAS, ler_export_economatica
+
+SUFIXOS_MANIFESTO = {'.json', '.txt'}
+REGRA_CONFLITO = 'ultimo_export_prevalece'
+
+
+def eh_fonte_multipla(fonte) -> bool:
+    """True se a fonte é um manifesto ou um padrão glob (e não um export único)"""
+    texto = str(fonte)
+    return any(c in texto for c in '*?[') or Path(texto).suffix.lower() in SUFIXOS_MANIFESTO
+
+
+def normalizar_fonte(fonte) -> Path:
+    """Fonte absoluta (relativa a data/DataBase quando não absoluta)"""
+    fonte = Path(fonte)
+    return fonte if fonte.is_absolute() else get_config().data_dir / fonte
+
+
+def resolver_exports(fonte) -> List[Path]:
+    """
+    Lista os exports da fonte em ordem crescente de prioridade.
+
+    Args:
+        fonte (Path): Manifesto (.json/.txt) ou padrão glob
+
+    Returns:
+        list: Caminhos absolutos (o último prevalece em conflitos)
+    """
+    fonte = normalizar_fonte(fonte)
+
+    if fonte.suffix.lower() in SUFIXOS_MANIFESTO and not any(c in str(fonte) for c in '*?['):
+        if fonte.suffix.lower() == '.json':
+            with open(fonte, 'r', encoding='utf-8') as f:
+                entradas = json.load(f)
+        else:
+            with open(fonte, 'r', encoding='utf-8') as f:
+                entradas = [linha.strip() for linha in f
+                            if linha.strip() and not linha.strip().startswith('#')]
+        exports = [(fonte.parent / entrada).resolve() for entrada in entradas]
+        ausentes = [str(p) for p in exports if not p.exists()]
+        if ausentes:
+            raise FileNotFoundError(f"Exports do manifesto não encontrados: {ausentes}")
+    else:
+        exports = sorted((p.resolve() for p in fonte.parent.glob(fonte.name)),
+                         key=lambda p: (p.stat().st_mtime_ns, p.name))
+
+    if not exports:
+        raise FileNotFoundError(f"Nenhum export encontrado para a fonte: {fonte}")
+    return exports
+
+
+def mesclar_frames(frames: List[pd.DataFrame]) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Mescla frames longos em ordem crescente de prioridade.
+
+    Cada frame vira uma sequência ordenada de chaves inteiras
+    (código do ativo, dia); as sequências são concatenadas e ordenadas com
+    np.argsort(kind='stable'). Não é uma mescla k-way com heap: o timsort
+    detecta as k corridas já ordenadas e as funde, e a estabilidade mantém,
+    para chaves iguais, a ordem de prioridade. A última linha de cada chave é a
+    que prevalece.
+
+    Args:
+        frames (list): Frames tipados (Data, Ativo, Preço, Volume$)
+
+    Returns:
+        tuple: (frame mesclado ordenado por Ativo e Data, estatísticas)
+    """
+    # Códigos por export (hash, linear) traduzidos para o vocabulário ordenado comum
+    fatorados = [pd.factorize(f['Ativo'].astype(str), sort=False) for f in frames]
+    tickers = np.unique(np.concatenate([np.asarray(u, dtype=object) for _, u in fatorados]))
+    dias = [f['Data'].to_numpy(dtype='datetime64[D]').astype(np.int64) for f in frames]
+    dia_min = min((d.min() for d in dias if len(d)), default=0)
+    amplitude = max((d.max() for d in dias if len(d)), default=0) - dia_min + 1
+
+    sequencias = []
+    for frame, (codigos, uniques), dia in zip(frames, fatorados, dias):
+        codigo_comum = np.searchsorted(tickers, np.asarray(uniques, dtype=object))[codigos]
+        chave = codigo_comum.astype(np.int64) * amplitude + (dia - dia_min)
+        ordem = np.argsort(chave, kind='stable')  # Exports já ordenados: custo linear
+        sequencias.append((chave[ordem], frame.iloc[ordem]))
+
+    chaves = np.concatenate([c for c, _ in sequencias])
+    linhas = pd.concat([f for _, f in sequencias], ignore_index=True)[COLUNAS_ESPERADAS]
+
+    ordem = np.argsort(chaves, kind='stable')
+    chaves = chaves[ordem]
+
+    # Primeira e última linha de cada chave (a última tem maior prioridade)
+    nova = chaves[1:] != chaves[:-1]
+    primeira = np.ones(len(chaves), dtype=bool)
+    primeira[1:] = nova
+    ultima = np.ones(len(chaves), dtype=bool)
+    ultima[:-1] = nova
+
+    # Conflitos: chaves repetidas cujos valores diferem da linha vencedora
+    grupo = np.cumsum(primeira) - 1
+    vencedor = np.flatnonzero(ultima)[grupo]
+    valores = linhas[['Preço', 'Volume$']].to_numpy(dtype=np.float64)[ordem]
+    referencia = valores[vencedor]
+    repetidas = ~ultima
+    # NaN em ambas as linhas é o mesmo valor (campo vazio nos dois exports)
+    iguais = (valores == referencia) | (np.isnan(valores) & np.isnan(referencia))
+    divergentes = repetidas & ~iguais.all(axis=1)
+
+    mesclado = linhas.iloc[ordem[ultima]].reset_index(drop=True)
+
+    estatisticas = {
+        'linhas_por_export': [len(f) for f in frames],
+        'linhas_total': int(len(chaves)),
+        'linhas_mescladas': int(len(mesclado)),
+        'duplicatas': int(repetidas.sum()),
+        'conflitos': int(divergentes.sum()),
+        'regra_conflito': REGRA_CONFLITO
+    }
+    return mesclado, estatisticas
+
+
+class IngestaoMultipla:
+    """
+    Ingestão de vários exports da Economática mesclados em um frame longo.
+
+    Uso típico:
+        ingestao = IngestaoMultipla('exports.json')
+        df = ingestao.ler()               # frame longo único, sem duplicatas
+        ingestao.estatisticas['conflitos']
+    """
+
+    def __init__(self, fonte):
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+        self.fonte = normalizar_fonte(fonte)
+        self.cache = CacheEconomatica(self.config.cache_dir)
+        self.estatisticas: Dict = {}
+
+    def exports(self) -> List[Path]:
+        """Exports atuais da fonte em ordem de prioridade"""
+        return resolver_exports(self.fonte)
+
+    def assinatura(self) -> tuple:
+        """(caminho, tamanho, mtime) do manifesto e de cada export"""
+        arquivos = self.exports()
+        if self.fonte.exists():
+            arquivos = [self.fonte] + arquivos
+        return tuple((str(p), p.stat().st_size, p.stat().st_mtime_ns) for p in arquivos)
+
+    def calcular_chave(self, mapeamento: Dict) -> str:
+        """
+        Chave do frame mesclado: hashes dos exports na ordem de prioridade.
+
+        Args:
+            mapeamento (dict): Parâmetros de leitura (planilha, colunas esperadas)
+
+        Returns:
+            str: Chave hexadecimal
+        """
+        conteudo = json.dumps({
+            'hashes': [self.cache._hash_memoizado(p) for p in self.exports()],
+            'mapeamento': mapeamento,
+            'regra': REGRA_CONFLITO,
+            'versao': VERSAO_CACHE
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def _ler_export(self, caminho: Path) -> pd.DataFrame:
+        """Frame tipado de um export (cache colunar próprio → leitura)"""
+        mapeamento = {'sheet_name': 0, 'colunas': COLUNAS_ESPERADAS}
+        chave = self.cache.calcular_chave(caminho, mapeamento)
+
+        df = self.cache.ler(caminho, chave)
+        if df is None:
+            df = ler_export_economatica(caminho)
+            self.cache.salvar(caminho, chave, df)
+        return df
+
+    def ler(self) -> pd.DataFrame:
+        """
+        Lê todos os exports e retorna o frame longo mesclado.
+
+        Returns:
+            pd.DataFrame: Frame (Data, Ativo, Preço, Volume$) ordenado por Ativo e Data
+        """
+        exports = self.exports()
+        self.logger.info(f"   Ingestão múltipla: {len(exports)} exports ({self.fonte.name})")
+
+        frames = []
+        for caminho in exports:
+            df = self._ler_export(caminho)
+            self.logger.info(f"      {caminho.name}: {len(df)} linhas, {df['Ativo'].nunique()} ativos")
+            frames.append(df)
+
+        mesclado, self.estatisticas = mesclar_frames(frames)
+        self.logger.info(
+            f"   Mescla concluída: {self.estatisticas['linhas_mescladas']} linhas "
+            f"({self.estatisticas['duplicatas']} duplicatas, {self.estatisticas['conflitos']} "
+            f"conflitos resolvidos pelo export de maior prioridade)"
+        )
+        return mesclado
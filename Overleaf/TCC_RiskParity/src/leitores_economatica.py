@@ -0,0 +1,476 @@
+"""
+LEITORES ECONOMÁTICA - TCC Risk Parity v2.0
+Leitores do export longo da Economática (Data, Ativo, Preço, Volume$).
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Ingestão com memória limitada
+
+Funcionalidades:
+- Mapeamento flexível de colunas compartilhado por todos os leitores
+- Leitura em streaming (openpyxl read-only) em chunks de tamanho fixo
+- Buffer colunar tipado com teto de memória configurável
+- Pico de memória (RSS) do processo registrado no log
+- Modo compacto opcional (tickers categóricos, float32) com relatório de memória
+- Leitura de um export isolado (ler_export_economatica), base da ingestão múltipla
+- Caminho rápido para exports CSV: leitor colunar multithread (pyarrow) com
+  esquema explícito, decimal vírgula e cabeçalhos em português
+"""
+
+import csv
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+# Colunas padronizadas do frame longo retornado pelos leitores
+COLUNAS_ESPERADAS = ['Data', 'Ativo', 'Preço', 'Volume$']
+
+# Exports aceitos em data/DataBase (o mais recente é usado)
+PADROES_EXPORT = ['*Economatica*.xlsx', '*Economatica*.csv']
+
+# Células sem valor nos exports CSV
+VALORES_NULOS_CSV = ['', '-', 'n/d', 'N/D', 'NA', 'nan', 'NaN']
+FORMATOS_DATA_CSV = ['%d/%m/%Y', '%Y-%m-%d', '%d/%m/%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S']
+
+# Erro absoluto máximo (em R$) aceito na conversão para float32 no modo compacto:
+# meio centavo no preço (o arredondamento a 2 casas recupera o valor original)
+# e meio real no volume (float32 só é exato até ~R$ 16,7 milhões)
+TOLERANCIA_FLOAT32 = {'Preço': 0.005, 'Volume$': 0.5}
+
+
+def _normalizar_nome(nome) -> str:
+    """Nome de coluna sem acentos e em minúsculas ('Preço' → 'preco')"""
+    decomposto = unicodedata.normalize('NFKD', str(nome))
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def mapear_colunas_economatica(colunas, colunas_esperadas=COLUNAS_ESPERADAS) -> Dict:
+    """
+    Mapeia colunas brutas do export para os nomes padronizados.
+
+    A correspondência é por substring sem diferenciar maiúsculas nem acentos
+    (ex.: 'Preço Fechamento' ou 'PRECO' → 'Preço'); vale a primeira coluna compatível.
+
+    Args:
+        colunas (list): Nomes das colunas brutas
+        colunas_esperadas (list): Nomes padronizados a localizar
+
+    Returns:
+        dict: {coluna_bruta: coluna_padronizada}
+    """
+    mapeamento = {}
+    for col_esperada in colunas_esperadas:
+        colunas_similares = [col for col in colunas
+                             if _normalizar_nome(col_esperada) in _normalizar_nome(col)]
+        if colunas_similares:
+            mapeamento[colunas_similares[0]] = col_esperada
+        else:
+            raise ValueError(f"Coluna esperada '{col_esperada}' não encontrada")
+    return mapeamento
+
+
+def tipar_frame_economatica(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte tipos e remove observações inválidas de um frame já renomeado.
+
+    Args:
+        df (pd.DataFrame): Frame com as colunas padronizadas
+
+    Returns:
+        pd.DataFrame: Frame tipado (datetime, str, float) sem NaNs
+    """
+    df = df[COLUNAS_ESPERADAS].copy()
+
+    # Mesma resolução para xlsx, CSV e streaming (read_excel do pandas 3 usa 'us')
+    df['Data'] = pd.to_datetime(df['Data']).astype('datetime64[ns]')
+    df['Preço'] = pd.to_numeric(df['Preço'], errors='coerce').astype(np.float64)
+    df['Volume$'] = pd.to_numeric(df['Volume$'], errors='coerce').astype(np.float64)
+
+    df = df.dropna(subset=COLUNAS_ESPERADAS).reset_index(drop=True)
+    df['Ativo'] = df['Ativo'].astype(str)
+
+    return df
+
+
+def compactar_frame_economatica(df: pd.DataFrame,
+                                tolerancias: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Converte o frame longo para a representação compacta.
+
+    - Ativo: categórico (códigos inteiros + dicionário de tickers)
+    - Preço e Volume$: float32 quando o erro absoluto máximo da conversão,
+      na unidade da coluna, não excede a tolerância; caso contrário
+      permanecem float64 (ex.: volumes na casa de R$ 10^8, em que o float32
+      perderia vários reais)
+    - Data: mantida como datetime64, pois os filtros por data e o
+      resample das etapas seguintes dependem da semântica de datas
+
+    Args:
+        df (pd.DataFrame): Frame longo padrão
+        tolerancias (dict): Erro absoluto máximo por coluna (None = TOLERANCIA_FLOAT32)
+
+    Returns:
+        pd.DataFrame: Frame com as mesmas colunas em dtypes compactos
+    """
+    tolerancias = {**TOLERANCIA_FLOAT32, **(tolerancias or {})}
+    compacto = df.copy()
+    compacto['Ativo'] = compacto['Ativo'].astype('category')
+
+    for coluna in ['Preço', 'Volume$']:
+        valores = compacto[coluna].to_numpy(dtype=np.float64)
+        finitos = np.isfinite(valores)
+        with np.errstate(over='ignore', invalid='ignore'):
+            valores_32 = valores.astype(np.float32)
+            erro = np.abs(valores_32.astype(np.float64) - valores)[finitos]
+        if np.all(np.isfinite(valores_32[finitos])) and (erro.size == 0 or erro.max() <= tolerancias[coluna]):
+            compacto[coluna] = valores_32
+
+    return compacto
+
+
+def relatorio_memoria_modos(df_padrao: pd.DataFrame, df_compacto: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compara o uso de memória (deep) por coluna entre os modos padrão e compacto.
+
+    Returns:
+        pd.DataFrame: Bytes por coluna em cada modo, redução percentual e total
+    """
+    bytes_padrao = df_padrao.memory_usage(deep=True, index=False)
+    bytes_compacto = df_compacto.memory_usage(deep=True, index=False)
+
+    relatorio = pd.DataFrame({
+        'dtype_padrao': df_padrao.dtypes.astype(str),
+        'dtype_compacto': df_compacto.dtypes.astype(str),
+        'mb_padrao': bytes_padrao / (1024 * 1024),
+        'mb_compacto': bytes_compacto / (1024 * 1024)
+    })
+    relatorio.loc['Total'] = ['', '', relatorio['mb_padrao'].sum(), relatorio['mb_compacto'].sum()]
+    relatorio['reducao_pct'] = (1 - relatorio['mb_compacto'] / relatorio['mb_padrao']) * 100
+
+    return relatorio
+
+
+def medir_pico_memoria_mb() -> Optional[float]:
+    """
+    Retorna o pico de memória residente (RSS) do processo em MB.
+
+    Usa o módulo resource (Linux/macOS) e, no Windows, psutil se instalado.
+
+    Returns:
+        float ou None: Pico de RSS em MB, ou None se indisponível
+    """
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é em KB no Linux e em bytes no macOS
+        return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+class BufferColunarTipado:
+    """
+    Buffer append-only de colunas tipadas (datas int64, códigos de ativo
+    int32, preço e volume float64).
+
+    Os tickers são codificados em um dicionário à medida que chegam, de modo
+    que nenhum objeto Python por linha é mantido entre chunks.
+    """
+
+    def __init__(self, limite_memoria_mb: Optional[float] = None):
+        self.limite_memoria_mb = limite_memoria_mb
+        self.categorias: List[str] = []
+        self._codigos: Dict[str, int] = {}
+        self._partes: Dict[str, List[np.ndarray]] = {
+            'Data': [], 'Ativo': [], 'Preço': [], 'Volume$': []
+        }
+        self.n_linhas = 0
+        self.nbytes = 0
+
+    def anexar(self, df_chunk: pd.DataFrame):
+        """
+        Anexa um chunk já tipado ao buffer.
+
+        Raises:
+            MemoryError: Se o buffer ultrapassar o teto de memória configurado
+        """
+        if df_chunk.empty:
+            return
+
+        ativos_chunk, inversos = np.unique(df_chunk['Ativo'].to_numpy(), return_inverse=True)
+        mapa = np.empty(len(ativos_chunk), dtype=np.int32)
+        for i, ativo in enumerate(ativos_chunk):
+            codigo = self._codigos.get(ativo)
+            if codigo is None:
+                codigo = len(self.categorias)
+                self._codigos[ativo] = codigo
+                self.categorias.append(ativo)
+            mapa[i] = codigo
+
+        partes = {
+            'Data': df_chunk['Data'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+            'Ativo': mapa[inversos.ravel()],
+            'Preço': df_chunk['Preço'].to_numpy(dtype=np.float64),
+            'Volume$': df_chunk['Volume$'].to_numpy(dtype=np.float64)
+        }
+        for coluna, valores in partes.items():
+            self._partes[coluna].append(valores)
+            self.nbytes += valores.nbytes
+        self.n_linhas += len(df_chunk)
+
+        if self.limite_memoria_mb is not None and self.nbytes > self.limite_memoria_mb * 1024 * 1024:
+            raise MemoryError(
+                f"Buffer de ingestão excedeu o limite de {self.limite_memoria_mb:.1f} MB "
+                f"({self.nbytes / (1024 * 1024):.1f} MB após {self.n_linhas} linhas)"
+            )
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Materializa o buffer como o frame longo padrão (Ativo como str).
+
+        Returns:
+            pd.DataFrame: Colunas Data, Ativo, Preço e Volume$
+        """
+        def juntar(coluna, dtype):
+            partes = self._partes[coluna]
+            return np.concatenate(partes) if partes else np.array([], dtype=dtype)
+
+        codigos = juntar('Ativo', np.int32)
+        categorias = np.array(self.categorias, dtype=object)
+
+        return pd.DataFrame({
+            'Data': juntar('Data', np.int64).view('datetime64[ns]'),
+            'Ativo': categorias[codigos] if len(categorias) else np.array([], dtype=object),
+            'Preço': juntar('Preço', np.float64),
+            'Volume$': juntar('Volume$', np.float64)
+        })
+
+
+class LeitorEconomaticaStreaming:
+    """
+    Leitor em streaming do export longo da Economática (primeira planilha).
+
+    Percorre as linhas em modo read-only, aplica mapeamento de colunas,
+    tipagem e filtro de NaNs por chunk e acumula apenas as quatro colunas
+    padronizadas em um buffer colunar tipado. O frame bruto completo
+    (dtype object) nunca é materializado.
+    """
+
+    def __init__(self, caminho, tamanho_chunk: Optional[int] = None,
+                 limite_memoria_mb: Optional[float] = None):
+        self.logger = get_logger(__name__)
+        config = get_config()
+
+        self.caminho = Path(caminho)
+        self.tamanho_chunk = tamanho_chunk or config.INGESTAO['tamanho_chunk']
+        self.limite_memoria_mb = (
+            limite_memoria_mb if limite_memoria_mb is not None
+            else config.INGESTAO['limite_memoria_mb']
+        )
+
+    def _iterar_chunks(self):
+        """
+        Gera DataFrames tipados de até tamanho_chunk linhas válidas.
+        """
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.caminho, read_only=True, data_only=True)
+        try:
+            linhas = workbook.worksheets[0].iter_rows(values_only=True)
+
+            cabecalho = next(linhas, None)
+            if cabecalho is None:
+                return
+
+            mapeamento = mapear_colunas_economatica(cabecalho)
+            indices = {padrao: list(cabecalho).index(bruta) for bruta, padrao in mapeamento.items()}
+
+            colunas = {col: [] for col in COLUNAS_ESPERADAS}
+            for linha in linhas:
+                for col, idx in indices.items():
+                    colunas[col].append(linha[idx] if idx < len(linha) else None)
+
+                if len(colunas['Data']) >= self.tamanho_chunk:
+                    yield tipar_frame_economatica(pd.DataFrame(colunas))
+                    colunas = {col: [] for col in COLUNAS_ESPERADAS}
+
+            if colunas['Data']:
+                yield tipar_frame_economatica(pd.DataFrame(colunas))
+        finally:
+            workbook.close()
+
+    def ler(self) -> pd.DataFrame:
+        """
+        Lê o arquivo inteiro em chunks.
+
+        Returns:
+            pd.DataFrame: Frame longo tipado (Data, Ativo, Preço, Volume$)
+
+        Raises:
+            MemoryError: Se o buffer tipado exceder limite_memoria_mb
+        """
+        self.logger.info(f"   Leitura em streaming: chunks de {self.tamanho_chunk:,} linhas")
+
+        buffer = BufferColunarTipado(self.limite_memoria_mb)
+        n_chunks = 0
+        for df_chunk in self._iterar_chunks():
+            buffer.anexar(df_chunk)
+            n_chunks += 1
+
+        df = buffer.para_dataframe()
+
+        self.logger.info(
+            f"   Streaming concluído: {n_chunks} chunks, {buffer.n_linhas} linhas válidas, "
+            f"buffer {buffer.nbytes / (1024 * 1024):.1f} MB"
+        )
+        pico = medir_pico_memoria_mb()
+        if pico is not None:
+            self.logger.info(f"   Pico de memória (RSS) do processo: {pico:.1f} MB")
+
+        return df
+
+
+def _detectar_formato_csv(caminho):
+    """
+    Codificação, delimitador e cabeçalho de um export CSV.
+
+    Returns:
+        tuple: (codificação, delimitador, lista de nomes do cabeçalho)
+    """
+    with open(caminho, 'rb') as f:
+        primeira_linha = f.readline()
+
+    for codificacao in ('utf-8-sig', 'cp1252'):
+        try:
+            texto = primeira_linha.decode(codificacao)
+            break
+        except UnicodeDecodeError:
+            continue
+
+    delimitador = ';' if texto.count(';') >= texto.count(',') else ','
+    cabecalho = next(csv.reader([texto.strip('\r\n')], delimiter=delimitador))
+    return codificacao, delimitador, cabecalho
+
+
+def ler_csv_economatica(caminho) -> pd.DataFrame:
+    """
+    Lê um export CSV da Economática com leitor colunar multithread.
+
+    O esquema é explícito (Data timestamp, Ativo texto, Preço e Volume$
+    float64) e só as quatro colunas mapeadas são convertidas. Exports com ';'
+    usam vírgula decimal. Sem pyarrow, ou se alguma célula não couber no
+    esquema (ex.: separador de milhar), a leitura cai para o pandas.
+
+    Args:
+        caminho (Path): Export .csv (cabeçalho na primeira linha)
+
+    Returns:
+        pd.DataFrame: Mesmo frame tipado de ler_export_economatica para o xlsx
+    """
+    logger = get_logger(__name__)
+    codificacao, delimitador, cabecalho = _detectar_formato_csv(caminho)
+    mapeamento = mapear_colunas_economatica(cabecalho)
+    decimal = ',' if delimitador == ';' else '.'
+
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        tipos = {'Data': pa.timestamp('ns'), 'Ativo': pa.string(),
+                 'Preço': pa.float64(), 'Volume$': pa.float64()}
+        tabela = pa_csv.read_csv(
+            caminho,
+            read_options=pa_csv.ReadOptions(
+                encoding='utf8' if codificacao == 'utf-8-sig' else codificacao, use_threads=True
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter=delimitador),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(mapeamento),
+                column_types={bruta: tipos[padrao] for bruta, padrao in mapeamento.items()},
+                decimal_point=decimal,
+                null_values=VALORES_NULOS_CSV,
+                strings_can_be_null=True,
+                timestamp_parsers=FORMATOS_DATA_CSV
+            )
+        )
+        df = tabela.to_pandas().rename(columns=mapeamento)
+        logger.info(f"   CSV carregado (pyarrow): {tabela.num_rows} linhas")
+
+    except ImportError:
+        df = _ler_csv_pandas(caminho, codificacao, delimitador, decimal, mapeamento)
+    except pa.ArrowInvalid as e:
+        logger.warning(f"   CSV fora do esquema no leitor colunar, usando pandas: {e}")
+        df = _ler_csv_pandas(caminho, codificacao, delimitador, decimal, mapeamento)
+
+    return tipar_frame_economatica(df)
+
+
+def _ler_csv_pandas(caminho, codificacao, delimitador, decimal, mapeamento) -> pd.DataFrame:
+    """Leitura de reserva do CSV (pandas), com as mesmas convenções do esquema"""
+    df = pd.read_csv(
+        caminho, sep=delimitador, decimal=decimal, thousands='.' if decimal == ',' else None,
+        encoding=codificacao, usecols=list(mapeamento), na_values=VALORES_NULOS_CSV,
+        keep_default_na=False, dtype={bruta: str for bruta, padrao in mapeamento.items()
+                                      if padrao in ('Data', 'Ativo')}
+    ).rename(columns=mapeamento)
+
+    datas = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
+    faltando = datas.isna()
+    datas[faltando] = pd.to_datetime(df.loc[faltando, 'Data'], format='ISO8601', errors='coerce')
+    df['Data'] = datas
+    for coluna in ['Preço', 'Volume$']:
+        df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(np.float64)
+
+    return df
+
+
+def ler_export_economatica(caminho, streaming: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Lê um export da Economática e converte para o frame longo tipado.
+
+    Args:
+        caminho (Path): Export (.xlsx, primeira planilha, ou .csv)
+        streaming (bool): Leitura do xlsx em chunks (None = CONFIG.INGESTAO['streaming'])
+
+    Returns:
+        pd.DataFrame: Colunas Data, Ativo, Preço e Volume$ validadas
+    """
+    logger = get_logger(__name__)
+    if streaming is None:
+        streaming = get_config().INGESTAO['streaming']
+
+    # CSV: leitor colunar, sem passar pelo openpyxl
+    if Path(caminho).suffix.lower() == '.csv':
+        return ler_csv_economatica(caminho)
+
+    # Exports muito grandes: leitura em streaming com memória limitada
+    if streaming:
+        return LeitorEconomaticaStreaming(caminho).ler()
+
+    # Carregar Excel (assumindo que dados estão na primeira planilha)
+    df_raw = pd.read_excel(caminho, sheet_name=0)
+    logger.info(f"   Dados carregados: {len(df_raw)} linhas x {len(df_raw.columns)} colunas")
+
+    # Renomear colunas para padrão (flexibilidade nos nomes)
+    df = df_raw.rename(columns=mapear_colunas_economatica(df_raw.columns))
+
+    return tipar_frame_economatica(df)
@@ -0,0 +1,204 @@
+"""
+MÉTRICAS DE SELEÇÃO - TCC Risk Parity v2.0
+Métricas de performance do Score Composto calculadas para todos os ativos de uma vez.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Métricas em matriz datas x ativos
+
+Funcionalidades:
+- Retornos mensais por ativo entre o primeiro e o último mês com cotação
+  (meses sem cotação no meio da série repetem o último preço, como pct_change)
+- Momentum 12-1, volatilidade anualizada, maximum drawdown e downside
+  deviation em NumPy, coluna a coluna, sem laço por ativo
+- Mesmos valores da série por ativo (pct_change().dropna()) usada antes
+- Percentis das métricas e Score Composto compartilhados pela seleção
+  estática (etapa 01) e pela seleção rolling
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_METRICAS = [
+    'momentum_12_1', 'volatilidade_anual', 'max_drawdown',
+    'downside_deviation', 'retorno_medio_mensal', 'observacoes_performance'
+]
+
+# Percentil de cada métrica: {coluna do rank: (métrica, invertido)}
+# Invertido: menor valor = melhor (volatilidade, drawdown, downside)
+COLUNAS_RANK = {
+    'momentum_rank': ('momentum_12_1', False),
+    'volatility_rank': ('volatilidade_anual', True),
+    'drawdown_rank': ('max_drawdown', True),
+    'downside_rank': ('downside_deviation', True)
+}
+
+# Chave de CONFIG.SCORE_WEIGHTS → coluna do rank
+PESOS_RANK = {
+    'momentum': 'momentum_rank',
+    'volatility': 'volatility_rank',
+    'max_drawdown': 'drawdown_rank',
+    'downside_dev': 'downside_rank'
+}
+
+
+def retornos_mensais_matriz(precos_mensais: np.ndarray) -> np.ndarray:
+    """
+    Retornos mensais de cada coluna no intervalo com cotação do ativo.
+
+    Args:
+        precos_mensais (np.ndarray): Preços de fim de mês (meses x ativos, NaN sem cotação)
+
+    Returns:
+        np.ndarray: Retornos (meses x ativos); NaN antes do segundo mês com
+            cotação, depois do último e onde o retorno é indefinido (0/0)
+    """
+    precos = np.asarray(precos_mensais, dtype=np.float64)
+    n_meses = len(precos)
+    linhas = np.arange(n_meses)[:, None]
+
+    valido = ~np.isnan(precos)
+    primeiro = np.where(valido.any(axis=0), valido.argmax(axis=0), n_meses)
+    ultimo = n_meses - 1 - valido[::-1].argmax(axis=0)
+
+    # Forward fill por índice do último preço válido
+    ultimo_valido = np.where(valido, linhas, 0)
+    np.maximum.accumulate(ultimo_valido, axis=0, out=ultimo_valido)
+    preenchido = np.take_along_axis(precos, ultimo_valido, axis=0)
+
+    retornos = np.full_like(precos, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retornos[1:] = preenchido[1:] / preenchido[:-1] - 1
+
+    no_intervalo = (linhas > primeiro) & (linhas <= ultimo)
+    return np.where(no_intervalo, retornos, np.nan)
+
+
+def metricas_performance_matriz(retornos: np.ndarray) -> dict:
+    """
+    Métricas do Score Composto para todas as colunas de retornos mensais.
+
+    Os NaNs são ignorados (equivalente a aplicar as fórmulas à série de
+    cada ativo sem NaNs): o momentum 12-1 usa os 11 retornos anteriores ao
+    último retorno válido, o drawdown usa o máximo corrente da riqueza
+    acumulada desde o primeiro retorno válido e a downside deviation é o
+    desvio (ddof=1) apenas dos retornos negativos (0 se não houver nenhum).
+
+    Args:
+        retornos (np.ndarray): Retornos mensais (meses x ativos)
+
+    Returns:
+        dict: {métrica: np.ndarray por ativo} com as chaves de COLUNAS_METRICAS
+    """
+    retornos = np.asarray(retornos, dtype=np.float64)
+    valido = ~np.isnan(retornos)
+    n_validos = valido.sum(axis=0)
+
+    # Momentum 12-1: posições 2..12 contando do fim entre os retornos válidos
+    ordem_do_fim = np.cumsum(valido[::-1], axis=0)[::-1]
+    janela_momentum = valido & (ordem_do_fim >= 2) & (ordem_do_fim <= 12)
+    momentum = np.prod(np.where(janela_momentum, retornos + 1, 1.0), axis=0) - 1
+    momentum = np.where(n_validos >= 12, momentum, np.nan)
+
+    # Colunas sem retornos suficientes geram NaN (avisos de fatia vazia suprimidos)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        volatilidade = np.nanstd(retornos, axis=0, ddof=1) * np.sqrt(12)
+        retorno_medio = np.nanmean(retornos, axis=0)
+
+        max_drawdown = max_drawdown_matriz(retornos)
+
+        # Downside deviation: desvio apenas dos retornos negativos
+        negativos = np.where(valido & (retornos < 0), retornos, np.nan)
+        n_negativos = (~np.isnan(negativos)).sum(axis=0)
+        downside = np.where(n_negativos > 0,
+                            np.nanstd(negativos, axis=0, ddof=1) * np.sqrt(12), 0.0)
+
+    return {
+        'momentum_12_1': momentum,
+        'volatilidade_anual': volatilidade,
+        'max_drawdown': max_drawdown,
+        'downside_deviation': downside,
+        'retorno_medio_mensal': retorno_medio,
+        'observacoes_performance': n_validos
+    }
+
+
+def max_drawdown_matriz(retornos: np.ndarray) -> np.ndarray:
+    """
+    Maximum drawdown (valor absoluto) de cada coluna de retornos.
+
+    A riqueza acumulada ignora NaNs (fator 1) e o máximo corrente começa no
+    primeiro retorno válido de cada coluna.
+
+    Args:
+        retornos (np.ndarray): Retornos (períodos x ativos)
+
+    Returns:
+        np.ndarray: |mínimo de riqueza / máximo corrente - 1| por coluna
+    """
+    valido = ~np.isnan(retornos)
+    riqueza = np.cumprod(np.where(valido, retornos + 1, 1.0), axis=0)
+    iniciado = np.cumsum(valido, axis=0) > 0
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        maximo_corrente = np.fmax.accumulate(np.where(iniciado, riqueza, np.nan), axis=0)
+        drawdowns = np.where(iniciado, riqueza / maximo_corrente - 1, np.nan)
+        return np.abs(np.nanmin(drawdowns, axis=0))
+
+
+def percentis_metricas(df_metricas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Percentis (0-1) de cada métrica entre os ativos, invertidos onde menor é melhor.
+
+    Args:
+        df_metricas (pd.DataFrame): Métricas de performance por ativo
+
+    Returns:
+        pd.DataFrame: Colunas de COLUNAS_RANK com o mesmo índice
+    """
+    percentis = pd.DataFrame(index=df_metricas.index)
+    for coluna_rank, (metrica, invertido) in COLUNAS_RANK.items():
+        rank = df_metricas[metrica].rank(pct=True)
+        percentis[coluna_rank] = (1 - rank) if invertido else rank
+    return percentis
+
+
+def score_composto(percentis: pd.DataFrame, pesos: dict) -> pd.Series:
+    """
+    Score Composto: soma dos percentis ponderada por CONFIG.SCORE_WEIGHTS.
+
+    Args:
+        percentis (pd.DataFrame): Saída de percentis_metricas
+        pesos (dict): {'momentum', 'volatility', 'max_drawdown', 'downside_dev': peso}
+
+    Returns:
+        pd.Series: Score por ativo
+    """
+    score = None
+    for chave, coluna_rank in PESOS_RANK.items():
+        termo = pesos[chave] * percentis[coluna_rank]
+        score = termo if score is None else score + termo
+    return score
+
+
+def tabela_metricas_performance(precos_mensais: pd.DataFrame) -> pd.DataFrame:
+    """
+    Métricas de performance por ativo a partir dos preços de fim de mês.
+
+    Args:
+        precos_mensais (pd.DataFrame): Preços de fim de mês (meses x ativos)
+
+    Returns:
+        pd.DataFrame: Uma linha por ativo (coluna 'ativo' + COLUNAS_METRICAS)
+    """
+    retornos = retornos_mensais_matriz(precos_mensais.to_numpy())
+    metricas = metricas_performance_matriz(retornos)
+
+    tabela = pd.DataFrame(metricas, columns=COLUNAS_METRICAS)
+    tabela.insert(0, 'ativo', list(precos_mensais.columns))
+    return tabela
@@ -0,0 +1,321 @@
+"""
+MOTOR DE SINAIS - TCC Risk Parity v2.0
+Painéis meses x ativos dos fatores de seleção para vários lookbacks.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Sinais pré-calculados em cache
+
+Sinais (CONFIG.MOTOR_SINAIS, lookbacks em meses, valor em cada fim de mês m):
+- momentum_{L}_1:      retorno acumulado de m-L+1 a m-1 (exclui o último mês)
+- volatilidade_{L}:    desvio (ddof=1) dos L retornos mensais até m, anualizado
+- max_drawdown_{L}:    maior queda da riqueza acumulada nos L meses até m
+- downside_{L}:        desvio (ddof=1) dos retornos negativos, anualizado
+Um sinal só é definido quando todos os retornos da sua janela existem; as
+fórmulas são as de metricas_selecao.
+
+Funcionalidades:
+- Somas acumuladas (retornos, quadrados, log(1 + r), negativos): cada
+  janela é uma diferença de duas linhas, O(T x A) por sinal
+- Drawdown móvel por extremos em blocos de 2^k meses (máximo, mínimo e
+  queda interna), combinados pela decomposição binária de L: O(T x A x log L)
+- Painéis float64 em data/cache/sinais (np.save, abertos em memória
+  mapeada), reaproveitados enquanto o painel de mercado e os lookbacks não
+  mudarem
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from calendario_negociacao import CalendarioNegociacao
+from metricas_selecao import retornos_mensais_matriz
+from painel_mercado import PainelMercado, gravacao_atomica, ler_metadados, versao_atual
+
+
+def _acumular(valores: np.ndarray) -> np.ndarray:
+    """Somas acumuladas com linha inicial de zeros: linhas [a, b) = S[b] - S[a]"""
+    acumulado = np.zeros((len(valores) + 1, valores.shape[1]), dtype=np.float64)
+    np.cumsum(valores, axis=0, out=acumulado[1:])
+    return acumulado
+
+
+def _somas_janela(acumulado: np.ndarray, janela: int, deslocamento: int = 0) -> np.ndarray:
+    """
+    Soma das `janela` linhas que terminam `deslocamento` linhas antes de cada linha.
+
+    Returns:
+        np.ndarray: (T x A), NaN onde a janela começa antes da primeira linha
+    """
+    n = len(acumulado) - 1
+    fim = np.arange(1, n + 1) - deslocamento
+    inicio = fim - janela
+    somas = np.full((n, acumulado.shape[1]), np.nan)
+    validas = inicio >= 0
+    somas[validas] = acumulado[fim[validas]] - acumulado[inicio[validas]]
+    return somas
+
+
+def max_drawdown_movel(retornos: np.ndarray, janela: int) -> np.ndarray:
+    """
+    Maximum drawdown (valor absoluto) dos `janela` retornos até cada linha.
+
+    A riqueza da janela é medida após cada retorno (como em
+    max_drawdown_matriz). Blocos de 2^k linhas guardam o máximo e o mínimo do
+    log da riqueza e a maior queda interna; a janela é a concatenação dos
+    blocos da decomposição binária de `janela`, combinados da esquerda para a
+    direita com queda = max(queda_esq, queda_dir, maximo_esq - minimo_dir).
+
+    Args:
+        retornos (np.ndarray): Retornos (T x A) sem NaN dentro das janelas usadas
+        janela (int): Número de retornos da janela
+
+    Returns:
+        np.ndarray: Drawdown por linha e coluna (NaN nas primeiras janela - 1 linhas)
+    """
+    n = len(retornos)
+    resultado = np.full(retornos.shape, np.nan)
+    if n < janela:
+        return resultado
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_riqueza = np.cumsum(np.log1p(np.nan_to_num(retornos)), axis=0)
+
+    # Níveis de blocos: nivel[k] = (máximo, mínimo, queda) do bloco [i, i + 2^k)
+    niveis = [(log_riqueza, log_riqueza, np.zeros_like(log_riqueza))]
+    while 2 ** len(niveis) <= janela:
+        maximo, minimo, queda = niveis[-1]
+        meio = 2 ** (len(niveis) - 1)
+        niveis.append((
+            np.maximum(maximo[:-meio], maximo[meio:]),
+            np.minimum(minimo[:-meio], minimo[meio:]),
+            np.maximum(np.maximum(queda[:-meio], queda[meio:]), maximo[:-meio] - minimo[meio:])
+        ))
+
+    # Janela [i, i + janela) para cada início i, blocos do maior para o menor
+    n_janelas = n - janela + 1
+    maximo_acc = minimo_acc = queda_acc = None
+    deslocamento = 0
+    for k in range(len(niveis) - 1, -1, -1):
+        if not janela & (1 << k):
+            continue
+        maximo, minimo, queda = (nivel[deslocamento:deslocamento + n_janelas] for nivel in niveis[k])
+        if maximo_acc is None:
+            maximo_acc, minimo_acc, queda_acc = maximo, minimo, queda
+        else:
+            queda_acc = np.maximum(np.maximum(queda_acc, queda), maximo_acc - minimo)
+            maximo_acc = np.maximum(maximo_acc, maximo)
+            minimo_acc = np.minimum(minimo_acc, minimo)
+        deslocamento += 1 << k
+
+    resultado[janela - 1:] = -np.expm1(-queda_acc)
+    return resultado
+
+
+def calcular_sinais(retornos: np.ndarray, lookbacks: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    """
+    Todos os sinais de todos os lookbacks a partir dos retornos mensais.
+
+    Args:
+        retornos (np.ndarray): Retornos mensais (meses x ativos, NaN sem retorno)
+        lookbacks (dict): {'momentum'|'volatilidade'|'max_drawdown'|'downside': [meses]}
+
+    Returns:
+        dict: {nome do sinal: painel (meses x ativos)}
+    """
+    valido = ~np.isnan(retornos)
+    r = np.where(valido, retornos, 0.0)
+    negativo = valido & (retornos < 0)
+    r_negativo = np.where(negativo, retornos, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_bruto = np.where(valido, np.log1p(r), 0.0)
+
+    acumulados = {
+        'n': _acumular(valido.astype(np.float64)), 'soma': _acumular(r),
+        'soma_quadrados': _acumular(r * r), 'soma_log': _acumular(log_bruto),
+        'n_negativos': _acumular(negativo.astype(np.float64)),
+        'soma_negativos': _acumular(r_negativo),
+        'soma_quadrados_negativos': _acumular(r_negativo * r_negativo)
+    }
+
+    def janela(nome, meses, deslocamento=0):
+        return _somas_janela(acumulados[nome], meses, deslocamento)
+
+    sinais = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for meses in lookbacks.get('momentum', []):
+            completa = janela('n', meses - 1, 1) == meses - 1
+            sinais[f'momentum_{meses}_1'] = np.where(completa, np.expm1(janela('soma_log', meses - 1, 1)), np.nan)
+
+        for meses in lookbacks.get('volatilidade', []):
+            n, soma = janela('n', meses), janela('soma', meses)
+            variancia = np.maximum(janela('soma_quadrados', meses) - soma ** 2 / n, 0) / (n - 1)
+            sinais[f'volatilidade_{meses}'] = np.where((n == meses) & (n > 1), np.sqrt(variancia) * np.sqrt(12), np.nan)
+
+        for meses in lookbacks.get('max_drawdown', []):
+            completa = janela('n', meses) == meses
+            sinais[f'max_drawdown_{meses}'] = np.where(completa, max_drawdown_movel(retornos, meses), np.nan)
+
+        for meses in lookbacks.get('downside', []):
+            n_neg, soma = janela('n_negativos', meses), janela('soma_negativos', meses)
+            variancia = np.maximum(janela('soma_quadrados_negativos', meses) - soma ** 2 / n_neg, 0) / (n_neg - 1)
+            # Um único negativo: desvio indefinido (ddof=1), como np.nanstd
+            desvio = np.where(n_neg > 1, np.sqrt(variancia) * np.sqrt(12), np.where(n_neg == 1, np.nan, 0.0))
+            sinais[f'downside_{meses}'] = np.where(janela('n', meses) == meses, desvio, np.nan)
+
+    return sinais
+
+
+class MotorSinais:
+    """
+    Painéis de sinais de seleção em cache (meses x ativos).
+
+    Uso típico:
+        motor = MotorSinais().construir(armazem.painel())
+        motor.sinal('momentum_6_1')               # DataFrame meses x ativos
+        motor.no_mes('2017-12-31')                # ativos x sinais
+        motor.metricas_score('2017-12-31', 48)    # entrada de percentis_metricas
+    """
+
+    def __init__(self, lookbacks: Optional[Dict[str, List[int]]] = None, diretorio=None):
+        self.logger = get_logger(__name__)
+        config = get_config()
+        self.lookbacks = lookbacks or config.MOTOR_SINAIS
+        self.diretorio = Path(diretorio) if diretorio else config.cache_dir / "sinais"
+
+        self.meses: Optional[pd.DatetimeIndex] = None
+        self.ativos: List[str] = []
+        self.paineis: Dict[str, np.ndarray] = {}
+
+    def _origem(self, painel: PainelMercado) -> str:
+        """Identificador dos painéis: origem do painel de mercado + lookbacks"""
+        return json.dumps({'painel': painel.metadados.get('origem'), 'lookbacks': self.lookbacks},
+                          sort_keys=True)
+
+    def construir(self, painel: PainelMercado) -> 'MotorSinais':
+        """
+        Calcula os sinais a partir do painel (ou reaproveita os painéis em disco).
+
+        Args:
+            painel (PainelMercado): Painel de preços diários
+
+        Returns:
+            MotorSinais: O próprio motor, aberto
+        """
+        origem = self._origem(painel)
+        metadados = ler_metadados(self.diretorio)
+
+        if (painel.metadados.get('origem') is not None and metadados
+                and metadados.get('origem') == origem):
+            self.logger.info(f"   Sinais reaproveitados de {self.diretorio}")
+            return self.abrir()
+
+        precos = painel.para_dataframe('Preço')
+        precos_mensais = CalendarioNegociacao(precos.index).amostrar_fim_mes(precos)
+        sinais = calcular_sinais(retornos_mensais_matriz(precos_mensais.to_numpy()), self.lookbacks)
+
+        self._salvar(sinais, precos_mensais.index, list(precos_mensais.columns), origem)
+        self.abrir()
+
+        self.logger.info(f"   Sinais: {len(sinais)} painéis de {len(self.meses)} meses x "
+                         f"{len(self.ativos)} ativos ({', '.join(sinais)})")
+        return self
+
+    def _salvar(self, sinais: Dict[str, np.ndarray], meses: pd.DatetimeIndex, ativos: List[str], origem: str):
+        """Grava um .npy por sinal, meses, ativos e metadados (troca atômica do diretório)"""
+        with gravacao_atomica(self.diretorio) as temporario:
+            for nome, valores in sinais.items():
+                np.save(temporario / f"{nome}.npy", valores.astype(np.float64, copy=False))
+            np.save(temporario / "meses.npy", meses.values.astype('datetime64[D]'))
+            with open(temporario / "ativos.json", 'w', encoding='utf-8') as f:
+                json.dump(ativos, f, ensure_ascii=False)
+
+            with open(temporario / "metadados.json", 'w', encoding='utf-8') as f:
+                json.dump({'origem': origem, 'sinais': list(sinais),
+                           'criado_em': datetime.now().isoformat()}, f, indent=2, ensure_ascii=False)
+
+    def abrir(self) -> 'MotorSinais':
+        """Abre os painéis gravados (memória mapeada)"""
+        versao = versao_atual(self.diretorio)
+        if versao is None:
+            raise FileNotFoundError(f"Sinais não encontrados em {self.diretorio}")
+
+        with open(versao / "metadados.json", 'r', encoding='utf-8') as f:
+            metadados = json.load(f)
+        with open(versao / "ativos.json", 'r', encoding='utf-8') as f:
+            self.ativos = json.load(f)
+        self.meses = pd.DatetimeIndex(np.load(versao / "meses.npy").astype('datetime64[ns]'))
+        self.paineis = {nome: np.load(versao / f"{nome}.npy", mmap_mode='r')
+                        for nome in metadados['sinais']}
+        return self
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def nomes(self) -> List[str]:
+        """Sinais disponíveis"""
+        return list(self.paineis)
+
+    def sinal(self, nome: str, como_dataframe: bool = True):
+        """Painel de um sinal (meses x ativos)"""
+        if nome not in self.paineis:
+            raise KeyError(f"Sinal não calculado: {nome!r} (disponíveis: {self.nomes()})")
+        painel = self.paineis[nome]
+        return pd.DataFrame(painel, index=self.meses, columns=self.ativos, copy=False) if como_dataframe else painel
+
+    def _linha(self, data) -> int:
+        """Último fim de mês em ou antes da data"""
+        linha = int(self.meses.searchsorted(pd.Timestamp(data), side='right')) - 1
+        if linha < 0:
+            raise KeyError(f"Data anterior ao primeiro mês dos sinais: {data}")
+        return linha
+
+    def no_mes(self, data, nomes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Corte transversal dos sinais no último fim de mês em ou antes da data.
+
+        Returns:
+            pd.DataFrame: Ativos x sinais
+        """
+        linha = self._linha(data)
+        nomes = nomes or self.nomes()
+        return pd.DataFrame({nome: self.paineis[nome][linha] for nome in nomes},
+                            index=pd.Index(self.ativos, name='ativo'))
+
+    def metricas_score(self, data, janela_meses: int) -> pd.DataFrame:
+        """
+        Métricas do Score Composto lidas dos painéis (entrada de percentis_metricas).
+
+        Momentum 12-1 e volatilidade, drawdown e downside de `janela_meses`
+        meses; ativos sem algum dos sinais na data são descartados.
+
+        Args:
+            data: Data de avaliação (último fim de mês em ou antes dela)
+            janela_meses (int): Lookback das métricas de risco (precisa estar em CONFIG.MOTOR_SINAIS)
+
+        Returns:
+            pd.DataFrame: Colunas ativo, momentum_12_1, volatilidade_anual,
+                max_drawdown e downside_deviation
+        """
+        colunas = {
+            'momentum_12_1': 'momentum_12_1',
+            f'volatilidade_{janela_meses}': 'volatilidade_anual',
+            f'max_drawdown_{janela_meses}': 'max_drawdown',
+            f'downside_{janela_meses}': 'downside_deviation'
+        }
+        tabela = self.no_mes(data, list(colunas)).rename(columns=colunas)
+        return tabela.dropna().reset_index()
@@ -0,0 +1,368 @@
+"""
+PAINEL DE MERCADO EM MEMÓRIA MAPEADA - TCC Risk Parity v2.0
+Formato persistente (datas x ativos) para preços e volumes.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Painel np.memmap
+
+Estrutura em disco (um diretório por painel, uma versão por gravação):
+- versao_atual.txt       Nome do subdiretório da versão vigente
+- v-<id>/<campo>.npy     Matriz float64 contígua (datas x ativos), aberta com np.memmap
+- v-<id>/datas.npy       Índice de datas (datetime64[D], ordenado)
+- v-<id>/ativos.json     Índice de tickers (ordem das colunas)
+- v-<id>/metadados.json  Campos disponíveis, dimensões e origem dos dados
+
+Fatias por janela de datas (e por blocos contíguos de ativos) são views
+do arquivo mapeado, sem cópia.
+
+Cada gravação cria uma versão nova (subdiretório v-<id>) e só então troca o
+arquivo versao_atual.txt, que aponta para a versão vigente, com os.replace.
+Nenhum diretório com arquivos mapeados é renomeado nem reescrito, então
+views e DataFrames abertos antes continuam com os dados antigos (inclusive
+no Windows, onde arquivos mapeados não podem ser movidos nem apagados).
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+
+def _nome_arquivo_campo(campo: str) -> str:
+    """Nome de arquivo seguro para um campo (ex.: 'Volume$' → 'volume')"""
+    normalizado = campo.lower().replace('ç', 'c').replace('ã', 'a')
+    return re.sub(r'[^0-9a-z_]+', '', normalizado) + '.npy'
+
+
+ARQUIVO_VERSAO = "versao_atual.txt"
+
+
+def versao_atual(diretorio) -> Optional[Path]:
+    """
+    Subdiretório da versão vigente de um diretório gravado com gravacao_atomica.
+
+    Args:
+        diretorio (Path): Diretório lógico (ex.: data/cache/painel_mercado)
+
+    Returns:
+        Path: Versão vigente (None se nada foi gravado ainda)
+    """
+    diretorio = Path(diretorio)
+    try:
+        nome = (diretorio / ARQUIVO_VERSAO).read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+    versao = diretorio / nome
+    return versao if nome and versao.is_dir() else None
+
+
+def ler_metadados(diretorio) -> Optional[Dict]:
+    """
+    Lê o metadados.json da versão vigente sem abrir nenhum arquivo mapeado.
+
+    Args:
+        diretorio (Path): Diretório lógico
+
+    Returns:
+        dict: Metadados (None se não houver versão gravada)
+    """
+    versao = versao_atual(diretorio)
+    if versao is None or not (versao / "metadados.json").exists():
+        return None
+    with open(versao / "metadados.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _remover_versoes_antigas(diretorio: Path, manter: Path):
+    """Remove versões e arquivos que não são a versão vigente nem o ponteiro"""
+    for item in diretorio.iterdir():
+        if item == manter or item.name == ARQUIVO_VERSAO:
+            continue
+        # Com mapeamentos abertos a remoção falha no Windows; a versão é
+        # removida numa gravação seguinte, quando ninguém mais a usa
+        if item.is_dir():
+            shutil.rmtree(item, ignore_errors=True)
+        else:
+            try:
+                item.unlink()
+            except OSError:
+                pass
+
+
+@contextmanager
+def gravacao_atomica(diretorio) -> Iterator[Path]:
+    """
+    Versão nova de `diretorio`, publicada ao final do bloco.
+
+    Os arquivos são gravados em um subdiretório novo; ao final, o ponteiro
+    versao_atual.txt é trocado com os.replace (atômico também no Windows).
+    O diretório lógico nunca deixa de existir, e versões antigas ainda
+    mapeadas não são movidas. Em caso de erro no bloco, a versão vigente
+    permanece intacta.
+
+    Args:
+        diretorio (Path): Diretório lógico
+
+    Yields:
+        Path: Subdiretório da nova versão, onde gravar os arquivos
+    """
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    sufixo = uuid.uuid4().hex[:8]
+    versao = diretorio / f"v-{time.strftime('%Y%m%d%H%M%S')}-{sufixo}"
+    versao.mkdir()
+
+    try:
+        yield versao
+    except BaseException:
+        shutil.rmtree(versao, ignore_errors=True)
+        raise
+
+    ponteiro = diretorio / f".{ARQUIVO_VERSAO}.{sufixo}"
+    ponteiro.write_text(versao.name, encoding='utf-8')
+    os.replace(ponteiro, diretorio / ARQUIVO_VERSAO)
+    _remover_versoes_antigas(diretorio, versao)
+
+
+class PainelMercado:
+    """
+    Painel datas x ativos persistido em arquivos .npy abertos com np.memmap.
+
+    Uso típico:
+        painel = PainelMercado.construir_de_frame_longo(df, diretorio)
+        painel = PainelMercado.abrir(diretorio)
+        janela = painel.fatia('Preço', '2018-01-01', '2019-12-31')  # view
+    """
+
+    def __init__(self, diretorio, datas: np.ndarray, ativos: List[str],
+                 campos: Dict[str, np.ndarray], metadados: Optional[Dict] = None):
+        self.diretorio = Path(diretorio)
+        self._datas = datas.astype('datetime64[D]')
+        self.ativos = list(ativos)
+        self.campos = campos
+        self.metadados = metadados or {}
+        self._posicao_ativo = {ativo: i for i, ativo in enumerate(self.ativos)}
+
+    # ------------------------------------------------------------------
+    # Construção e persistência
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def salvar(cls, diretorio, datas, ativos, campos: Dict[str, np.ndarray],
+               origem: Optional[str] = None) -> 'PainelMercado':
+        """
+        Grava um painel em disco e o retorna aberto em memória mapeada.
+
+        Args:
+            diretorio (Path): Diretório do painel (uma versão nova substitui a atual)
+            datas (array-like): Datas das linhas (ordenadas)
+            ativos (list): Tickers das colunas
+            campos (dict): {nome_campo: matriz (datas x ativos)}
+            origem (str): Identificador da fonte (ex.: chave do cache)
+
+        Returns:
+            PainelMercado: Painel aberto a partir dos arquivos gravados
+        """
+        diretorio = Path(diretorio)
+        datas = np.asarray(pd.DatetimeIndex(datas).values.astype('datetime64[D]'))
+        forma = (len(datas), len(ativos))
+
+        with gravacao_atomica(diretorio) as temporario:
+            arquivos = {}
+            for campo, valores in campos.items():
+                valores = np.asarray(valores, dtype=np.float64)
+                if valores.shape != forma:
+                    raise ValueError(f"Campo '{campo}' com forma {valores.shape}, esperado {forma}")
+
+                arquivo = _nome_arquivo_campo(campo)
+                destino = np.lib.format.open_memmap(
+                    temporario / arquivo, mode='w+', dtype=np.float64, shape=forma
+                )
+                destino[:] = valores
+                destino.flush()
+                del destino
+                arquivos[campo] = arquivo
+
+            np.save(temporario / "datas.npy", datas)
+            with open(temporario / "ativos.json", 'w', encoding='utf-8') as f:
+                json.dump(list(ativos), f, ensure_ascii=False)
+
+            metadados = {
+                'campos': arquivos,
+                'n_datas': forma[0],
+                'n_ativos': forma[1],
+                'data_inicio': str(datas[0]) if len(datas) else None,
+                'data_fim': str(datas[-1]) if len(datas) else None,
+                'origem': origem,
+                'criado_em': datetime.now().isoformat()
+            }
+            with open(temporario / "metadados.json", 'w', encoding='utf-8') as f:
+                json.dump(metadados, f, indent=2, ensure_ascii=False)
+
+        return cls.abrir(diretorio)
+
+    @classmethod
+    def construir_de_frame_longo(cls, df: pd.DataFrame, diretorio,
+                                 campos=('Preço', 'Volume$'),
+                                 origem: Optional[str] = None) -> 'PainelMercado':
+        """
+        Pivota o frame longo (Data, Ativo, campos...) em um único passo e grava.
+
+        Datas e tickers são fatorados uma vez e os valores são espalhados
+        diretamente nas matrizes; em duplicatas (Ativo, Data) vale a última linha.
+
+        Args:
+            df (pd.DataFrame): Frame longo do carregador Economática
+            diretorio (Path): Diretório de destino do painel
+            campos (tuple): Colunas numéricas a persistir
+            origem (str): Identificador da fonte
+
+        Returns:
+            PainelMercado: Painel aberto em memória mapeada
+        """
+        codigos_datas, datas = pd.factorize(df['Data'], sort=True)
+        codigos_ativos, ativos = pd.factorize(df['Ativo'].astype(str), sort=True)
+
+        matrizes = {}
+        for campo in campos:
+            matriz = np.full((len(datas), len(ativos)), np.nan, dtype=np.float64)
+            matriz[codigos_datas, codigos_ativos] = df[campo].to_numpy(dtype=np.float64)
+            matrizes[campo] = matriz
+
+        return cls.salvar(diretorio, datas, list(ativos), matrizes, origem=origem)
+
+    @classmethod
+    def abrir(cls, diretorio, modo: str = 'r') -> 'PainelMercado':
+        """
+        Abre um painel existente sem carregar as matrizes em memória.
+
+        Args:
+            diretorio (Path): Diretório do painel
+            modo (str): Modo do np.memmap ('r' somente leitura, 'r+' edição)
+
+        Returns:
+            PainelMercado: Painel com campos em memória mapeada
+        """
+        diretorio = Path(diretorio)
+        versao = versao_atual(diretorio)
+        if versao is None:
+            raise FileNotFoundError(f"Painel não encontrado em {diretorio}")
+
+        with open(versao / "metadados.json", 'r', encoding='utf-8') as f:
+            metadados = json.load(f)
+        with open(versao / "ativos.json", 'r', encoding='utf-8') as f:
+            ativos = json.load(f)
+        datas = np.load(versao / "datas.npy")
+
+        campos = {
+            campo: np.load(versao / arquivo, mmap_mode=modo)
+            for campo, arquivo in metadados['campos'].items()
+        }
+
+        return cls(diretorio, datas, ativos, campos, metadados)
+
+    @staticmethod
+    def diretorio_padrao(nome: str = "painel_mercado") -> Path:
+        """Diretório padrão do painel dentro do cache do projeto"""
+        return get_config().cache_dir / nome
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    @property
+    def datas(self) -> pd.DatetimeIndex:
+        """Índice de datas do painel"""
+        return pd.DatetimeIndex(self._datas.astype('datetime64[ns]'))
+
+    @property
+    def forma(self):
+        """Dimensões (n_datas, n_ativos)"""
+        return (len(self._datas), len(self.ativos))
+
+    def posicoes_datas(self, inicio=None, fim=None) -> slice:
+        """
+        Converte uma janela de datas em fatia de linhas (busca binária).
+
+        Args:
+            inicio, fim (str/datetime): Limites inclusivos (None = sem limite)
+
+        Returns:
+            slice: Linhas do painel dentro da janela
+        """
+        i0 = 0 if inicio is None else int(np.searchsorted(
+            self._datas, np.datetime64(pd.Timestamp(inicio).date()), side='left'))
+        i1 = len(self._datas) if fim is None else int(np.searchsorted(
+            self._datas, np.datetime64(pd.Timestamp(fim).date()), side='right'))
+        return slice(i0, i1)
+
+    def posicoes_ativos(self, ativos) -> List[int]:
+        """Posições das colunas dos tickers informados"""
+        faltando = [a for a in ativos if a not in self._posicao_ativo]
+        if faltando:
+            raise KeyError(f"Ativos ausentes no painel: {faltando}")
+        return [self._posicao_ativo[a] for a in ativos]
+
+    def fatia(self, campo: str = 'Preço', inicio=None, fim=None, ativos=None) -> np.ndarray:
+        """
+        Retorna a submatriz de um campo para uma janela de datas e ativos.
+
+        A janela de datas é sempre uma view. Para ativos, a fatia também é
+        uma view quando as posições formam uma progressão aritmética
+        (ex.: bloco contíguo); listas arbitrárias exigem cópia da janela.
+
+        Args:
+            campo (str): Campo do painel ('Preço', 'Volume$', ...)
+            inicio, fim: Janela de datas inclusiva
+            ativos (list): Subconjunto de tickers (None = todos)
+
+        Returns:
+            np.ndarray: Submatriz (datas x ativos)
+        """
+        janela = self.campos[campo][self.posicoes_datas(inicio, fim)]
+
+        if ativos is None:
+            return janela
+
+        posicoes = self.posicoes_ativos(ativos)
+        if len(posicoes) == 1:
+            return janela[:, posicoes[0]:posicoes[0] + 1]
+
+        passos = np.diff(posicoes)
+        if len(posicoes) > 1 and passos[0] > 0 and np.all(passos == passos[0]):
+            return janela[:, posicoes[0]:posicoes[-1] + 1:passos[0]]
+
+        return np.take(janela, posicoes, axis=1)
+
+    def para_dataframe(self, campo: str = 'Preço', inicio=None, fim=None, ativos=None) -> pd.DataFrame:
+        """
+        Envolve uma fatia do painel em um DataFrame (sem copiar a matriz quando
+        a fatia é uma view).
+
+        Returns:
+            pd.DataFrame: Índice de datas e colunas de tickers
+        """
+        linhas = self.posicoes_datas(inicio, fim)
+        colunas = self.ativos if ativos is None else list(ativos)
+        valores = self.fatia(campo, inicio, fim, ativos)
+
+        return pd.DataFrame(valores, index=self.datas[linhas], columns=colunas, copy=False)
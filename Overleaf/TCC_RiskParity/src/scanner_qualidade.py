@@ -0,0 +1,286 @@
+"""
+SCANNER DE QUALIDADE DOS DADOS - TCC Risk Parity v2.0
+Verificação vetorizada, em uma passada, do painel datas x ativos.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Flags de qualidade em painel booleano
+
+Flags calculadas (máscaras datas x ativos):
+- lacuna:          sem cotação em um pregão dentro do histórico do ativo
+- preco_parado:    preço igual ao anterior em sequências >= min_dias_parado
+- volume_zero:     volume nulo em sequências >= min_dias_volume_zero
+- outlier_retorno: |z robusto| do retorno diário > z_robusto_max
+                   (z = 0,6745 x (r - mediana) / MAD, por ativo)
+- data_duplicada:  (Ativo, Data) repetido no frame longo de origem
+
+Saídas:
+- Relatório compacto por ativo (contagens, % e maiores sequências)
+- Máscaras persistidas em data/cache/qualidade_painel para reuso
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from painel_mercado import PainelMercado, gravacao_atomica, ler_metadados, versao_atual
+
+FLAGS_QUALIDADE = ['lacuna', 'preco_parado', 'volume_zero', 'outlier_retorno', 'data_duplicada']
+
+LIMIARES_PADRAO = {
+    'min_dias_parado': 5,        # Pregões seguidos com preço repetido
+    'min_dias_volume_zero': 5,   # Pregões seguidos sem volume
+    'z_robusto_max': 8.0         # |z| robusto acima do qual o retorno é outlier
+}
+
+
+def comprimento_sequencias(mascara: np.ndarray) -> np.ndarray:
+    """
+    Comprimento da sequência de True que contém cada célula (0 onde False).
+
+    Contagens acumuladas com reinício (para frente e para trás) ao longo das
+    linhas; o comprimento total é a soma das duas menos a própria célula.
+
+    Args:
+        mascara (np.ndarray): Matriz booleana (datas x ativos)
+
+    Returns:
+        np.ndarray: Comprimentos int64 com a mesma forma
+    """
+    def acumulado_com_reinicio(m):
+        contagem = np.cumsum(m, axis=0)
+        reinicio = np.where(m, 0, contagem)
+        np.maximum.accumulate(reinicio, axis=0, out=reinicio)
+        return contagem - reinicio
+
+    para_frente = acumulado_com_reinicio(mascara)
+    para_tras = acumulado_com_reinicio(mascara[::-1])[::-1]
+
+    return np.where(mascara, para_frente + para_tras - 1, 0)
+
+
+def escanear_painel(precos: np.ndarray, volumes: np.ndarray,
+                    duplicatas: Optional[np.ndarray] = None,
+                    limiares: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Calcula todas as máscaras de qualidade em uma passada sobre o painel.
+
+    Args:
+        precos (np.ndarray): Preços (datas x ativos, NaN sem cotação)
+        volumes (np.ndarray): Volumes (datas x ativos)
+        duplicatas (np.ndarray): Máscara de (data, ativo) duplicados na origem
+        limiares (dict): Limiares (None = LIMIARES_PADRAO)
+
+    Returns:
+        dict: {flag: máscara booleana (datas x ativos)} + 'sequencia_parado'
+            e 'sequencia_volume_zero' (comprimentos das sequências)
+    """
+    limiares = {**LIMIARES_PADRAO, **(limiares or {})}
+    n_datas, n_ativos = precos.shape
+    linhas = np.arange(n_datas)[:, None]
+
+    valido = ~np.isnan(precos)
+
+    # Histórico de cada ativo: entre a primeira e a última cotação
+    primeira = np.where(valido.any(axis=0), valido.argmax(axis=0), n_datas)
+    ultima = n_datas - 1 - valido[::-1].argmax(axis=0)
+    no_historico = (linhas >= primeira) & (linhas <= ultima)
+    lacuna = no_historico & ~valido
+
+    # Último preço válido anterior (forward fill por índice)
+    ultimo_valido = np.where(valido, linhas, -1)
+    np.maximum.accumulate(ultimo_valido, axis=0, out=ultimo_valido)
+    anterior = np.full_like(ultimo_valido, -1)
+    anterior[1:] = ultimo_valido[:-1]
+    tem_anterior = anterior >= 0
+    preco_anterior = np.where(
+        tem_anterior, np.take_along_axis(precos, np.maximum(anterior, 0), axis=0), np.nan
+    )
+
+    # Sequências de preço parado e de volume zero
+    with np.errstate(invalid='ignore'):
+        repetido = valido & tem_anterior & (precos == preco_anterior)
+        sem_volume = valido & (volumes == 0)
+    sequencia_parado = comprimento_sequencias(repetido)
+    sequencia_volume_zero = comprimento_sequencias(sem_volume)
+
+    # Retornos entre cotações consecutivas e z robusto por ativo
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retornos = precos / preco_anterior - 1
+    retornos[~(valido & tem_anterior)] = np.nan
+
+    mediana = np.nanmedian(retornos, axis=0) if n_datas else np.full(n_ativos, np.nan)
+    mad = np.nanmedian(np.abs(retornos - mediana), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_robusto = 0.6745 * (retornos - mediana) / mad
+    # MAD nulo (ativo quase sempre parado): qualquer retorno válido diferente da mediana é
+    # outlier; dias sem retorno (antes da listagem, primeira cotação, lacunas) nunca são
+    z_robusto = np.where(mad == 0, np.where(~np.isnan(retornos) & (retornos != mediana), np.inf, 0.0),
+                         z_robusto)
+    outlier = np.abs(np.nan_to_num(z_robusto, nan=0.0)) > limiares['z_robusto_max']
+
+    return {
+        'lacuna': lacuna,
+        'preco_parado': sequencia_parado >= limiares['min_dias_parado'],
+        'volume_zero': sequencia_volume_zero >= limiares['min_dias_volume_zero'],
+        'outlier_retorno': outlier,
+        'data_duplicada': duplicatas if duplicatas is not None else np.zeros_like(valido),
+        'sequencia_parado': sequencia_parado,
+        'sequencia_volume_zero': sequencia_volume_zero
+    }
+
+
+def mascara_duplicatas(df: pd.DataFrame, datas, ativos) -> np.ndarray:
+    """
+    Marca no painel as células (data, ativo) que aparecem mais de uma vez no frame longo.
+
+    Args:
+        df (pd.DataFrame): Frame longo (Data, Ativo, ...)
+        datas (DatetimeIndex): Linhas do painel
+        ativos (list): Colunas do painel
+
+    Returns:
+        np.ndarray: Máscara booleana (datas x ativos)
+    """
+    mascara = np.zeros((len(datas), len(ativos)), dtype=bool)
+
+    repetidas = df.duplicated(['Ativo', 'Data'], keep=False).to_numpy()
+    if repetidas.any():
+        linhas = pd.DatetimeIndex(datas).get_indexer(pd.DatetimeIndex(df['Data'].to_numpy()[repetidas]))
+        colunas = pd.Index(ativos).get_indexer(df['Ativo'].astype(str).to_numpy()[repetidas])
+        encontradas = (linhas >= 0) & (colunas >= 0)
+        mascara[linhas[encontradas], colunas[encontradas]] = True
+
+    return mascara
+
+
+def relatorio_qualidade(mascaras: Dict[str, np.ndarray], ativos, precos: np.ndarray) -> pd.DataFrame:
+    """
+    Relatório compacto por ativo a partir das máscaras.
+
+    Returns:
+        pd.DataFrame: Contagem e % (sobre os dias com cotação) de cada flag,
+            maiores sequências e indicador de ativo sem nenhuma flag
+    """
+    dias_cotados = (~np.isnan(precos)).sum(axis=0)
+
+    relatorio = pd.DataFrame({'ativo': list(ativos), 'dias_cotados': dias_cotados})
+    for flag in FLAGS_QUALIDADE:
+        contagem = mascaras[flag].sum(axis=0)
+        relatorio[f'n_{flag}'] = contagem
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relatorio[f'pct_{flag}'] = np.where(dias_cotados > 0, contagem / dias_cotados, np.nan)
+
+    relatorio['maior_sequencia_parado'] = mascaras['sequencia_parado'].max(axis=0, initial=0)
+    relatorio['maior_sequencia_volume_zero'] = mascaras['sequencia_volume_zero'].max(axis=0, initial=0)
+    relatorio['sem_flags'] = relatorio[[f'n_{flag}' for flag in FLAGS_QUALIDADE]].sum(axis=1) == 0
+
+    return relatorio
+
+
+class ScannerQualidade:
+    """
+    Scanner de qualidade do painel de mercado com máscaras persistidas.
+
+    Uso típico:
+        scanner = ScannerQualidade()
+        relatorio = scanner.escanear(armazem.painel(), armazem.frame())
+        mascaras = scanner.mascaras()          # reuso sem novo escaneamento
+        limpos = precos.mask(mascaras['outlier_retorno'])
+    """
+
+    def __init__(self, limiares: Optional[Dict] = None, diretorio=None):
+        self.logger = get_logger(__name__)
+        self.limiares = {**LIMIARES_PADRAO, **(limiares or {})}
+        self.diretorio = Path(diretorio) if diretorio else get_config().cache_dir / "qualidade_painel"
+
+    def _origem(self, painel: PainelMercado) -> str:
+        """Identificador das máscaras: origem do painel + limiares"""
+        return json.dumps({'painel': painel.metadados.get('origem'), 'limiares': self.limiares},
+                          sort_keys=True)
+
+    def escanear(self, painel: PainelMercado, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Escaneia o painel (ou reaproveita o resultado em disco) e retorna o relatório.
+
+        Args:
+            painel (PainelMercado): Painel de preços e volumes
+            df (pd.DataFrame): Frame longo de origem (para datas duplicadas)
+
+        Returns:
+            pd.DataFrame: Relatório compacto por ativo
+        """
+        origem = self._origem(painel)
+        metadados = ler_metadados(self.diretorio)
+
+        if (painel.metadados.get('origem') is not None and metadados
+                and metadados.get('origem') == origem):
+            self.logger.info(f"   Qualidade: máscaras reaproveitadas de {self.diretorio}")
+            return pd.read_csv(versao_atual(self.diretorio) / "relatorio.csv")
+
+        precos = np.asarray(painel.campos['Preço'])
+        volumes = np.asarray(painel.campos['Volume$'])
+        duplicatas = mascara_duplicatas(df, painel.datas, painel.ativos) if df is not None else None
+
+        mascaras = escanear_painel(precos, volumes, duplicatas, self.limiares)
+        relatorio = relatorio_qualidade(mascaras, painel.ativos, precos)
+
+        self._salvar(mascaras, relatorio, painel, origem)
+
+        totais = {flag: int(mascaras[flag].sum()) for flag in FLAGS_QUALIDADE}
+        self.logger.info(f"   Qualidade: {totais} | ativos sem flags: "
+                         f"{int(relatorio['sem_flags'].sum())}/{len(relatorio)}")
+
+        return relatorio
+
+    def _salvar(self, mascaras, relatorio, painel, origem):
+        """Grava máscaras (.npy booleano), índices e relatório (troca atômica do diretório)"""
+        with gravacao_atomica(self.diretorio) as temporario:
+            for flag in FLAGS_QUALIDADE:
+                np.save(temporario / f"{flag}.npy", mascaras[flag].astype(bool))
+            np.save(temporario / "datas.npy", painel.datas.values.astype('datetime64[D]'))
+            with open(temporario / "ativos.json", 'w', encoding='utf-8') as f:
+                json.dump(list(painel.ativos), f, ensure_ascii=False)
+            relatorio.to_csv(temporario / "relatorio.csv", index=False)
+
+            with open(temporario / "metadados.json", 'w', encoding='utf-8') as f:
+                json.dump({'origem': origem, 'flags': FLAGS_QUALIDADE,
+                           'criado_em': datetime.now().isoformat()}, f, indent=2, ensure_ascii=False)
+
+    def mascaras(self, como_dataframe: bool = True) -> Dict:
+        """
+        Abre as máscaras gravadas pelo último escaneamento (memória mapeada).
+
+        Args:
+            como_dataframe (bool): Envolver cada máscara em DataFrame (datas x ativos)
+
+        Returns:
+            dict: {flag: máscara}
+        """
+        versao = versao_atual(self.diretorio)
+        if versao is None:
+            raise FileNotFoundError(f"Máscaras de qualidade não encontradas em {self.diretorio}")
+
+        datas = pd.DatetimeIndex(np.load(versao / "datas.npy").astype('datetime64[ns]'))
+        with open(versao / "ativos.json", 'r', encoding='utf-8') as f:
+            ativos = json.load(f)
+
+        resultado = {}
+        for flag in FLAGS_QUALIDADE:
+            mascara = np.load(versao / f"{flag}.npy", mmap_mode='r')
+            resultado[flag] = (pd.DataFrame(mascara, index=datas, columns=ativos, copy=False)
+                               if como_dataframe else mascara)
+        return resultado
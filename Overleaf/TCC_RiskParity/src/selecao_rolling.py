@@ -0,0 +1,408 @@
+"""
+SELEÇÃO ROLLING POINT-IN-TIME - TCC Risk Parity v2.0
+Filtros de liquidez e Score Composto recalculados em cada rebalanceamento.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Seleção rolling com agregados incrementais
+
+Em cada pregão de rebalanceamento (CONFIG.PERIODOS['rebalance_meses']) a
+seleção usa apenas os CONFIG.SELECAO_ROLLING['janela_meses'] meses anteriores:
+- Liquidez (critérios da etapa 01): observações, volume médio, presença,
+  dias sem retorno e autocorrelação dos retornos diários
+- Cotação no último mês da janela: ativos que deixaram de ser negociados
+  (cancelamento, OPA) não são selecionados pelo histórico anterior
+- Performance: momentum 12-1, volatilidade, maximum drawdown e downside
+  deviation dos retornos mensais com os dois extremos dentro da janela
+- Score Composto e top N com os mesmos percentis e pesos da etapa 01
+
+Agregados incrementais:
+- Somas diárias (volume, contagens, somas de retornos e de produtos cruzados
+  para a autocorrelação) e mensais (retornos, quadrados, log(1 + r),
+  negativos) são reduzidas por mês e acumuladas uma única vez
+- Cada data de rebalanceamento lê a janela como diferença de duas somas
+  acumuladas: O(ativos), independente do tamanho do histórico; apenas o
+  drawdown (dependente do caminho) percorre os meses da janela
+- Bordas da janela: como no frame truncado da etapa 01, a primeira cotação
+  de cada ativo na janela não tem retorno e as duas primeiras não formam
+  par da autocorrelação; essas contribuições (amostradas uma vez por mês)
+  são descontadas das somas da janela
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from calendario_negociacao import CalendarioNegociacao
+from metricas_selecao import (
+    COLUNAS_METRICAS, max_drawdown_matriz, percentis_metricas,
+    retornos_mensais_matriz, score_composto
+)
+
+
+class SelecaoRolling:
+    """
+    Seleção de ativos point-in-time em cada data de rebalanceamento.
+
+    Uso típico:
+        armazem = ArmazemPrecos.obter()
+        selecao = SelecaoRolling(armazem.precos(), armazem.volumes())
+        membros = selecao.executar(n_ativos=10)      # tabela datada do top N
+        matriz = SelecaoRolling.matriz_membros(membros)
+    """
+
+    def __init__(self, precos: pd.DataFrame, volumes: pd.DataFrame,
+                 janela_meses: Optional[int] = None, criterios: Optional[Dict] = None,
+                 pesos: Optional[Dict] = None):
+        """
+        Args:
+            precos (pd.DataFrame): Preços diários (datas x ativos, NaN sem cotação)
+            volumes (pd.DataFrame): Volumes financeiros diários (mesmo formato)
+            janela_meses (int): Meses anteriores usados (None = CONFIG.SELECAO_ROLLING)
+            criterios (dict): Critérios de liquidez (None = CONFIG.LIQUIDEZ_CRITERIA)
+            pesos (dict): Pesos do Score Composto (None = CONFIG.SCORE_WEIGHTS)
+        """
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+
+        self.janela_meses = janela_meses or self.config.SELECAO_ROLLING['janela_meses']
+        self.criterios = criterios or self.config.LIQUIDEZ_CRITERIA
+        self.pesos = pesos or self.config.SCORE_WEIGHTS
+
+        self.calendario = CalendarioNegociacao(precos.index)
+        self.ativos = np.asarray(precos.columns, dtype=object)
+
+        precos = precos.reindex(self.calendario.datas)
+        volumes = volumes.reindex(index=self.calendario.datas, columns=precos.columns)
+
+        self.acumulados_diarios, self.bordas_janela = self._acumular_diarios(
+            precos.to_numpy(dtype=np.float64), volumes.to_numpy(dtype=np.float64))
+
+        self.retornos_mensais = retornos_mensais_matriz(self.calendario.amostrar_fim_mes(precos).to_numpy())
+        self.acumulados_mensais = self._acumular_mensais(self.retornos_mensais)
+
+        self.logger.info(f"   Seleção rolling: {len(self.ativos)} ativos, "
+                         f"{len(self.calendario.rotulos_fim_mes)} meses, janela de {self.janela_meses} meses")
+
+    # ------------------------------------------------------------------
+    # Agregados (calculados uma vez)
+    # ------------------------------------------------------------------
+
+    def _somar_por_mes(self, valores: np.ndarray) -> np.ndarray:
+        """Soma das linhas diárias de cada mês civil (meses sem pregão = 0)"""
+        com_pregao = self.calendario.meses_com_pregao
+        somas = np.zeros((len(com_pregao), valores.shape[1]), dtype=np.float64)
+        if com_pregao.any():
+            somas[com_pregao] = np.add.reduceat(valores, self.calendario.posicoes_inicio_mes[com_pregao], axis=0)
+        return somas
+
+    @staticmethod
+    def _acumular(somas_mensais: np.ndarray) -> np.ndarray:
+        """Somas acumuladas com linha inicial de zeros: janela [a, b) = S[b] - S[a]"""
+        acumulado = np.zeros((len(somas_mensais) + 1, somas_mensais.shape[1]), dtype=np.float64)
+        np.cumsum(somas_mensais, axis=0, out=acumulado[1:])
+        return acumulado
+
+    def _primeiras_cotacoes(self, cotado: np.ndarray):
+        """
+        Linhas da primeira e da segunda cotação de cada ativo a partir do
+        início de cada mês (len(datas) quando não houver).
+        """
+        n_datas = len(cotado)
+        proxima = np.full((n_datas + 1, cotado.shape[1]), n_datas, dtype=np.int64)
+        proxima[:-1] = np.where(cotado, np.arange(n_datas)[:, None], n_datas)
+        proxima[:-1] = np.minimum.accumulate(proxima[-2::-1], axis=0)[::-1]
+
+        primeira = proxima[self.calendario.posicoes_inicio_mes]
+        segunda = np.take_along_axis(proxima, np.minimum(primeira + 1, n_datas), axis=0)
+        return primeira, segunda
+
+    @staticmethod
+    def _amostrar_linhas(valores: np.ndarray, linhas: np.ndarray) -> np.ndarray:
+        """valores[linhas[m, j], j] (0 onde a linha não existe)"""
+        dentro = linhas < len(valores)
+        amostra = np.take_along_axis(valores, np.minimum(linhas, len(valores) - 1), axis=0)
+        return np.where(dentro, amostra, 0.0)
+
+    def _acumular_diarios(self, precos: np.ndarray, volumes: np.ndarray):
+        """
+        Somas mensais acumuladas das grandezas diárias dos filtros de liquidez.
+
+        Retornos diários são calculados entre cotações consecutivas de cada
+        ativo, como na série por ativo da etapa 01. Pares com retorno
+        infinito (preço zero) são contados à parte: na etapa 01 eles tornam a
+        autocorrelação NaN (-999).
+
+        Returns:
+            tuple: (somas acumuladas por grandeza, bordas da janela por mês:
+                {'primeira'/'segunda': (linhas, {grandeza: contribuição})})
+        """
+        n_datas = len(precos)
+        linhas = np.arange(n_datas)[:, None]
+        cotado = ~np.isnan(precos)
+
+        # Linha da cotação anterior de cada ativo (-1 se não houver)
+        ultima_cotacao = np.where(cotado, linhas, -1)
+        np.maximum.accumulate(ultima_cotacao, axis=0, out=ultima_cotacao)
+        anterior = np.full_like(ultima_cotacao, -1)
+        anterior[1:] = ultima_cotacao[:-1]
+        tem_anterior = cotado & (anterior >= 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            preco_anterior = np.take_along_axis(precos, np.maximum(anterior, 0), axis=0)
+            retornos = np.where(tem_anterior, precos / preco_anterior - 1, np.nan)
+        retorno_anterior = np.where(tem_anterior, np.take_along_axis(retornos, np.maximum(anterior, 0), axis=0),
+                                    np.nan)
+
+        par = ~np.isnan(retornos) & ~np.isnan(retorno_anterior)
+        finito = par & np.isfinite(retornos) & np.isfinite(retorno_anterior)
+        x = np.where(finito, retornos, 0.0)
+        y = np.where(finito, retorno_anterior, 0.0)
+        volume = np.where(cotado, np.nan_to_num(volumes), 0.0)
+
+        de_retorno = {
+            'n_retornos': ~np.isnan(retornos),
+            'n_sem_retorno': retornos == 0
+        }
+        de_par = {
+            'n_pares': par,
+            'n_pares_nao_finitos': par & ~finito,
+            'sx': x, 'sy': y, 'sxx': x * x, 'syy': y * y, 'sxy': x * y
+        }
+        grandezas = {
+            'n_obs': cotado,
+            'soma_volume': volume,
+            'n_com_volume': cotado & (volume > 0),
+            **de_retorno, **de_par
+        }
+        acumulados = {nome: self._acumular(self._somar_por_mes(valores.astype(np.float64, copy=False)))
+                      for nome, valores in grandezas.items()}
+
+        # A 1ª cotação da janela perde o retorno e o par; a 2ª perde o par
+        primeira, segunda = self._primeiras_cotacoes(cotado)
+        bordas = {
+            'primeira': (primeira, {nome: self._amostrar_linhas(valores.astype(np.float64, copy=False), primeira)
+                                    for nome, valores in {**de_retorno, **de_par}.items()}),
+            'segunda': (segunda, {nome: self._amostrar_linhas(valores.astype(np.float64, copy=False), segunda)
+                                  for nome, valores in de_par.items()})
+        }
+        return acumulados, bordas
+
+    def _acumular_mensais(self, retornos: np.ndarray) -> Dict[str, np.ndarray]:
+        """Somas acumuladas dos retornos mensais usadas nas métricas de performance"""
+        valido = ~np.isnan(retornos)
+        r = np.where(valido, retornos, 0.0)
+        negativo = valido & (retornos < 0)
+        r_negativo = np.where(negativo, retornos, 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_bruto = np.where(valido, np.log1p(r), 0.0)
+
+        grandezas = {
+            'n': valido, 'soma': r, 'soma_quadrados': r * r, 'soma_log': log_bruto,
+            'n_negativos': negativo, 'soma_negativos': r_negativo,
+            'soma_quadrados_negativos': r_negativo * r_negativo
+        }
+        return {nome: self._acumular(valores.astype(np.float64, copy=False))
+                for nome, valores in grandezas.items()}
+
+    # ------------------------------------------------------------------
+    # Seleção em uma data
+    # ------------------------------------------------------------------
+
+    def _janela(self, acumulados: Dict[str, np.ndarray], inicio: int, fim: int) -> Dict[str, np.ndarray]:
+        """Somas de cada grandeza nos meses [inicio, fim)"""
+        return {nome: acumulado[fim] - acumulado[inicio] for nome, acumulado in acumulados.items()}
+
+    def metricas_liquidez(self, mes: int) -> pd.DataFrame:
+        """
+        Métricas de liquidez dos janela_meses meses anteriores ao mês informado.
+
+        Args:
+            mes (int): Índice do mês de rebalanceamento em calendario.rotulos_fim_mes
+
+        Returns:
+            pd.DataFrame: Métricas por ativo (índice = ativo)
+        """
+        inicio = max(mes - self.janela_meses, 0)
+        s = self._janela(self.acumulados_diarios, inicio, mes)
+
+        # Descontar retornos e pares que usam cotações anteriores à janela
+        fim_janela = self.calendario.posicoes_inicio_mes[mes]
+        for linhas, contribuicoes in self.bordas_janela.values():
+            dentro = linhas[inicio] < fim_janela
+            for nome, valores in contribuicoes.items():
+                s[nome] = s[nome] - np.where(dentro, valores[inicio], 0.0)
+
+        # Pregões do ativo no último mês com pregão da janela
+        meses_pregao = np.flatnonzero(self.calendario.meses_com_pregao[:mes])
+        if len(meses_pregao):
+            ultimo = meses_pregao[-1]
+            n_obs = self.acumulados_diarios['n_obs']
+            cotacoes_ultimo_mes = n_obs[ultimo + 1] - n_obs[ultimo]
+        else:
+            cotacoes_ultimo_mes = np.zeros(len(self.ativos))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = s['n_pares']
+            cov = s['sxy'] - s['sx'] * s['sy'] / n
+            var_x = s['sxx'] - s['sx'] ** 2 / n
+            var_y = s['syy'] - s['sy'] ** 2 / n
+            autocorr = np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+            autocorr = np.where((n >= 2) & (s['n_obs'] > 10) & (s['n_pares_nao_finitos'] == 0)
+                                & np.isfinite(autocorr), autocorr, -999)
+
+            return pd.DataFrame({
+                'volume_medio_diario': s['soma_volume'] / s['n_obs'],
+                'presenca_bolsa': s['n_com_volume'] / s['n_obs'],
+                'pct_dias_sem_retorno': s['n_sem_retorno'] / s['n_retornos'],
+                'autocorr_retornos': autocorr,
+                'observacoes_totais': s['n_obs'].astype(np.int64),
+                'cotacoes_ultimo_mes': cotacoes_ultimo_mes.astype(np.int64)
+            }, index=pd.Index(self.ativos, name='ativo'))
+
+    def filtrar_liquidez(self, df_liquidez: pd.DataFrame) -> np.ndarray:
+        """
+        Máscara dos ativos que atendem todos os critérios de liquidez da etapa 01
+        e ainda negociados (com cotação no último mês da janela).
+        """
+        c = self.criterios
+        return np.asarray(
+            (df_liquidez['cotacoes_ultimo_mes'] > 0)
+            & (df_liquidez['observacoes_totais'] >= c['negocios_min_diario'])
+            & (df_liquidez['volume_medio_diario'] >= c['volume_min_diario'])
+            & (df_liquidez['presenca_bolsa'] >= c['presenca_min_bolsa'])
+            & (df_liquidez['pct_dias_sem_retorno'] <= c['zero_return_days_max'])
+            & (df_liquidez['autocorr_retornos'] >= c['autocorr_min'])
+        )
+
+    def metricas_performance(self, mes: int, colunas: np.ndarray) -> pd.DataFrame:
+        """
+        Métricas do Score Composto nos retornos mensais da janela.
+
+        Usa os retornos cujos dois preços estão na janela (meses
+        [mes - janela + 1, mes)); o momentum 12-1 exclui o último mês.
+
+        Args:
+            mes (int): Índice do mês de rebalanceamento
+            colunas (np.ndarray): Posições dos ativos avaliados
+
+        Returns:
+            pd.DataFrame: Uma linha por ativo (coluna 'ativo' + COLUNAS_METRICAS)
+        """
+        inicio = max(mes - self.janela_meses + 1, 0)
+        s = {nome: valor[colunas] for nome, valor in self._janela(self.acumulados_mensais, inicio, mes).items()}
+        momentum = self._janela({'soma_log': self.acumulados_mensais['soma_log']}, max(mes - 12, 0), mes - 1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = s['n']
+            variancia = np.maximum(s['soma_quadrados'] - s['soma'] ** 2 / n, 0) / (n - 1)
+            n_neg = s['n_negativos']
+            variancia_neg = np.maximum(s['soma_quadrados_negativos'] - s['soma_negativos'] ** 2 / n_neg, 0) / (n_neg - 1)
+
+            metricas = {
+                'momentum_12_1': np.where(n >= 12, np.expm1(momentum['soma_log'][colunas]), np.nan),
+                'volatilidade_anual': np.sqrt(variancia) * np.sqrt(12),
+                'max_drawdown': max_drawdown_matriz(self.retornos_mensais[inicio:mes, colunas]),
+                'downside_deviation': np.where(n_neg > 0, np.sqrt(variancia_neg) * np.sqrt(12), 0.0),
+                'retorno_medio_mensal': s['soma'] / n,
+                'observacoes_performance': n.astype(np.int64)
+            }
+
+        tabela = pd.DataFrame(metricas, columns=COLUNAS_METRICAS)
+        tabela.insert(0, 'ativo', self.ativos[colunas])
+        return tabela
+
+    def selecionar_na_data(self, posicao: int) -> pd.DataFrame:
+        """
+        Score Composto dos ativos elegíveis em um pregão de rebalanceamento.
+
+        Args:
+            posicao (int): Linha do pregão em calendario.datas
+
+        Returns:
+            pd.DataFrame: Ativos elegíveis ordenados por score (com ranking_final)
+        """
+        mes = int(np.searchsorted(self.calendario.posicoes_inicio_mes, posicao, side='right') - 1)
+
+        liquidez = self.metricas_liquidez(mes)
+        colunas = np.flatnonzero(self.filtrar_liquidez(liquidez))
+
+        df_scores = self.metricas_performance(mes, colunas)
+        df_scores = df_scores[df_scores['observacoes_performance'] >= 12].dropna().reset_index(drop=True)
+
+        percentis = percentis_metricas(df_scores)
+        df_scores[percentis.columns] = percentis
+        df_scores['score_composto'] = score_composto(percentis, self.pesos)
+
+        df_scores = df_scores.sort_values('score_composto', ascending=False)
+        df_scores['ranking_final'] = range(1, len(df_scores) + 1)
+        df_scores.insert(0, 'data_rebalance', self.calendario.datas[posicao])
+
+        return df_scores
+
+    def executar(self, n_ativos: Optional[int] = None, inicio=None, fim=None) -> pd.DataFrame:
+        """
+        Seleciona o top N em cada rebalanceamento com janela completa.
+
+        Args:
+            n_ativos (int): Ativos por data (None = CONFIG.SELECAO_ROLLING['n_ativos'])
+            inicio, fim: Filtro opcional das datas de rebalanceamento
+
+        Returns:
+            pd.DataFrame: Tabela de composição (data_rebalance, ranking_final,
+                ativo, score_composto e métricas), uma linha por ativo selecionado
+        """
+        n_ativos = n_ativos or self.config.SELECAO_ROLLING['n_ativos']
+
+        posicoes = self.posicoes_rebalance(inicio, fim)
+        selecoes: List[pd.DataFrame] = []
+        for posicao in posicoes:
+            df_scores = self.selecionar_na_data(posicao)
+            selecoes.append(df_scores.head(n_ativos))
+
+            self.logger.info(f"   {self.calendario.datas[posicao].date()}: {len(df_scores)} ativos com score, "
+                             f"top {min(n_ativos, len(df_scores))} selecionados")
+
+        if not selecoes:
+            self.logger.warning("   Nenhuma data de rebalanceamento com janela completa")
+            return pd.DataFrame()
+
+        return pd.concat(selecoes, ignore_index=True)
+
+    def posicoes_rebalance(self, inicio=None, fim=None) -> np.ndarray:
+        """Pregões de rebalanceamento com janela_meses meses de histórico anterior"""
+        posicoes = self.calendario.posicoes_rebalance
+        meses = np.searchsorted(self.calendario.posicoes_inicio_mes, posicoes, side='right') - 1
+        posicoes = posicoes[meses >= self.janela_meses]
+
+        datas = self.calendario.datas[posicoes]
+        manter = np.ones(len(posicoes), dtype=bool)
+        if inicio is not None:
+            manter &= datas >= pd.Timestamp(inicio)
+        if fim is not None:
+            manter &= datas <= pd.Timestamp(fim)
+        return posicoes[manter]
+
+    @staticmethod
+    def matriz_membros(membros: pd.DataFrame) -> pd.DataFrame:
+        """
+        Composição em formato largo: datas de rebalanceamento x ativos (booleano).
+
+        Args:
+            membros (pd.DataFrame): Saída de executar
+
+        Returns:
+            pd.DataFrame: True onde o ativo pertence à seleção da data
+        """
+        return pd.crosstab(membros['data_rebalance'], membros['ativo']).astype(bool)
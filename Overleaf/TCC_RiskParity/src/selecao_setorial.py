@@ -0,0 +1,242 @@
+"""
+SELEÇÃO COM RESTRIÇÕES SETORIAIS - TCC Risk Parity v2.0
+Top N por Score Composto respeitando CONFIG.WEIGHT_CONSTRAINTS por setor.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Seleção top N com limites setoriais
+
+Restrições (carteira de pesos iguais entre os N selecionados):
+- Teto por setor: no máximo floor(peso_setor_max * N) ativos do mesmo setor
+- Piso de diversificação: pelo menos setores_min setores distintos
+- Ativos fora do cadastro (setor_ausente) não têm teto nem contam como setor
+
+Funcionalidades:
+- Mapa ativo → setor a partir do cadastro da Economática (CONFIG.SETORES)
+- Passagem gulosa única com um heap limitado por setor: O(A log N) sobre
+  todo o universo, sem ordenar os A ativos
+- Reparo do piso de setores trocando o pior ativo de um setor repetido
+  pelo melhor ativo de um setor ausente
+- Folga de cada setor em relação ao teto e do conjunto em relação ao piso
+"""
+
+import heapq
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+# Mapas já lidos neste processo: {caminho: {ativo: setor}}
+_MAPAS_SETORES: Dict[str, Dict[str, str]] = {}
+
+
+def carregar_mapa_setores(caminho: Optional[Path] = None) -> Dict[str, str]:
+    """
+    Mapa ativo → setor do cadastro de ativos da Economática.
+
+    Args:
+        caminho (Path): Export do cadastro (None = CONFIG.SETORES['arquivo'] em data/DataBase)
+
+    Returns:
+        dict: {código do ativo: setor}
+    """
+    config = get_config()
+    parametros = config.SETORES
+    caminho = Path(caminho) if caminho is not None else config.data_dir / parametros['arquivo']
+
+    if str(caminho) not in _MAPAS_SETORES:
+        if not caminho.exists():
+            raise FileNotFoundError(f"Cadastro setorial não encontrado: {caminho}")
+
+        df = pd.read_excel(caminho, header=parametros['linha_cabecalho'])
+        # Cabeçalhos do export quebram linha ('Setor Econômico\nBovespa')
+        df.columns = [' '.join(str(coluna).split()) for coluna in df.columns]
+
+        df = df.dropna(subset=[parametros['coluna_codigo']])
+        codigos = df[parametros['coluna_codigo']].astype(str).str.strip()
+        setores = df[parametros['coluna_setor']].fillna(parametros['setor_ausente']).astype(str).str.strip()
+        _MAPAS_SETORES[str(caminho)] = dict(zip(codigos, setores))
+
+    return _MAPAS_SETORES[str(caminho)]
+
+
+def limite_por_setor(n_ativos: int, peso_setor_max: float) -> int:
+    """Número máximo de ativos por setor (pelo menos 1)"""
+    return max(1, int(np.floor(peso_setor_max * n_ativos + 1e-9)))
+
+
+def _n_setores_distintos(contagem: Counter, setor_ausente: str) -> int:
+    """Setores com ao menos um ativo selecionado (sem contar setor_ausente)"""
+    return sum(1 for setor, n in contagem.items() if n > 0 and setor != setor_ausente)
+
+
+def _escolher_com_setores(ativos, scores, setores: Dict[str, str], n_ativos: int, limite: int,
+                          setores_min: int, setor_ausente: str):
+    """
+    Núcleo de selecionar_com_setores, sem folgas nem log.
+
+    Returns:
+        tuple: (escolhidos [((score, -posição, ativo), setor)] em ordem
+            decrescente, contagem por setor, candidatos por setor, trocas de reparo)
+    """
+    def capacidade(setor):
+        return n_ativos if setor == setor_ausente else limite
+
+    # 1. Passagem única: min-heap com os `limite` melhores de cada setor.
+    #    Ativos fora desses heaps nunca cabem na seleção (teto setorial).
+    #    Item: (score, -posição, ativo) → maior item = melhor ativo
+    melhores_setor: Dict[str, list] = {}
+    candidatos_setor: Counter = Counter()
+    for posicao, (ativo, score) in enumerate(zip(ativos, scores)):
+        if score is None or score != score:  # NaN
+            continue
+        setor = setores.get(ativo, setor_ausente)
+        candidatos_setor[setor] += 1
+        item = (float(score), -posicao, ativo)
+        heap = melhores_setor.setdefault(setor, [])
+        if len(heap) < capacidade(setor):
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    # 2. Guloso: top N entre os candidatos (qualquer subconjunto respeita o teto)
+    candidatos = [(item, setor) for setor, heap in melhores_setor.items() for item in heap]
+    escolhidos = heapq.nlargest(n_ativos, candidatos)
+    contagem = Counter(setor for _, setor in escolhidos)
+
+    # 3. Reparo do piso: pior ativo de setor repetido ↔ melhor ativo de setor ausente
+    trocas = 0
+    if _n_setores_distintos(contagem, setor_ausente) < setores_min:
+        # Setores ausentes (no máximo um por setor) do melhor para o pior
+        ausentes = sorted(((max(heap), setor) for setor, heap in melhores_setor.items()
+                           if setor not in contagem and setor != setor_ausente), reverse=True)
+        removiveis = [(item, setor) for item, setor in escolhidos]
+        heapq.heapify(removiveis)
+        selecionados = set(item for item, _ in escolhidos)
+
+        while _n_setores_distintos(contagem, setor_ausente) < setores_min and ausentes and removiveis:
+            item_saida, setor_saida = heapq.heappop(removiveis)
+            if contagem[setor_saida] <= 1 and setor_saida != setor_ausente:
+                continue  # Remover reduziria o número de setores
+            item_entrada, setor_entrada = ausentes.pop(0)
+
+            selecionados.discard(item_saida)
+            selecionados.add(item_entrada)
+            contagem[setor_saida] -= 1
+            contagem[setor_entrada] = 1
+            trocas += 1
+
+        setor_item = {item: setor for setor, heap in melhores_setor.items() for item in heap}
+        escolhidos = [(item, setor_item[item]) for item in selecionados]
+
+    escolhidos.sort(reverse=True)
+    return escolhidos, contagem, candidatos_setor, trocas
+
+
+def selecionar_com_setores(ativos, scores, setores: Dict[str, str], n_ativos: int = 10,
+                           peso_setor_max: Optional[float] = None, setores_min: Optional[int] = None,
+                           setor_ausente: Optional[str] = None) -> Dict:
+    """
+    Os N ativos de maior score sujeitos ao teto por setor e ao piso de setores.
+
+    Empates de score favorecem o ativo que aparece antes em `ativos`.
+
+    Args:
+        ativos (sequence): Códigos dos ativos
+        scores (sequence): Score Composto de cada ativo (NaN = inelegível)
+        setores (dict): Mapa ativo → setor
+        n_ativos (int): Tamanho da seleção
+        peso_setor_max (float): Peso máximo por setor (None = CONFIG.WEIGHT_CONSTRAINTS)
+        setores_min (int): Mínimo de setores distintos (None = CONFIG.WEIGHT_CONSTRAINTS)
+        setor_ausente (str): Setor dos ativos fora do mapa (None = CONFIG.SETORES)
+
+    Returns:
+        dict: 'ativos' (em ordem decrescente de score), 'setores' (ativo → setor),
+            'folgas' (uma linha por setor), 'n_setores', 'folga_setores_min',
+            'limite_por_setor', 'trocas_reparo' e 'viavel'
+    """
+    logger = get_logger(__name__)
+    config = get_config()
+    restricoes = config.WEIGHT_CONSTRAINTS
+    peso_setor_max = restricoes['peso_setor_max'] if peso_setor_max is None else peso_setor_max
+    setores_min = restricoes['setores_min'] if setores_min is None else setores_min
+    setor_ausente = config.SETORES['setor_ausente'] if setor_ausente is None else setor_ausente
+
+    limite = limite_por_setor(n_ativos, peso_setor_max)
+
+    escolhidos, contagem, candidatos_setor, trocas = _escolher_com_setores(
+        ativos, scores, setores, n_ativos, limite, setores_min, setor_ausente)
+    selecao = [item[2] for item, _ in escolhidos]
+    setores_selecao = {item[2]: setor for item, setor in escolhidos}
+
+    n_setores = _n_setores_distintos(contagem, setor_ausente)
+    viavel = n_setores >= setores_min and len(selecao) == n_ativos
+    if len(selecao) < n_ativos:
+        logger.warning(f"   Teto setorial ({limite} por setor) permite apenas {len(selecao)} de {n_ativos} ativos")
+    if n_setores < setores_min:
+        logger.warning(f"   Piso de setores inviável: {n_setores} setores disponíveis (mínimo {setores_min})")
+
+    # Folgas por setor (teto em número de ativos e em peso igual)
+    folgas = pd.DataFrame({
+        'setor': list(candidatos_setor),
+        'candidatos': list(candidatos_setor.values())
+    })
+    folgas['selecionados'] = folgas['setor'].map(contagem).fillna(0).astype(int)
+    folgas['limite_ativos'] = np.where(folgas['setor'] == setor_ausente, n_ativos, limite)
+    folgas['folga_ativos'] = folgas['limite_ativos'] - folgas['selecionados']
+    folgas['peso'] = folgas['selecionados'] / max(len(selecao), 1)
+    folgas['folga_peso'] = np.where(folgas['setor'] == setor_ausente, np.nan,
+                                    peso_setor_max - folgas['peso'])
+    folgas = folgas.sort_values(['selecionados', 'candidatos'], ascending=False).reset_index(drop=True)
+
+    return {
+        'ativos': selecao,
+        'setores': setores_selecao,
+        'folgas': folgas,
+        'n_setores': n_setores,
+        'folga_setores_min': n_setores - setores_min,
+        'limite_por_setor': limite,
+        'trocas_reparo': trocas,
+        'viavel': viavel
+    }
+
+
+def posicoes_top_n(ativos, scores, n_ativos: int = 10,
+                   setores: Optional[Dict[str, str]] = None) -> np.ndarray:
+    """
+    Posições em `ativos` da seleção da etapa 01 para um vetor de scores.
+
+    Mesma regra de selecionar_top_ativos: top N em ordem decrescente de score,
+    empates pela posição em `ativos` e, com mapa de setores, os limites de
+    CONFIG.WEIGHT_CONSTRAINTS. Sem folgas nem log, para chamadas em lote.
+
+    Args:
+        ativos (sequence): Códigos dos ativos
+        scores (sequence): Score Composto de cada ativo
+        n_ativos (int): Tamanho da seleção
+        setores (dict): Mapa ativo → setor (None = top N sem restrições)
+
+    Returns:
+        np.ndarray: Posições selecionadas em ordem decrescente de score
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if setores is None:
+        return np.argsort(-scores, kind='stable')[:n_ativos]
+
+    config = get_config()
+    restricoes = config.WEIGHT_CONSTRAINTS
+    escolhidos, _, _, _ = _escolher_com_setores(
+        ativos, scores, setores, n_ativos, limite_por_setor(n_ativos, restricoes['peso_setor_max']),
+        restricoes['setores_min'], config.SETORES['setor_ausente'])
+    return np.array([-item[1] for item, _ in escolhidos], dtype=np.int64)
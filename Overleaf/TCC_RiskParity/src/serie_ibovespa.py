@@ -0,0 +1,217 @@
+"""
+SÉRIE BENCHMARK IBOVESPA - TCC Risk Parity v2.0
+Parser vetorizado das grades Evolucao_Diaria.csv e retornos mensais do benchmark.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Benchmark IBOVESPA
+
+Formato de entrada (uma grade por ano):
+    IBOVESPA - 2019
+    Day;Jan;Feb;...;Dec
+    1;;97,861.28;...        (separador ';', milhar ',', decimal '.')
+    ...
+    31;...
+    LOWEST;...
+    HIGHEST;...
+
+Funcionalidades:
+- Conversão de uma ou mais grades anuais em série diária longa e ordenada
+- Retornos mensais alinhados ao índice de 02_retornos_mensais_2018_2019.csv
+- Métricas relativas ao benchmark (retorno ativo, tracking error, IR, beta)
+- Cache em disco (Parquet) com chave no hash dos arquivos de origem
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from cache_economatica import calcular_hash_arquivo
+from calendario_negociacao import CalendarioNegociacao
+
+MESES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Memo por processo: {chave: série diária}
+_SERIES_CARREGADAS: Dict[str, pd.Series] = {}
+
+
+def ler_grade_evolucao_diaria(caminho) -> pd.Series:
+    """
+    Converte uma grade anual (dia x mês) em série diária de fechamentos.
+
+    Args:
+        caminho (Path): Arquivo Evolucao_Diaria*.csv
+
+    Returns:
+        pd.Series: Fechamentos indexados por data (apenas pregões)
+    """
+    caminho = Path(caminho)
+    with open(caminho, 'r', encoding='utf-8-sig') as f:
+        titulo = f.readline()
+
+    ano_encontrado = re.search(r'(\d{4})', titulo)
+    if ano_encontrado is None:
+        raise ValueError(f"Ano não encontrado no título da grade: {titulo.strip()!r}")
+    ano = int(ano_encontrado.group(1))
+
+    grade = pd.read_csv(caminho, sep=';', skiprows=1, thousands=',', decimal='.',
+                        skip_blank_lines=True, dtype={'Day': str})
+
+    # Apenas linhas de dias (descarta LOWEST/HIGHEST)
+    dias = pd.to_numeric(grade['Day'], errors='coerce')
+    grade = grade[dias.between(1, 31)]
+    dias = dias[dias.between(1, 31)].to_numpy(dtype=int)
+
+    valores = grade[MESES].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+    # Produto dia x mês em forma longa
+    dia_longo = np.repeat(dias, len(MESES))
+    mes_longo = np.tile(np.arange(1, 13), len(dias))
+    valor_longo = valores.ravel()
+
+    datas = pd.to_datetime(
+        pd.DataFrame({'year': ano, 'month': mes_longo, 'day': dia_longo}),
+        errors='coerce'
+    )
+
+    validos = datas.notna().to_numpy() & ~np.isnan(valor_longo)
+    serie = pd.Series(valor_longo[validos], index=pd.DatetimeIndex(datas[validos]), name='IBOVESPA')
+    return serie.sort_index()
+
+
+class SerieBenchmarkIbovespa:
+    """
+    Série diária do IBOVESPA montada a partir das grades anuais, com cache.
+    """
+
+    def __init__(self, arquivos: Optional[List] = None):
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+
+        if arquivos is None:
+            arquivos = sorted(self.config.data_dir.glob("Evolucao_Diaria*.csv"))
+        self.arquivos = [Path(a) for a in arquivos]
+
+        if not self.arquivos:
+            raise FileNotFoundError(f"Nenhuma grade Evolucao_Diaria*.csv em {self.config.data_dir}")
+
+    def _chave(self) -> str:
+        """Chave do cache a partir do conteúdo de todos os arquivos"""
+        hashes = sorted(calcular_hash_arquivo(a) for a in self.arquivos)
+        return hashlib.sha256('|'.join(hashes).encode('utf-8')).hexdigest()
+
+    def carregar(self) -> pd.Series:
+        """
+        Retorna a série diária (memo do processo → cache Parquet → parse).
+
+        Em datas repetidas entre arquivos vale o arquivo lido por último.
+
+        Returns:
+            pd.Series: Fechamentos diários do IBOVESPA ordenados por data
+        """
+        chave = self._chave()
+        if chave in _SERIES_CARREGADAS:
+            return _SERIES_CARREGADAS[chave]
+
+        caminho_cache = self.config.cache_dir / f"ibovespa_{chave[:16]}.parquet"
+        serie = None
+        if caminho_cache.exists():
+            try:
+                serie = pd.read_parquet(caminho_cache)['IBOVESPA']
+            except Exception as e:
+                self.logger.warning(f"   Cache IBOVESPA ilegível, reprocessando: {e}")
+
+        if serie is None:
+            serie = pd.concat([ler_grade_evolucao_diaria(a) for a in self.arquivos])
+            serie = serie[~serie.index.duplicated(keep='last')].sort_index()
+            serie.index.name = 'Date'
+            try:
+                serie.to_frame().to_parquet(caminho_cache)
+            except ImportError as e:
+                self.logger.warning(f"   Cache Parquet indisponível (instale pyarrow): {e}")
+
+            self.logger.info(f"   IBOVESPA: {len(serie)} pregões de {len(self.arquivos)} grades "
+                             f"({serie.index[0].date()} a {serie.index[-1].date()})")
+
+        _SERIES_CARREGADAS[chave] = serie
+        return serie
+
+    def retornos_mensais(self, indice_mensal=None) -> pd.Series:
+        """
+        Retornos mensais do benchmark (último fechamento de cada mês).
+
+        Os fechamentos são amostrados com CalendarioNegociacao.amostrar_fim_mes,
+        a mesma regra das demais etapas: um mês sem pregão fica NaN e anula
+        também o retorno do mês seguinte, em vez de ser absorvido nele.
+
+        Args:
+            indice_mensal (DatetimeIndex): Índice de fim de mês para alinhamento
+                (None = índice de 02_retornos_mensais_2018_2019.csv)
+
+        Returns:
+            pd.Series: Retornos mensais alinhados ao índice (NaN sem dado)
+        """
+        if indice_mensal is None:
+            retornos_ativos = pd.read_csv(
+                self.config.results_dir / "02_retornos_mensais_2018_2019.csv",
+                index_col=0, parse_dates=True
+            )
+            indice_mensal = retornos_ativos.index
+
+        serie = self.carregar()
+
+        fechamentos = CalendarioNegociacao(serie.index).amostrar_fim_mes(serie)
+        retornos = fechamentos.pct_change(fill_method=None)
+        retornos.index = retornos.index.to_period('M')
+
+        indice_mensal = pd.DatetimeIndex(indice_mensal)
+        alinhados = retornos.reindex(indice_mensal.to_period('M'))
+        alinhados.index = indice_mensal
+        alinhados.name = 'IBOVESPA'
+
+        return alinhados
+
+
+def metricas_relativas(retornos: pd.Series, benchmark: pd.Series) -> Dict[str, float]:
+    """
+    Métricas de uma carteira em relação ao benchmark (retornos mensais).
+
+    Usa apenas os meses com retorno da carteira e do benchmark.
+
+    Args:
+        retornos (pd.Series): Retornos mensais da carteira
+        benchmark (pd.Series): Retornos mensais do benchmark no mesmo índice
+
+    Returns:
+        dict: retorno_ativo_anual, tracking_error_anual, information_ratio,
+            beta e n_meses
+    """
+    pares = pd.concat([retornos, benchmark], axis=1).dropna()
+    carteira, mercado = pares.iloc[:, 0], pares.iloc[:, 1]
+    ativo = carteira - mercado
+
+    retorno_ativo_anual = ativo.mean() * 12
+    tracking_error_anual = ativo.std() * np.sqrt(12)
+    variancia_mercado = mercado.var()
+
+    return {
+        'retorno_ativo_anual': retorno_ativo_anual,
+        'tracking_error_anual': tracking_error_anual,
+        'information_ratio': (retorno_ativo_anual / tracking_error_anual
+                              if tracking_error_anual > 0 else np.nan),
+        'beta': carteira.cov(mercado) / variancia_mercado if variancia_mercado > 0 else np.nan,
+        'n_meses': len(pares)
+    }
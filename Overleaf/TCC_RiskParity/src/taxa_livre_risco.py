@@ -0,0 +1,237 @@
+"""
+TAXA LIVRE DE RISCO (CDI) - TCC Risk Parity v2.0
+Série diária do CDI composta para qualquer frequência de calendário.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Taxa livre de risco variável no tempo
+
+Arquivo de entrada (data/DataBase, CONFIG.TAXA_LIVRE_RISCO['arquivo_cdi']):
+    data;valor
+    02/01/2018;0,026444        (formato SGS/BCB série 12: % ao dia)
+
+Funcionalidades:
+- Série diária lida uma vez, com cache Parquet e memo por processo
+- Composição para qualquer índice de datas (ex.: fins de mês) com uma única
+  soma agrupada de log(1 + r)
+- Excesso de retorno por broadcast contra séries e matrizes de retornos
+- Sem arquivo de CDI: taxa mensal constante de CONFIG.TAXA_LIVRE_RISCO['mensal']
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    # O arquivo chama-se 00_configuracao_global.py (nome de módulo inválido):
+    # carregar pelo caminho e registrar para os demais módulos da pasta
+    import importlib.util
+    import sys
+    spec = importlib.util.spec_from_file_location(
+        "_00_configuracao_global", Path(__file__).parent / "00_configuracao_global.py")
+    _configuracao_global = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = _configuracao_global
+    spec.loader.exec_module(_configuracao_global)
+    get_logger, get_config = _configuracao_global.get_logger, _configuracao_global.get_config
+
+from cache_economatica import calcular_hash_arquivo
+
+# Instâncias do processo: {caminho absoluto ou None (constante): TaxaLivreRisco}
+_TAXAS: Dict[Optional[Path], 'TaxaLivreRisco'] = {}
+
+
+def ler_cdi_diario(caminho) -> pd.Series:
+    """
+    Lê a série diária do CDI (% ao dia) e converte para taxa decimal.
+
+    Args:
+        caminho (Path): CSV com colunas de data e valor (sep ';', decimal ',')
+
+    Returns:
+        pd.Series: Taxa diária decimal indexada por data (ordenada, sem duplicatas)
+    """
+    df = pd.read_csv(caminho, sep=';', decimal=',')
+    if df.shape[1] < 2:
+        df = pd.read_csv(caminho, sep=',')
+
+    datas = pd.to_datetime(df.iloc[:, 0], dayfirst=True, errors='coerce')
+    valores = pd.to_numeric(df.iloc[:, 1], errors='coerce')
+
+    validos = datas.notna() & valores.notna()
+    serie = pd.Series(valores[validos].to_numpy() / 100.0,
+                      index=pd.DatetimeIndex(datas[validos]), name='CDI')
+    serie.index.name = 'Date'
+
+    serie = serie[~serie.index.duplicated(keep='last')]
+    return serie.sort_index()
+
+
+class TaxaLivreRisco:
+    """
+    Taxa livre de risco do estudo (CDI diário ou constante mensal da configuração).
+
+    Uso típico:
+        rf = obter_taxa_livre_risco()
+        rf_mensal = rf.alinhar(retornos.index)   # Série por período do índice
+        excesso = rf.excesso(retornos)           # retornos - rf (broadcast por linha)
+    """
+
+    def __init__(self, caminho=None):
+        """
+        Args:
+            caminho (Path): CSV diário do CDI (None = sem arquivo, taxa constante)
+        """
+        self.logger = get_logger(__name__)
+        self.config = get_config()
+        self.caminho = Path(caminho) if caminho is not None else None
+        self.taxa_mensal_constante = self.config.TAXA_LIVRE_RISCO['mensal']
+        self._diaria: Optional[pd.Series] = None
+
+    @property
+    def constante(self) -> bool:
+        """True quando não há série diária (taxa mensal fixa da configuração)"""
+        return self.caminho is None
+
+    def diaria(self) -> Optional[pd.Series]:
+        """
+        Série diária decimal do CDI (memo → cache Parquet → CSV).
+
+        Returns:
+            pd.Series ou None: Taxas diárias, ou None no modo constante
+        """
+        if self.constante:
+            return None
+        if self._diaria is not None:
+            return self._diaria
+
+        chave = calcular_hash_arquivo(self.caminho)
+        caminho_cache = self.config.cache_dir / f"cdi_{chave[:16]}.parquet"
+
+        serie = None
+        if caminho_cache.exists():
+            try:
+                serie = pd.read_parquet(caminho_cache)['CDI']
+            except Exception as e:
+                self.logger.warning(f"   Cache do CDI ilegível, reprocessando: {e}")
+
+        if serie is None:
+            serie = ler_cdi_diario(self.caminho)
+            try:
+                serie.to_frame().to_parquet(caminho_cache)
+            except ImportError as e:
+                self.logger.warning(f"   Cache Parquet indisponível (instale pyarrow): {e}")
+            self.logger.info(f"   CDI diário: {len(serie)} dias ({serie.index[0].date()} a "
+                             f"{serie.index[-1].date()})")
+
+        self._diaria = serie
+        return serie
+
+    @staticmethod
+    def _limite_inicial(indice: pd.DatetimeIndex) -> pd.Timestamp:
+        """Limite inferior (exclusivo) do primeiro período do índice"""
+        frequencia = indice.freq or (pd.infer_freq(indice) if len(indice) >= 3 else None)
+        if frequencia is not None:
+            return indice[0] - pd.tseries.frequencies.to_offset(frequencia)
+        if len(indice) >= 2:
+            return indice[0] - (indice[1] - indice[0])
+        return indice[0] - pd.offsets.MonthEnd()
+
+    def compor(self, indice) -> pd.Series:
+        """
+        Taxa composta em cada período (rótulo[k-1], rótulo[k]] do índice.
+
+        Os dias são atribuídos aos períodos por busca binária e compostos com
+        uma única soma agrupada: exp(soma de log(1 + r_d)) - 1. Períodos sem
+        nenhum dia de CDI ficam NaN.
+
+        Args:
+            indice (DatetimeIndex): Rótulos de fim de período (ordenados)
+
+        Returns:
+            pd.Series: Taxa composta por período, indexada pelo índice
+        """
+        indice = pd.DatetimeIndex(indice)
+        diaria = self.diaria()
+
+        bordas = np.concatenate([[self._limite_inicial(indice).to_datetime64()], indice.values])
+        periodo = np.searchsorted(bordas, diaria.index.values, side='left') - 1
+        dentro = (periodo >= 0) & (periodo < len(indice))
+
+        soma_log = np.bincount(periodo[dentro], weights=np.log1p(diaria.to_numpy()[dentro]),
+                               minlength=len(indice))
+        dias = np.bincount(periodo[dentro], minlength=len(indice))
+
+        composta = np.where(dias > 0, np.expm1(soma_log), np.nan)
+        return pd.Series(composta, index=indice, name='RF')
+
+    def alinhar(self, indice) -> pd.Series:
+        """
+        Taxa livre de risco por período de um índice de retornos.
+
+        Sem série diária, todos os períodos recebem a taxa mensal constante
+        (índices mensais). Períodos fora da cobertura do arquivo de CDI
+        também recebem a constante, com aviso no log.
+
+        Args:
+            indice (DatetimeIndex): Índice dos retornos (ex.: fins de mês)
+
+        Returns:
+            pd.Series: Taxa por período alinhada ao índice
+        """
+        indice = pd.DatetimeIndex(indice)
+        if self.constante:
+            return pd.Series(self.taxa_mensal_constante, index=indice, name='RF')
+
+        taxa = self.compor(indice)
+        faltando = taxa.isna()
+        if faltando.any():
+            self.logger.warning(f"   CDI sem cobertura em {int(faltando.sum())} períodos; "
+                                f"usando taxa constante {self.taxa_mensal_constante:.4f}")
+            taxa = taxa.fillna(self.taxa_mensal_constante)
+        return taxa
+
+    def excesso(self, retornos):
+        """
+        Retornos em excesso à taxa livre de risco (broadcast por linha).
+
+        Args:
+            retornos (pd.Series ou pd.DataFrame): Retornos indexados por data
+
+        Returns:
+            Mesmo tipo de retornos: retornos - rf do período
+        """
+        taxa = self.alinhar(retornos.index)
+        if isinstance(retornos, pd.DataFrame):
+            return retornos.sub(taxa, axis=0)
+        return retornos - taxa
+
+    def media_mensal(self, indice) -> float:
+        """Taxa média por período no índice (resumo escalar para relatórios)"""
+        return float(self.alinhar(indice).mean())
+
+
+def obter_taxa_livre_risco(caminho=None) -> TaxaLivreRisco:
+    """
+    Retorna a instância do processo da taxa livre de risco.
+
+    Args:
+        caminho (Path): CSV diário do CDI (None = CONFIG.TAXA_LIVRE_RISCO['arquivo_cdi']
+            em data/DataBase; se o arquivo não existir, taxa constante)
+
+    Returns:
+        TaxaLivreRisco: Instância compartilhada
+    """
+    if caminho is None:
+        config = get_config()
+        padrao = config.data_dir / config.TAXA_LIVRE_RISCO['arquivo_cdi']
+        caminho = padrao if padrao.exists() else None
+
+    chave = Path(caminho).resolve() if caminho is not None else None
+    if chave not in _TAXAS:
+        _TAXAS[chave] = TaxaLivreRisco(chave)
+    return _TAXAS[chave]
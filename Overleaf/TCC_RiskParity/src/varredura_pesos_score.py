@@ -0,0 +1,224 @@
+"""
+VARREDURA DE PESOS DO SCORE COMPOSTO - TCC Risk Parity v2.0
+Estabilidade da seleção top N sob milhares de ponderações alternativas.
+
+Autor: Bruno Gasparoni Ballerini
+Data: 2026-10-16
+Versão: 2.1 - Varredura matricial de pesos
+
+Funcionalidades:
+- Ponderações em grade regular do simplex ou sorteadas de uma Dirichlet
+- Todos os scores de uma vez em uma matriz (ativos x K), com os termos somados
+  na mesma ordem de score_composto (empates idênticos aos da etapa 01)
+- Seleção de cada ponderação pela regra da etapa 01 (posicoes_top_n: empates
+  pela ordem dos ativos e limites setoriais quando há cadastro de setores)
+- Sobreposição e índice de Jaccard de cada seleção contra a da ponderação
+  base (CONFIG.SCORE_WEIGHTS), frequência de seleção por ativo e correlação
+  de ranks com o score base
+- Sorteios com gerador próprio semeado (CONFIG.SEED): o resultado não depende
+  de quantos números o gerador compartilhado do processo já produziu
+"""
+
+from itertools import combinations
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Importar configuração global
+try:
+    from _00_configuracao_global import get_logger, get_config
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from _00_configuracao_global import get_logger, get_config
+
+from metricas_selecao import PESOS_RANK, percentis_metricas
+from selecao_setorial import carregar_mapa_setores, posicoes_top_n
+
+
+def grade_simplex(passo: float = 0.05) -> np.ndarray:
+    """
+    Todas as ponderações de 4 pesos múltiplos de passo que somam 1.
+
+    Args:
+        passo (float): Espaçamento da grade (1/passo deve ser inteiro)
+
+    Returns:
+        np.ndarray: Ponderações (K x 4) na ordem de PESOS_RANK
+    """
+    divisoes = int(round(1 / passo))
+    n_pesos = len(PESOS_RANK)
+
+    # Estrelas e barras: posições das 3 barras entre divisoes + 3 casas
+    barras = np.array(list(combinations(range(divisoes + n_pesos - 1), n_pesos - 1)))
+    limites = np.column_stack([np.full(len(barras), -1), barras,
+                               np.full(len(barras), divisoes + n_pesos - 1)])
+    return (np.diff(limites, axis=1) - 1) / divisoes
+
+
+def pesos_dirichlet(n_pesos: int, alpha: float = 1.0, rng=None) -> np.ndarray:
+    """
+    Ponderações sorteadas de uma Dirichlet simétrica (alpha = 1: uniforme no simplex).
+
+    Args:
+        n_pesos (int): Número de ponderações K
+        alpha (float): Concentração
+        rng (np.random.Generator): Gerador (None = novo gerador com CONFIG.SEED)
+
+    Returns:
+        np.ndarray: Ponderações (K x 4) na ordem de PESOS_RANK
+    """
+    rng = rng if rng is not None else np.random.default_rng(get_config().SEED)
+    return rng.dirichlet(np.full(len(PESOS_RANK), alpha), size=n_pesos)
+
+
+def vetor_pesos(pesos: Dict) -> np.ndarray:
+    """Dicionário no formato de CONFIG.SCORE_WEIGHTS → vetor na ordem de PESOS_RANK"""
+    return np.array([pesos[chave] for chave in PESOS_RANK], dtype=np.float64)
+
+
+def _somar_termos(percentis: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    """Scores (ativos x K): soma de peso x percentil na ordem de PESOS_RANK"""
+    scores = percentis[:, [0]] * pesos[:, 0]
+    for j in range(1, pesos.shape[1]):
+        scores = scores + percentis[:, [j]] * pesos[:, j]
+    return scores
+
+
+def _ranks_colunas(valores: np.ndarray) -> np.ndarray:
+    """Ranks ordinais (0..n-1) de cada coluna"""
+    ranks = np.empty_like(valores, dtype=np.float64)
+    ordem = np.argsort(valores, axis=0, kind='stable')
+    np.put_along_axis(ranks, ordem, np.arange(len(valores), dtype=np.float64)[:, None], axis=0)
+    return ranks
+
+
+def varrer_pesos(df_metricas: pd.DataFrame, pesos: np.ndarray, n_ativos: int = 10,
+                 pesos_base: Optional[Dict] = None, setores: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Seleção top N para cada ponderação e estabilidade contra a base.
+
+    Args:
+        df_metricas (pd.DataFrame): Métricas de performance por ativo (coluna 'ativo')
+        pesos (np.ndarray): Ponderações (K x 4) na ordem de PESOS_RANK
+        n_ativos (int): Tamanho da seleção
+        pesos_base (dict): Ponderação de referência (None = CONFIG.SCORE_WEIGHTS)
+        setores (dict): Mapa ativo → setor (None = top N sem restrições setoriais)
+
+    Returns:
+        dict: 'resumo' (uma linha por ponderação: pesos, sobreposição, Jaccard,
+            correlação de ranks e top N), 'frequencia' (fração das ponderações
+            em que cada ativo é selecionado), 'selecao_base' e 'estatisticas'
+    """
+    pesos = np.atleast_2d(np.asarray(pesos, dtype=np.float64))
+    base = vetor_pesos(pesos_base or get_config().SCORE_WEIGHTS)
+
+    ativos = df_metricas['ativo'].to_numpy(dtype=object)
+    percentis = percentis_metricas(df_metricas)[list(PESOS_RANK.values())].to_numpy(dtype=np.float64)
+    n_ativos = min(n_ativos, len(ativos))
+
+    # Todos os scores de uma vez (ativos x K), termo a termo como score_composto:
+    # um produto matricial somaria em outra ordem e desfaria empates da etapa 01
+    scores = _somar_termos(percentis, pesos)
+    score_base = _somar_termos(percentis, base[None, :])[:, 0]
+
+    # Seleção da etapa 01 para cada ponderação (com teto setorial pode ter menos de N)
+    top = [posicoes_top_n(ativos, scores[:, k], n_ativos, setores) for k in range(len(pesos))]
+    top_base = posicoes_top_n(ativos, score_base, n_ativos, setores)
+
+    membros = np.zeros((len(pesos), len(ativos)), dtype=bool)
+    for k, posicoes in enumerate(top):
+        membros[k, posicoes] = True
+    na_base = np.zeros(len(ativos), dtype=bool)
+    na_base[top_base] = True
+
+    sobreposicao = membros.astype(np.int64) @ na_base.astype(np.int64)
+    jaccard = sobreposicao / (membros.sum(axis=1) + len(top_base) - sobreposicao)
+
+    # Correlação de Spearman entre cada score e o score base
+    ranks = _ranks_colunas(scores)
+    ranks_base = _ranks_colunas(score_base[:, None])[:, 0]
+    desvio = ranks - ranks.mean(axis=0)
+    desvio_base = ranks_base - ranks_base.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlacao = (desvio_base @ desvio) / np.sqrt((desvio_base ** 2).sum() * (desvio ** 2).sum(axis=0))
+
+    resumo = pd.DataFrame(pesos, columns=[f'peso_{chave}' for chave in PESOS_RANK])
+    resumo['sobreposicao'] = sobreposicao
+    resumo['jaccard'] = jaccard
+    resumo['identica_base'] = jaccard == 1
+    resumo['correlacao_ranks'] = correlacao
+    resumo['ativos'] = [';'.join(ativos[posicoes]) for posicoes in top]
+
+    frequencia = pd.Series(membros.mean(axis=0), index=ativos, name='frequencia_selecao')
+
+    estatisticas = {
+        'n_ponderacoes': int(len(pesos)),
+        'n_ativos_universo': int(len(ativos)),
+        'n_ativos_selecionados': int(n_ativos),
+        'jaccard_medio': float(jaccard.mean()),
+        'jaccard_mediano': float(np.median(jaccard)),
+        'jaccard_p05': float(np.percentile(jaccard, 5)),
+        'jaccard_min': float(jaccard.min()),
+        'pct_identica_base': float((jaccard == 1).mean()),
+        'sobreposicao_media': float(sobreposicao.mean()),
+        'correlacao_ranks_media': float(np.nanmean(correlacao)),
+        'ativos_sempre_selecionados': frequencia.index[frequencia == 1].tolist(),
+        'ativos_base_frequencia_min': float(frequencia[ativos[top_base]].min())
+    }
+
+    return {
+        'resumo': resumo,
+        'frequencia': frequencia.sort_values(ascending=False),
+        'selecao_base': ativos[top_base].tolist(),
+        'estatisticas': estatisticas
+    }
+
+
+def executar_varredura(df_metricas: pd.DataFrame, modo: str = 'dirichlet', n_pesos: int = 10_000,
+                       passo: float = 0.05, n_ativos: int = 10, semente: Optional[int] = None,
+                       setores: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Gera as ponderações e executa a varredura com log do resumo.
+
+    Args:
+        df_metricas (pd.DataFrame): Métricas de performance por ativo
+        modo (str): 'dirichlet' (n_pesos sorteios) ou 'simplex' (grade com passo)
+        n_pesos (int): Ponderações no modo Dirichlet
+        passo (float): Espaçamento no modo simplex
+        n_ativos (int): Tamanho da seleção
+        semente (int): Semente dos sorteios Dirichlet (None = CONFIG.SEED)
+        setores (dict): Mapa ativo → setor (None = cadastro de CONFIG.SETORES, como na etapa 01)
+
+    Returns:
+        dict: Saída de varrer_pesos
+    """
+    logger = get_logger(__name__)
+    config = get_config()
+
+    if setores is None:
+        try:
+            setores = carregar_mapa_setores()
+        except FileNotFoundError as e:
+            logger.warning(f"   {e} - varredura sem restrições setoriais")
+
+    if modo == 'dirichlet':
+        rng = np.random.default_rng(config.SEED if semente is None else semente)
+        pesos = pesos_dirichlet(n_pesos, rng=rng)
+    elif modo == 'simplex':
+        pesos = grade_simplex(passo)
+    else:
+        raise ValueError(f"Modo de varredura não suportado: {modo!r} (use 'dirichlet' ou 'simplex')")
+
+    resultado = varrer_pesos(df_metricas, pesos, n_ativos, setores=setores)
+    e = resultado['estatisticas']
+
+    logger.info(f"   Varredura de pesos ({modo}): {e['n_ponderacoes']} ponderações, "
+                f"top {e['n_ativos_selecionados']} de {e['n_ativos_universo']} ativos")
+    logger.info(f"   Jaccard vs. base: médio {e['jaccard_medio']:.3f}, p5 {e['jaccard_p05']:.3f}, "
+                f"mín {e['jaccard_min']:.3f}; seleção idêntica em {e['pct_identica_base']:.1%}")
+    logger.info(f"   Correlação de ranks média: {e['correlacao_ranks_media']:.3f}")
+
+    return resultado
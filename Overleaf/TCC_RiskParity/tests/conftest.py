@@ -0,0 +1,42 @@
+"""
+Configuração comum dos testes - TCC Risk Parity v2.0
+
+Os módulos de src/ importam a configuração como `_00_configuracao_global`;
+o arquivo real é 00_configuracao_global.py (nome que não é identificador
+Python), então ele é carregado por caminho e registrado com esse nome.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def carregar_modulo(nome: str, arquivo: str):
+    """Carrega um módulo de src/ pelo nome do arquivo (etapas numeradas)"""
+    if nome not in sys.modules:
+        spec = importlib.util.spec_from_file_location(nome, SRC_DIR / arquivo)
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules[nome] = modulo
+        spec.loader.exec_module(modulo)
+    return sys.modules[nome]
+
+
+configuracao = carregar_modulo('_00_configuracao_global', '00_configuracao_global.py')
+
+
+@pytest.fixture
+def config_temporaria(tmp_path, monkeypatch):
+    """CONFIG com cache, resultados e dados em um diretório temporário"""
+    config = configuracao.get_config()
+    for atributo, subdiretorio in (('cache_dir', 'cache'), ('results_dir', 'results'),
+                                   ('data_dir', 'DataBase')):
+        diretorio = tmp_path / subdiretorio
+        diretorio.mkdir()
+        monkeypatch.setattr(config, atributo, diretorio)
+    return config
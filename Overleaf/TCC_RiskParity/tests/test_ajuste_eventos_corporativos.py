@@ -0,0 +1,68 @@
+"""Ajuste por eventos corporativos: preços ajustados à mão e chave do painel ajustado"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ajuste_eventos_corporativos import ajustar_painel
+from painel_mercado import PainelMercado, versao_atual
+
+DATAS = pd.bdate_range('2019-03-11', periods=6)   # seg 11/03 a seg 18/03
+NAN = np.nan
+
+# VALE3: desdobramento 2:1 com data ex em 14/03
+# PETR4: R$ 0,50 com data ex no sábado 16/03 (vale o pregão de 18/03); sem cotação em 15/03
+BRUTOS = {
+    'VALE3': [100.0, 102.0, 104.0, 52.0, 53.0, 54.0],
+    'PETR4': [20.0, 20.4, 20.5, 20.8, NAN, 20.0],
+}
+EVENTOS = ["Ativo;Data;Tipo;Valor",
+           "VALE3;2019-03-14;desdobramento;2",
+           "PETR4;2019-03-16;dividendo;0.5"]
+
+
+@pytest.fixture
+def painel_bruto(tmp_path):
+    precos = np.column_stack(list(BRUTOS.values()))
+    return PainelMercado.salvar(tmp_path / "painel", DATAS, list(BRUTOS),
+                                {'Preço': precos, 'Volume$': np.full_like(precos, 1e6)},
+                                origem='export-2019')
+
+
+def _gravar_eventos(caminho, linhas):
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return caminho
+
+
+def test_desdobramento_e_dividendo_iguais_ao_ajuste_manual(config_temporaria, painel_bruto, tmp_path):
+    ajustado = ajustar_painel(painel_bruto, _gravar_eventos(tmp_path / "eventos.csv", EVENTOS))
+    precos = ajustado.para_dataframe('Preço')
+
+    # Antes da data ex: preço / 2; a partir dela: inalterado
+    np.testing.assert_allclose(precos['VALE3'], [50.0, 51.0, 52.0, 52.0, 53.0, 54.0])
+
+    # Fator 1 - 0,50 / 20,80 (último fechamento antes da data ex, pulando 15/03 sem cotação)
+    fator = 1 - 0.5 / 20.8
+    np.testing.assert_allclose(precos['PETR4'],
+                               [20.0 * fator, 20.4 * fator, 20.5 * fator, 20.8 * fator, NAN, 20.0])
+
+
+def test_painel_ajustado_muda_com_a_tabela_de_eventos(config_temporaria, painel_bruto, tmp_path):
+    caminho = _gravar_eventos(tmp_path / "eventos.csv", EVENTOS)
+    diretorio = PainelMercado.diretorio_padrao("painel_mercado_ajustado")
+
+    primeiro = ajustar_painel(painel_bruto, caminho)
+    versao = versao_atual(diretorio)
+    origem = primeiro.metadados['origem']
+
+    # Mesma tabela e mesmo painel bruto: reaproveita a versão gravada
+    assert ajustar_painel(painel_bruto, caminho).metadados['origem'] == origem
+    assert versao_atual(diretorio) == versao
+
+    # Novo evento na tabela: outra chave e painel reconstruído
+    _gravar_eventos(caminho, EVENTOS + ["VALE3;2019-03-12;jcp;1.02"])
+    segundo = ajustar_painel(painel_bruto, caminho)
+    assert segundo.metadados['origem'] != origem
+    assert versao_atual(diretorio) != versao
+    np.testing.assert_allclose(segundo.para_dataframe('Preço')['VALE3'].iloc[0],
+                               50.0 * (1 - 1.02 / 100.0))
@@ -0,0 +1,101 @@
+"""Banco SQLite do frame longo: esquema, carga, consultas por intervalo e universo líquido"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from banco_mercado import BancoMercado
+from conftest import carregar_modulo, configuracao
+
+carregador01 = carregar_modulo('carregador01', '01_carregador_economatica_v2.py')
+
+
+@pytest.fixture
+def banco(tmp_path):
+    with BancoMercado(tmp_path / "mercado.sqlite") as banco:
+        yield banco
+
+
+def _frame_pequeno():
+    datas = pd.to_datetime(['2019-01-02', '2019-01-03', '2019-01-04'])
+    return pd.DataFrame({
+        'Data': np.tile(datas, 2),
+        'Ativo': ['PETR4'] * 3 + ['VALE3'] * 3,
+        'Preço': [27.0, 27.5, 28.0, 52.0, 51.0, 50.5],
+        'Volume$': [1e8, 2e8, 3e8, 4e8, 5e8, 6e8],
+    })
+
+
+def test_esquema(banco):
+    objetos = dict(banco.conexao.execute("SELECT name, type FROM sqlite_master").fetchall())
+    assert objetos['precos'] == 'table' and objetos['metadados'] == 'table'
+    assert objetos['idx_precos_data'] == 'index'
+
+    chave = [linha[1] for linha in sorted(banco.conexao.execute("PRAGMA table_info(precos)"),
+                                          key=lambda linha: linha[5]) if linha[5] > 0]
+    assert chave == ['ativo', 'data']
+    with pytest.raises(sqlite3.OperationalError):   # WITHOUT ROWID
+        banco.conexao.execute("SELECT rowid FROM precos")
+
+
+def test_carga_substitui_conteudo_e_duplicata_vale_a_ultima(banco):
+    df = _frame_pequeno()
+    duplicada = df.iloc[[0]].assign(**{'Preço': 99.0})
+    assert banco.carregar_frame(pd.concat([df, duplicada]), origem='export-a') == 6
+    assert banco.origem() == 'export-a'
+    assert banco.precos_ativo('PETR4').loc['2019-01-02', 'Preço'] == 99.0
+
+    banco.carregar_frame(df[df['Ativo'] == 'VALE3'], origem='export-b')
+    assert banco.origem() == 'export-b'
+    assert banco.conexao.execute("SELECT COUNT(*) FROM precos").fetchone()[0] == 3
+    assert banco.precos_ativo('PETR4').empty
+
+
+def test_consultas_por_intervalo_inclusivo(banco):
+    banco.carregar_frame(_frame_pequeno())
+
+    serie = banco.precos_ativo('VALE3', '2019-01-03', '2019-01-04')
+    assert list(serie.index) == list(pd.to_datetime(['2019-01-03', '2019-01-04']))
+    assert serie['Preço'].tolist() == [51.0, 50.5]
+
+    janela = banco.janela(['VALE3', 'PETR4'], inicio='2019-01-03')
+    assert janela[['Data', 'Ativo']].astype(str).agg(' '.join, axis=1).tolist() == [
+        '2019-01-03 PETR4', '2019-01-03 VALE3', '2019-01-04 PETR4', '2019-01-04 VALE3']
+    assert janela['Volume$'].tolist() == [2e8, 5e8, 3e8, 6e8]
+
+    assert list(banco.datas_negociacao(fim='2019-01-03')) == list(
+        pd.to_datetime(['2019-01-02', '2019-01-03']))
+
+
+def test_presenca_do_universo_igual_a_etapa_01(banco, config_temporaria):
+    datas = pd.bdate_range('2015-01-01', periods=620)
+    n = len(datas)
+    indice = np.arange(n)
+    partes = {
+        'PETR4': (np.ones(n, dtype=bool), np.full(n, 2e7)),
+        # Listagem tardia: 520 observações, sem negócio a cada 20 dias
+        'VALE3': (indice >= 100, np.where(indice % 20 == 0, 0.0, 1.5e7)),
+        # Cotado todos os dias, sem negócio a cada 4 dias
+        'MGLU3': (np.ones(n, dtype=bool), np.where(indice % 4 == 0, 0.0, 9e6)),
+    }
+    df = pd.concat([pd.DataFrame({'Data': datas[manter], 'Ativo': ativo,
+                                  'Preço': 10 + 0.01 * indice[manter], 'Volume$': volume[manter]})
+                    for ativo, (manter, volume) in partes.items()], ignore_index=True)
+    banco.carregar_frame(df)
+
+    universo = banco.universo_liquido(datas[-1], janela_dias=n, volume_min=0, presenca_min=0)
+
+    carregador = carregador01.CarregadorEconomaticaProfissional.__new__(
+        carregador01.CarregadorEconomaticaProfissional)
+    carregador.logger = configuracao.get_logger('teste')
+    carregador.config = config_temporaria
+    etapa01 = carregador.calcular_metricas_liquidez(df).set_index('ativo')
+
+    presenca = universo.set_index('ativo')['presenca_bolsa']
+    np.testing.assert_allclose(presenca.sort_index(), etapa01['presenca_bolsa'].sort_index())
+    assert presenca['VALE3'] == pytest.approx(0.95)
+
+    # Com o limiar da configuração (90%): a listagem tardia não é penalizada
+    assert banco.universo_liquido(datas[-1], janela_dias=n)['ativo'].tolist() == ['PETR4', 'VALE3']
@@ -0,0 +1,65 @@
+"""Base de mercado incremental: exports parciais, recarga mesclada e linhas removidas do export"""
+
+import numpy as np
+import pandas as pd
+
+from base_mercado import BaseMercadoIncremental
+
+
+def _export(ativos, inicio, fim, deslocamento=0.0):
+    datas = pd.bdate_range(inicio, fim)
+    partes = []
+    for k, ativo in enumerate(ativos):
+        partes.append(pd.DataFrame({
+            'Data': datas,
+            'Ativo': ativo,
+            'Preço': 10.0 * (k + 1) + np.arange(len(datas)) * 0.1 + deslocamento,
+            'Volume$': 1e6
+        }))
+    return pd.concat(partes, ignore_index=True)
+
+
+def test_export_parcial_mantem_historico_dos_ativos_ausentes(tmp_path):
+    base = BaseMercadoIncremental(tmp_path / "base")
+    assert base.ingerir(_export(['AAAA3', 'BBBB3'], '2018-01-01', '2018-03-31'))['modo'] == 'inicial'
+    linhas_b = len(base.ler(ativos=['BBBB3']))
+    assert linhas_b > 0
+
+    resumo = base.ingerir(_export(['AAAA3'], '2018-01-01', '2018-04-30'))
+
+    assert resumo['modo'] == 'incremental'
+    assert len(base.ler(ativos=['BBBB3'])) == linhas_b
+    assert base.ler(ativos=['AAAA3'])['Data'].max() == pd.Timestamp('2018-04-30')
+    assert base.watermark('BBBB3') == pd.Timestamp('2018-03-30')
+
+
+def test_recarga_mesclada_so_substitui_ativos_do_export(tmp_path):
+    base = BaseMercadoIncremental(tmp_path / "base")
+    base.ingerir(_export(['AAAA3', 'BBBB3'], '2018-01-01', '2018-03-31'))
+    antes_b = base.ler(ativos=['BBBB3'])
+
+    # Histórico de AAAA3 revisado (ajuste de proventos) a partir de fevereiro
+    revisado = _export(['AAAA3'], '2018-02-01', '2018-04-30', deslocamento=-1.0)
+    resumo = base.ingerir(revisado)
+
+    assert resumo['modo'] == 'recarga'
+    pd.testing.assert_frame_equal(base.ler(ativos=['BBBB3']), antes_b)
+
+    a = base.ler(ativos=['AAAA3'])
+    janeiro = a[a['Data'] < '2018-02-01']
+    assert len(janeiro) == len(pd.bdate_range('2018-01-01', '2018-01-31'))
+    fevereiro_em_diante = a[a['Data'] >= '2018-02-01'].reset_index(drop=True)
+    np.testing.assert_allclose(fevereiro_em_diante['Preço'], revisado['Preço'])
+
+    # Reingestão do mesmo export não altera mais nada
+    assert base.ingerir(revisado)['modo'] == 'incremental'
+
+
+def test_linha_removida_do_export_e_detectada(tmp_path):
+    base = BaseMercadoIncremental(tmp_path / "base")
+    export = _export(['AAAA3', 'BBBB3'], '2018-01-01', '2018-03-31')
+    base.ingerir(export)
+
+    sem_linha = export.drop(index=export.index[(export['Ativo'] == 'AAAA3')][10])
+    assert base.ingerir(sem_linha)['modo'] == 'recarga'
+    assert len(base.ler(ativos=['AAAA3'])) == (export['Ativo'] == 'AAAA3').sum() - 1
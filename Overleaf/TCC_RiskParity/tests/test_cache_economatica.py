@@ -0,0 +1,68 @@
+"""Cache colunar do export Economática: chave por conteúdo e mapeamento, entradas por arquivo"""
+
+import os
+
+import pandas as pd
+
+from cache_economatica import CacheEconomatica
+
+MAPEAMENTO = {'planilha': 0, 'colunas': ['Data', 'Ativo', 'Preço', 'Volume$']}
+
+
+def _export(caminho, conteudo):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_bytes(conteudo)
+    return caminho
+
+
+def test_chave_estavel_sem_mudanca_de_conteudo(tmp_path):
+    origem = _export(tmp_path / "dados" / "economatica.xlsx", b"export 2014-2019")
+    cache = CacheEconomatica(tmp_path / "cache")
+    chave = cache.calcular_chave(origem, MAPEAMENTO)
+
+    assert cache.calcular_chave(origem, MAPEAMENTO) == chave
+    # Outra instância (memo relido do disco) e mtime alterado sem mudar o conteúdo
+    os.utime(origem, ns=(origem.stat().st_atime_ns, origem.stat().st_mtime_ns + 10**9))
+    assert CacheEconomatica(tmp_path / "cache").calcular_chave(origem, MAPEAMENTO) == chave
+    # Ordem das chaves do mapeamento não importa
+    assert cache.calcular_chave(origem, dict(reversed(list(MAPEAMENTO.items())))) == chave
+
+
+def test_chave_muda_com_conteudo_ou_mapeamento(tmp_path):
+    origem = _export(tmp_path / "economatica.xlsx", b"export 2014-2019")
+    cache = CacheEconomatica(tmp_path / "cache")
+    chave = cache.calcular_chave(origem, MAPEAMENTO)
+
+    assert cache.calcular_chave(origem, {**MAPEAMENTO, 'planilha': 1}) != chave
+    assert cache.calcular_chave(origem, {**MAPEAMENTO, 'colunas': ['Data', 'Ativo', 'Preço']}) != chave
+
+    # Mesmo tamanho, conteúdo diferente (mtime avança na regravação)
+    stat = origem.stat()
+    _export(origem, b"export 2014-2020")
+    os.utime(origem, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.calcular_chave(origem, MAPEAMENTO) != chave
+
+
+def test_exports_homonimos_tem_entradas_separadas(tmp_path):
+    cache = CacheEconomatica(tmp_path / "cache")
+    frame = pd.DataFrame({'Data': pd.to_datetime(['2019-01-02']), 'Ativo': ['PETR4'],
+                          'Preço': [27.45], 'Volume$': [1.2e8]})
+    primeiro = _export(tmp_path / "a" / "economatica.xlsx", b"grupo A")
+    segundo = _export(tmp_path / "b" / "economatica.xlsx", b"grupo B")
+
+    chave_a = cache.calcular_chave(primeiro, MAPEAMENTO)
+    chave_b = cache.calcular_chave(segundo, MAPEAMENTO)
+    cache.salvar(primeiro, chave_a, frame)
+    cache.salvar(segundo, chave_b, frame.assign(Ativo='VALE3'))
+
+    assert cache.caminho_entrada(primeiro, chave_a) != cache.caminho_entrada(segundo, chave_a)
+    assert cache.ler(primeiro, chave_a)['Ativo'].tolist() == ['PETR4']
+    assert cache.ler(segundo, chave_b)['Ativo'].tolist() == ['VALE3']
+
+    # Nova versão do primeiro export substitui só a entrada dele
+    _export(primeiro, b"grupo A revisado")
+    nova = cache.calcular_chave(primeiro, MAPEAMENTO)
+    cache.salvar(primeiro, nova, frame)
+    assert cache.ler(primeiro, chave_a) is None
+    assert cache.ler(primeiro, nova) is not None
+    assert cache.ler(segundo, chave_b) is not None
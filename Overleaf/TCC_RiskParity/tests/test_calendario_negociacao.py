@@ -0,0 +1,60 @@
+"""Calendário de pregões: fins de mês com feriados, meses sem cotação e rebalanceamento"""
+
+import numpy as np
+import pandas as pd
+
+from calendario_negociacao import CalendarioNegociacao
+
+# Feriados da B3 entre nov/2018 e fev/2019 (31/12 sem pregão)
+FERIADOS = pd.to_datetime(['2018-11-02', '2018-11-15', '2018-11-20', '2018-12-24', '2018-12-25',
+                           '2018-12-31', '2019-01-01', '2019-01-25'])
+PREGOES = pd.bdate_range('2018-11-01', '2019-02-28').difference(FERIADOS)
+
+
+def _posicao(data):
+    return float(PREGOES.get_loc(pd.Timestamp(data)))
+
+
+def test_ultimo_pregao_do_mes_respeita_feriados():
+    calendario = CalendarioNegociacao(PREGOES)
+
+    assert list(calendario.datas_fim_mes) == list(pd.to_datetime(
+        ['2018-11-30', '2018-12-28', '2019-01-31', '2019-02-28']))
+    assert list(calendario.rotulos_fim_mes) == list(pd.to_datetime(
+        ['2018-11-30', '2018-12-31', '2019-01-31', '2019-02-28']))
+    # Rebalanceamento em janeiro: 01/01 é feriado
+    assert list(calendario.datas_rebalance) == [pd.Timestamp('2019-01-02')]
+
+
+def test_amostragem_com_dias_sem_cotacao():
+    calendario = CalendarioNegociacao(PREGOES)
+    # Valor = posição da linha, para ler de qual pregão veio cada amostra
+    precos = pd.DataFrame({'PETR4': np.arange(len(PREGOES), dtype=np.float64),
+                           'VALE3': np.arange(len(PREGOES), dtype=np.float64)}, index=PREGOES)
+    precos.loc['2018-12-27':'2018-12-28', 'PETR4'] = np.nan   # Sem negócio nos dois últimos pregões
+    precos.loc['2019-01', 'VALE3'] = np.nan                    # Suspensa o mês inteiro
+
+    amostra = calendario.amostrar_fim_mes(precos)
+
+    np.testing.assert_array_equal(amostra['PETR4'], [_posicao('2018-11-30'), _posicao('2018-12-26'),
+                                                     _posicao('2019-01-31'), _posicao('2019-02-28')])
+    np.testing.assert_array_equal(amostra['VALE3'], [_posicao('2018-11-30'), _posicao('2018-12-28'),
+                                                     np.nan, _posicao('2019-02-28')])
+    pd.testing.assert_frame_equal(amostra, precos.resample('ME').last(), check_freq=False)
+    pd.testing.assert_series_equal(calendario.amostrar_fim_mes(precos['VALE3']), amostra['VALE3'])
+
+
+def test_mes_sem_pregao_fica_vazio():
+    # Base sem nenhum pregão em dezembro (lacuna do export)
+    datas = PREGOES[PREGOES.month != 12]
+    calendario = CalendarioNegociacao(datas)
+    serie = pd.Series(np.linspace(10.0, 20.0, len(datas)), index=datas)
+
+    amostra = calendario.amostrar_fim_mes(serie)
+
+    assert calendario.meses_com_pregao.tolist() == [True, False, True, True]
+    assert amostra.index[1] == pd.Timestamp('2018-12-31')
+    assert np.isnan(amostra.iloc[1])
+    assert amostra.iloc[2] == serie['2019-01-31']
+    # O retorno de janeiro não é medido contra novembro
+    assert amostra.pct_change(fill_method=None).iloc[1:3].isna().all()
@@ -0,0 +1,109 @@
+"""Capacidade das estratégias: ADTV, Amihud, AUM máximo e dias para negociar por data"""
+
+import numpy as np
+import pandas as pd
+
+from capacidade_estrategias import EstimadorCapacidade
+
+JANELA = 10
+PARTICIPACAO = 0.1
+AUM = 5e6
+
+
+def test_capacidade_calculada_a_mao():
+    datas = pd.bdate_range('2019-06-03', periods=3)
+    precos = pd.DataFrame({'PETR4': [10.0, 11.0, 9.9], 'VALE3': [20.0, 20.0, 21.0]}, index=datas)
+    volumes = pd.DataFrame({'PETR4': [1e6, 2e6, 3e6], 'VALE3': [4e6, 0.0, 2e6]}, index=datas)
+    pesos = pd.DataFrame([[0.5, 0.5], [1.0, 0.0]], index=['EW', 'MVO'], columns=['PETR4', 'VALE3'])
+
+    resultado = EstimadorCapacidade(precos, volumes, janela_dias=3, participacao_max=0.1).estimar(
+        pesos, aum=1e6, dias_liquidacao=1)
+    ultimo = {nome: resultado[nome].iloc[-1] for nome in ('aum_maximo', 'dias_carteira', 'impacto_amihud')}
+
+    # ADTV = R$ 2 mi nos dois ativos (o dia sem negócio da VALE3 conta como zero): R$ 200 mil/dia
+    np.testing.assert_allclose(ultimo['aum_maximo'], [200e3 / 0.5, 200e3 / 1.0])
+    np.testing.assert_allclose(ultimo['dias_carteira'], [0.5e6 / 200e3, 1e6 / 200e3])
+    # Amihud: PETR4 média(0,10 / 2, 0,10 / 3) = 1/24; VALE3 só 0,05 / 2 (sem negócio no dia do 0%)
+    amihud = np.array([1 / 24, 0.025])
+    np.testing.assert_allclose(ultimo['impacto_amihud'], [np.sum(0.5 * amihud * 0.5), amihud[0]])
+    assert resultado['aum_maximo'].iloc[:2].isna().all().all()
+
+
+def _dados_com_lacunas(n_datas=60, n_ativos=5, semente=9):
+    rng = np.random.default_rng(semente)
+    datas = pd.bdate_range('2018-01-01', periods=n_datas)
+    ativos = [f'ATV{j}3' for j in range(n_ativos)]
+    precos = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_datas, n_ativos)), axis=0))
+    precos[rng.random((n_datas, n_ativos)) < 0.1] = np.nan           # Lacunas
+    precos[:25, 3] = np.nan                                           # Listagem tardia
+    volumes = rng.uniform(1e5, 1e7, (n_datas, n_ativos))
+    volumes[rng.random((n_datas, n_ativos)) < 0.1] = 0.0              # Dias sem negócio
+    volumes[np.isnan(precos)] = np.nan
+
+    pesos = pd.DataFrame([[0.2, 0.2, 0.2, 0.2, 0.2],
+                          [0.5, 0.0, 0.3, 0.0, 0.2],
+                          [0.1, 0.6, 0.0, 0.3, 0.0]],
+                         index=['EW', 'MVO', 'ERC'], columns=ativos)
+    return (pd.DataFrame(precos, index=datas, columns=ativos),
+            pd.DataFrame(volumes, index=datas, columns=ativos), pesos)
+
+
+def _capacidade_ingenua(precos, volumes, pesos, dias_liquidacao):
+    """Referência: cada (data, estratégia) calculado diretamente sobre a janela"""
+    p = precos.to_numpy()
+    v = np.where(np.isnan(p), 0.0, volumes.to_numpy())
+    n_datas, n_ativos = p.shape
+
+    # Retorno contra a cotação anterior de cada ativo
+    retornos = np.full_like(p, np.nan)
+    for j in range(n_ativos):
+        anterior = np.nan
+        for t in range(n_datas):
+            retornos[t, j] = p[t, j] / anterior - 1
+            if not np.isnan(p[t, j]):
+                anterior = p[t, j]
+
+    esperado = {nome: pd.DataFrame(np.nan, index=precos.index, columns=pesos.index)
+                for nome in ('aum_maximo', 'dias_carteira', 'impacto_amihud')}
+    for t in range(JANELA - 1, n_datas):
+        janela = slice(t - JANELA + 1, t + 1)
+        for s, estrategia in enumerate(pesos.index):
+            aum_maximo, dias, impacto = np.inf, 0.0, 0.0
+            for j in range(n_ativos):
+                w = pesos.iloc[s, j]
+                if w <= 0:
+                    continue
+                adtv = v[janela, j].mean()
+                razoes = [abs(retornos[k, j]) / v[k, j] * 1e6 for k in range(t - JANELA + 1, t + 1)
+                          if v[k, j] > 0 and not np.isnan(retornos[k, j])]
+                amihud = np.mean(razoes) if razoes else np.nan
+
+                aum_maximo = min(aum_maximo, PARTICIPACAO * adtv * dias_liquidacao / w)
+                with np.errstate(divide='ignore'):  # ADTV zero: sem capacidade
+                    dias = max(dias, AUM * w / (PARTICIPACAO * adtv))
+                impacto += w * amihud * AUM * w / 1e6
+
+            esperado['aum_maximo'].iloc[t, s] = aum_maximo
+            esperado['dias_carteira'].iloc[t, s] = dias
+            esperado['impacto_amihud'].iloc[t, s] = impacto
+    return esperado
+
+
+def test_capacidade_igual_ao_laco_por_data():
+    precos, volumes, pesos = _dados_com_lacunas()
+    estimador = EstimadorCapacidade(precos, volumes, JANELA, PARTICIPACAO)
+
+    for dias_liquidacao in (1, 3):
+        obtido = estimador.estimar(pesos, aum=AUM, dias_liquidacao=dias_liquidacao)
+        esperado = _capacidade_ingenua(precos, volumes, pesos, dias_liquidacao)
+        for nome in ('aum_maximo', 'dias_carteira', 'impacto_amihud'):
+            pd.testing.assert_frame_equal(obtido[nome], esperado[nome], check_names=False, rtol=1e-10)
+
+
+def test_zero_explicito_nao_usa_a_configuracao():
+    precos, volumes, pesos = _dados_com_lacunas()
+    resultado = EstimadorCapacidade(precos, volumes, JANELA, PARTICIPACAO).estimar(pesos, dias_liquidacao=0)
+    aum_maximo = resultado['aum_maximo'].dropna()
+
+    assert len(aum_maximo) and (aum_maximo == 0).all().all()
+    assert EstimadorCapacidade(precos, volumes, JANELA, participacao_max=0.0).participacao_max == 0.0
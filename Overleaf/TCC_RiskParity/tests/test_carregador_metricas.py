@@ -0,0 +1,147 @@
+"""
+Métricas vetorizadas da etapa 01 (liquidez agrupada e performance
+matricial) iguais às dos laços por ativo que elas substituem
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import carregar_modulo, configuracao
+
+carregador01 = carregar_modulo('carregador01', '01_carregador_economatica_v2.py')
+
+
+@pytest.fixture
+def carregador():
+    """Carregador sem detecção de arquivo (só os métodos de cálculo)"""
+    instancia = carregador01.CarregadorEconomaticaProfissional.__new__(
+        carregador01.CarregadorEconomaticaProfissional)
+    instancia.logger = configuracao.get_logger('teste')
+    instancia.config = configuracao.get_config()
+    return instancia
+
+
+def _frame_longo(semente=42):
+    """Frame longo com histórias curtas, lacunas, preço constante, preço zero e duplicatas"""
+    rng = np.random.default_rng(semente)
+    datas = pd.bdate_range('2013-06-03', '2018-06-29')
+    partes = []
+    for k in range(24):
+        n = len(datas)
+        precos = 20 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+        precos = np.round(precos, 1 if k % 3 == 0 else 2)          # Retornos nulos frequentes
+        volumes = rng.lognormal(15, 1, n) * (rng.random(n) > 0.05)  # Dias sem volume
+        manter = rng.random(n) > 0.08                               # Lacunas
+
+        if k == 1:
+            manter[:900] = False       # Listagem tardia
+        elif k == 2:
+            manter[400:] = False       # Cancelado cedo (menos que o mínimo de observações)
+        elif k == 3:
+            precos[:] = 15.0           # Preço constante
+        elif k == 4:
+            precos[700] = 0.0          # Preço zero isolado
+        elif k == 5:
+            manter[:1180] = False      # Menos de 2 anos no período de performance
+
+        parte = pd.DataFrame({'Data': datas[manter], 'Ativo': f'ATV{k:02d}3',
+                              'Preço': precos[manter], 'Volume$': volumes[manter]})
+        partes.append(parte)
+
+    df = pd.concat(partes, ignore_index=True)
+    df = df.sample(frac=1.0, random_state=semente).reset_index(drop=True)   # Ordem arbitrária
+    duplicadas = df.sample(40, random_state=1)                              # Duplicatas idênticas
+    return pd.concat([df, duplicadas], ignore_index=True)
+
+
+def _liquidez_original(df, negocios_min):
+    """Laço por ativo da versão original de calcular_metricas_liquidez"""
+    metricas_liquidez = []
+    for ativo in df['Ativo'].unique():
+        df_ativo = df[df['Ativo'] == ativo].sort_values('Data', kind='mergesort')
+        if len(df_ativo) < negocios_min:
+            continue
+
+        total_dias = len(df_ativo)
+        df_ativo = df_ativo.copy()
+        df_ativo['Retorno'] = df_ativo['Preço'].pct_change()
+        dias_sem_retorno = (df_ativo['Retorno'] == 0).sum()
+        autocorr = df_ativo['Retorno'].autocorr() if len(df_ativo) > 10 else np.nan
+
+        metricas_liquidez.append({
+            'ativo': ativo,
+            'volume_medio_diario': df_ativo['Volume$'].mean(),
+            'volume_mediano_diario': df_ativo['Volume$'].median(),
+            'presenca_bolsa': (df_ativo['Volume$'] > 0).sum() / total_dias,
+            'pct_dias_sem_retorno': dias_sem_retorno / len(df_ativo.dropna()),
+            'autocorr_retornos': autocorr if not pd.isna(autocorr) else -999,
+            'observacoes_totais': total_dias,
+            'periodo_inicio': df_ativo['Data'].min(),
+            'periodo_fim': df_ativo['Data'].max()
+        })
+    return pd.DataFrame(metricas_liquidez)
+
+
+def _performance_original(df, ativos_elegiveis, config):
+    """Laço por ativo da versão original de calcular_metricas_performance"""
+    data_inicio = pd.to_datetime(config.PERIODOS['estimacao_inicio']) - pd.DateOffset(years=2)
+    data_fim = pd.to_datetime(config.PERIODOS['estimacao_fim'])
+    df_periodo = df[(df['Data'] >= data_inicio) & (df['Data'] <= data_fim)]
+
+    metricas_performance = []
+    for ativo in ativos_elegiveis:
+        df_ativo = df_periodo[df_periodo['Ativo'] == ativo].sort_values('Data', kind='mergesort')
+        if len(df_ativo) < 24:
+            continue
+
+        # resample('M') e pct_change() com preenchimento 'pad' da versão original,
+        # escritos de forma aceita por todas as versões do pandas
+        precos_mensais = df_ativo.set_index('Data')['Preço'].resample(pd.offsets.MonthEnd()).last()
+        retornos_mensais = precos_mensais.ffill().pct_change().dropna()
+        if len(retornos_mensais) < 12:
+            continue
+
+        precos_cum = (retornos_mensais + 1).cumprod()
+        drawdowns = precos_cum / precos_cum.expanding().max() - 1
+        retornos_negativos = retornos_mensais[retornos_mensais < 0]
+
+        metricas_performance.append({
+            'ativo': ativo,
+            'momentum_12_1': (retornos_mensais.iloc[-12:-1] + 1).prod() - 1,
+            'volatilidade_anual': retornos_mensais.std() * np.sqrt(12),
+            'max_drawdown': abs(drawdowns.min()),
+            'downside_deviation': retornos_negativos.std() * np.sqrt(12) if len(retornos_negativos) > 0 else 0,
+            'retorno_medio_mensal': retornos_mensais.mean(),
+            'observacoes_performance': len(retornos_mensais)
+        })
+    return pd.DataFrame(metricas_performance).dropna().reset_index(drop=True)
+
+
+@pytest.mark.filterwarnings('ignore::FutureWarning')
+def test_liquidez_equivalente_ao_laco_por_ativo(carregador):
+    df = _frame_longo()
+    minimo = carregador.config.LIQUIDEZ_CRITERIA['negocios_min_diario']
+
+    esperado = _liquidez_original(df, minimo)
+    obtido = carregador.calcular_metricas_liquidez(df)
+
+    assert 'ATV023' not in set(obtido['ativo'])
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(carregador.filtrar_por_liquidez(obtido),
+                                  carregador.filtrar_por_liquidez(esperado), check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.filterwarnings('ignore::FutureWarning')
+def test_performance_equivalente_ao_laco_por_ativo(carregador):
+    df = _frame_longo()
+    # Duplicatas com preço diferente: prevalece a última linha
+    conflitos = df.sample(30, random_state=3).assign(Preço=lambda d: d['Preço'] * 1.01)
+    df = pd.concat([df, conflitos], ignore_index=True)
+    ativos = sorted(df['Ativo'].unique())[::-1] + ['XXXX3']
+
+    esperado = _performance_original(df, ativos, carregador.config)
+    obtido = carregador.calcular_metricas_performance(df, ativos)
+
+    assert 'ATV053' not in set(obtido['ativo'])
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False, rtol=1e-10, atol=1e-12)
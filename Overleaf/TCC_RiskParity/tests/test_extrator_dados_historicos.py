@@ -0,0 +1,100 @@
+"""Limpeza das sheets da etapa 02: mesmas linhas do parsing célula a célula, inclusive com datas em formatos mistos"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import carregar_modulo
+
+extrator02 = carregar_modulo('extrator02', '02_extrator_dados_historicos.py')
+Extrator = extrator02.ExtratorDadosHistoricos
+
+
+def _limpar_sheet_original(df, inicio, fim):
+    """Referência: parsing célula a célula da versão original da etapa 02"""
+    header_row = None
+    for i in range(min(10, len(df))):
+        row_vals = df.iloc[i].astype(str).str.lower()
+        if any('data' in str(val) for val in row_vals):
+            header_row = i
+            break
+    if header_row is None:
+        return None
+
+    data_rows = df.iloc[header_row + 1:].copy()
+    dates_col = data_rows.iloc[:, 0]
+    prices_col = data_rows.iloc[:, -1]
+
+    clean_data = []
+    for i in range(len(dates_col)):
+        try:
+            date_val = pd.to_datetime(dates_col.iloc[i], errors='coerce')
+            price_val = pd.to_numeric(prices_col.iloc[i], errors='coerce')
+            if pd.notna(date_val) and pd.notna(price_val) and price_val > 0:
+                if inicio <= date_val.strftime('%Y-%m-%d') <= fim:
+                    clean_data.append({'Date': date_val, 'Price': price_val})
+        except Exception:
+            continue
+
+    if len(clean_data) < 20:
+        return None
+
+    asset_df = pd.DataFrame(clean_data)
+    asset_df = asset_df.drop_duplicates('Date').sort_values('Date')
+    return asset_df.set_index('Date')
+
+
+def _sheet(datas, precos):
+    """Sheet bruta: linhas de título, cabeçalho 'Data' e colunas de dados"""
+    linhas = [['Economatica', None, None], [None, None, None], ['Data', 'Volume', 'Fechamento']]
+    linhas += [[d, 1000, p] for d, p in zip(datas, precos)]
+    return pd.DataFrame(linhas, columns=['A', 'B', 'C'])
+
+
+def _datas_excel(n, inicio='2017-11-20'):
+    return [d.to_pydatetime() for d in pd.bdate_range(inicio, periods=n)]
+
+
+CASOS = {
+    'datas_excel': (_datas_excel(60), list(np.linspace(10, 20, 60))),
+    'texto_formatos_mistos': (
+        ['02/01/2018', '13/01/2018', '2018-01-20'] + [f'2018-02-{d:02d}' for d in range(1, 26)],
+        [10.0 + k for k in range(28)]
+    ),
+    'excel_com_texto_e_lixo': (
+        _datas_excel(30) + ['15/02/2018', '2018-03-01', 'n/d', None, np.nan, pd.Timestamp('2018-03-05')],
+        [float(k + 1) for k in range(30)] + [5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    ),
+    'precos_invalidos_e_duplicatas': (
+        _datas_excel(40) + _datas_excel(5),
+        [0, -1, 'n/d', None] + list(range(1, 37)) + [99] * 5
+    ),
+    'precos_inteiros': (_datas_excel(45, '2018-06-01'), list(range(1, 46))),
+    'fora_do_periodo': (_datas_excel(30, '2016-01-01'), list(range(1, 31))),
+}
+
+
+@pytest.mark.parametrize('caso', sorted(CASOS))
+def test_limpeza_equivalente_ao_parsing_por_celula(caso):
+    datas, precos = CASOS[caso]
+    sheet = _sheet(datas, precos)
+
+    esperado = _limpar_sheet_original(sheet, '2017-12-01', '2019-12-31')
+    obtido = Extrator._limpar_dados_sheet(sheet, '2017-12-01', '2019-12-31')
+
+    if esperado is None:
+        assert obtido is None
+    else:
+        pd.testing.assert_frame_equal(obtido, esperado, check_index_type=True)
+
+
+def test_coluna_de_texto_com_formatos_mistos_mantem_todas_as_datas():
+    datas = pd.Series(['02/01/2018', '13/01/2018', '2018-01-20', datetime(2018, 1, 25), 'lixo'], dtype=object)
+
+    convertidas = Extrator._converter_datas(datas)
+
+    assert convertidas.tolist()[:4] == [pd.Timestamp('2018-02-01'), pd.Timestamp('2018-01-13'),
+                                        pd.Timestamp('2018-01-20'), pd.Timestamp('2018-01-25')]
+    assert pd.isna(convertidas.iloc[4])
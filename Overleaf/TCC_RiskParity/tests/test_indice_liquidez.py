@@ -0,0 +1,108 @@
+"""Índice datado de liquidez: elegibilidade em janelas móveis e consultas sobre o bitmap"""
+
+import numpy as np
+import pandas as pd
+
+from indice_liquidez import IndiceLiquidez, matriz_elegibilidade
+from painel_mercado import PainelMercado
+
+CRITERIOS = {'volume_min_diario': 1_000.0, 'presenca_min_bolsa': 0.8, 'zero_return_days_max': 0.25}
+
+NAN = np.nan
+# Seis pregões, janela de 5: só as duas últimas datas têm janela completa
+PRECOS_MAO = np.array([
+    # PETR4  VALE3  MGLU3  ITUB4
+    [10.0,   NAN,   5.0,   10.0],
+    [10.1,   NAN,   5.1,   10.1],
+    [10.2,   20.0,  5.2,   10.2],
+    [10.3,   20.4,  5.3,   10.3],
+    [10.4,   20.2,  5.4,   10.3],
+    [10.5,   20.6,  5.5,   10.3],
+])
+VOLUMES_MAO = np.where(np.isnan(PRECOS_MAO), NAN, [[2_000.0, 2_000.0, 900.0, 2_000.0]] * 6)
+
+
+def test_elegibilidade_calculada_a_mao():
+    elegivel = matriz_elegibilidade(PRECOS_MAO, VOLUMES_MAO, 5, CRITERIOS)
+
+    assert not elegivel[:4].any()
+    np.testing.assert_array_equal(elegivel[4:], [
+        # VALE3 listada em 3/5 pregões e depois 4/5; MGLU3 com volume médio de 900;
+        # ITUB4 com 1/4 retornos nulos e depois 2/5
+        [True, False, False, True],
+        [True, True, False, False],
+    ])
+
+
+def _dados_com_lacunas(n_datas=120, n_ativos=9, semente=3):
+    rng = np.random.default_rng(semente)
+    precos = np.round(10 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_datas, n_ativos)), axis=0)), 1)
+    precos[rng.random((n_datas, n_ativos)) < 0.1] = np.nan          # Lacunas
+    precos[:30, 0] = np.nan                                          # Listagem tardia
+    precos[80:, 1] = np.nan                                          # Cancelamento
+    precos[:, 2] = np.where(np.arange(n_datas) % 4 == 0, 10.5, 10.0)  # Retornos nulos frequentes
+    precos[40:70, 3] = 10.0                                          # Preço parado
+    volumes = rng.uniform(0, 2_500, (n_datas, n_ativos))
+    volumes[rng.random((n_datas, n_ativos)) < 0.15] = 0.0
+    volumes[np.isnan(precos)] = np.nan
+    return precos, volumes
+
+
+def _elegibilidade_ingenua(precos, volumes, janela, criterios):
+    """Referência: cada (data, ativo) calculado diretamente sobre a janela"""
+    n_datas, n_ativos = precos.shape
+    elegivel = np.zeros((n_datas, n_ativos), dtype=bool)
+    for j in range(n_ativos):
+        # Retorno contra a cotação anterior (mesmo que anterior à janela)
+        retornos = np.full(n_datas, np.nan)
+        anterior = None
+        for t in range(n_datas):
+            if not np.isnan(precos[t, j]):
+                if anterior is not None:
+                    retornos[t] = precos[t, j] / anterior - 1
+                anterior = precos[t, j]
+
+        for t in range(janela - 1, n_datas):
+            linhas = range(t - janela + 1, t + 1)
+            cotados = [i for i in linhas if not np.isnan(precos[i, j])]
+            if not cotados:
+                continue
+            volume = [0.0 if np.isnan(volumes[i, j]) else volumes[i, j] for i in cotados]
+            validos = [retornos[i] for i in linhas if not np.isnan(retornos[i])]
+            if not validos:
+                continue
+            elegivel[t, j] = (
+                np.mean(volume) >= criterios['volume_min_diario']
+                and sum(v > 0 for v in volume) / janela >= criterios['presenca_min_bolsa']
+                and sum(r == 0 for r in validos) / len(validos) <= criterios['zero_return_days_max']
+            )
+    return elegivel
+
+
+def test_matriz_igual_a_forca_bruta(monkeypatch):
+    import indice_liquidez
+    monkeypatch.setattr(indice_liquidez, 'ATIVOS_POR_BLOCO', 4)  # Vários blocos de colunas
+
+    precos, volumes = _dados_com_lacunas()
+    for janela in (1, 20, 63):
+        rapida = matriz_elegibilidade(precos, volumes, janela, CRITERIOS)
+        np.testing.assert_array_equal(rapida, _elegibilidade_ingenua(precos, volumes, janela, CRITERIOS))
+
+    assert not matriz_elegibilidade(precos, volumes, len(precos) + 1, CRITERIOS).any()
+
+
+def test_consultas_do_indice(tmp_path):
+    precos, volumes = _dados_com_lacunas()
+    datas = pd.bdate_range('2018-01-01', periods=len(precos))
+    ativos = [f'ATV{j}3' for j in range(precos.shape[1])]
+    painel = PainelMercado.salvar(tmp_path / "painel", datas, ativos,
+                                  {'Preço': precos, 'Volume$': volumes}, origem='a')
+
+    indice = IndiceLiquidez(20, CRITERIOS, tmp_path / "indice").construir(painel)
+    esperado = _elegibilidade_ingenua(precos, volumes, 20, CRITERIOS)
+
+    np.testing.assert_array_equal(indice.matriz().to_numpy(), esperado)
+    assert indice.universo(datas[70]) == [a for a, ok in zip(ativos, esperado[70]) if ok]
+    assert indice.dias_elegivel('ATV43') == esperado[:, 4].sum()
+    assert indice.periodos_elegivel('ATV43')['pregoes'].sum() == esperado[:, 4].sum()
+    np.testing.assert_array_equal(indice.contagem_por_data().to_numpy(), esperado.sum(axis=1))
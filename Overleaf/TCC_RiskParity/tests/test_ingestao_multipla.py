@@ -0,0 +1,32 @@
+"""Mescla de exports sobrepostos: contagem de duplicatas e conflitos entre exports"""
+
+import numpy as np
+import pandas as pd
+
+from ingestao_multipla import mesclar_frames
+
+
+def _frame(linhas):
+    df = pd.DataFrame(linhas, columns=['Data', 'Ativo', 'Preço', 'Volume$'])
+    df['Data'] = pd.to_datetime(df['Data'])
+    return df
+
+
+def test_duplicatas_com_nan_identico_nao_sao_conflito():
+    antigo = _frame([
+        ('2018-01-02', 'AAAA3', 10.0, np.nan),   # Igual ao novo (NaN nos dois)
+        ('2018-01-03', 'AAAA3', 11.0, 500.0),    # Diverge do novo
+        ('2018-01-02', 'BBBB3', 20.0, 100.0),
+    ])
+    novo = _frame([
+        ('2018-01-02', 'AAAA3', 10.0, np.nan),
+        ('2018-01-03', 'AAAA3', 11.5, 500.0),
+    ])
+
+    mesclado, estatisticas = mesclar_frames([antigo, novo])
+
+    assert estatisticas['duplicatas'] == 2
+    assert estatisticas['conflitos'] == 1
+    assert len(mesclado) == 3
+    linha = mesclado[(mesclado['Ativo'] == 'AAAA3') & (mesclado['Data'] == '2018-01-03')]
+    assert linha['Preço'].item() == 11.5
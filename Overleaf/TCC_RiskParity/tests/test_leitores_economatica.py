@@ -0,0 +1,26 @@
+"""Testes dos leitores de export da Economática: xlsx e CSV devolvem o mesmo frame"""
+
+import pandas as pd
+import pytest
+
+from leitores_economatica import ler_export_economatica
+
+
+def test_xlsx_e_csv_produzem_frames_identicos(config_temporaria, tmp_path):
+    pytest.importorskip('openpyxl')
+    export = pd.DataFrame({
+        'Data': pd.to_datetime(['2019-01-02', '2019-01-03', '2019-01-02', '2019-01-03']),
+        'Ativo': ['PETR4', 'PETR4', 'VALE3', 'VALE3'],
+        'Preço': [27.45, 28.10, 52.3, 51.95],
+        'Volume$': [1.25e8, 9.8e7, 2.4e8, 2.1e8],
+    })
+    caminho_xlsx, caminho_csv = tmp_path / 'export.xlsx', tmp_path / 'export.csv'
+    export.to_excel(caminho_xlsx, index=False)
+    export.rename(columns={'Preço': 'Preço Fechamento', 'Volume$': 'Volume$ (R$)'}).to_csv(
+        caminho_csv, sep=';', decimal=',', date_format='%d/%m/%Y', index=False)
+
+    frame_xlsx = ler_export_economatica(caminho_xlsx, streaming=False)
+    frame_csv = ler_export_economatica(caminho_csv)
+
+    pd.testing.assert_frame_equal(frame_xlsx, frame_csv)
+    pd.testing.assert_frame_equal(frame_csv, export.astype({'Data': 'datetime64[ns]'}))
@@ -0,0 +1,71 @@
+"""Motor de sinais: momentum, volatilidade, downside e drawdown em janelas móveis mensais"""
+
+import numpy as np
+
+from metricas_selecao import max_drawdown_matriz
+from motor_sinais import calcular_sinais
+
+LOOKBACKS = {'momentum': [3, 12], 'volatilidade': [6], 'max_drawdown': [5, 12], 'downside': [6]}
+
+# Um ativo, cinco meses; todos os sinais em janela de 3 meses
+RETORNOS_MAO = np.array([[0.10], [-0.10], [0.05], [-0.20], [0.10]])
+
+
+def test_sinais_calculados_a_mao():
+    sinais = calcular_sinais(RETORNOS_MAO, {chave: [3] for chave in LOOKBACKS})
+
+    # Momentum 3-1: meses m-2 e m-1 (pula o mês corrente); em m = 4, 1,05 x 0,80 - 1
+    np.testing.assert_allclose(sinais['momentum_3_1'][:, 0], [np.nan, np.nan, -0.01, -0.055, -0.16])
+    # Volatilidade de (0,05; -0,20; 0,10): soma dos desvios² = 31/600, variância x 12 = 0,31
+    np.testing.assert_allclose(sinais['volatilidade_3'][4, 0], np.sqrt(0.31))
+    # Downside: dois negativos (-0,10; -0,20) em m = 3; um só negativo nas demais janelas
+    np.testing.assert_allclose(sinais['downside_3'][:, 0], [np.nan, np.nan, np.nan, np.sqrt(0.06), np.nan])
+    # Drawdown: riqueza 1,10 -> 0,99 em m = 2; 0,945 -> 0,756 e 1,05 -> 0,84 depois
+    np.testing.assert_allclose(sinais['max_drawdown_3'][:, 0], [np.nan, np.nan, 0.1, 0.2, 0.2])
+
+
+def _retornos_com_lacunas(n_meses=40, n_ativos=5, semente=11):
+    rng = np.random.default_rng(semente)
+    retornos = rng.normal(0.005, 0.06, (n_meses, n_ativos))
+    retornos[:8, 0] = np.nan       # Listagem tardia
+    retornos[25, 1] = np.nan       # Lacuna
+    retornos[:, 2] = np.abs(retornos[:, 2])
+    retornos[10, 2] = -0.05        # Um único negativo em várias janelas
+    return retornos
+
+
+def test_sinais_iguais_as_janelas_explicitas():
+    retornos = _retornos_com_lacunas()
+    sinais = calcular_sinais(retornos, LOOKBACKS)
+
+    for m in range(len(retornos)):
+        for j in range(retornos.shape[1]):
+            for meses in LOOKBACKS['momentum']:
+                janela = retornos[m - meses + 1:m, j] if m >= meses - 1 else None
+                esperado = (np.prod(1 + janela) - 1 if janela is not None and not np.isnan(janela).any()
+                            else np.nan)
+                np.testing.assert_allclose(sinais[f'momentum_{meses}_1'][m, j], esperado, atol=1e-12)
+
+            for meses in LOOKBACKS['volatilidade']:
+                janela = retornos[m - meses + 1:m + 1, j] if m >= meses - 1 else None
+                completa = janela is not None and not np.isnan(janela).any()
+                esperado = np.std(janela, ddof=1) * np.sqrt(12) if completa else np.nan
+                np.testing.assert_allclose(sinais[f'volatilidade_{meses}'][m, j], esperado, atol=1e-12)
+
+                negativos = janela[janela < 0] if completa else None
+                if not completa:
+                    esperado = np.nan
+                elif len(negativos) == 0:
+                    esperado = 0.0
+                elif len(negativos) == 1:
+                    esperado = np.nan
+                else:
+                    esperado = np.std(negativos, ddof=1) * np.sqrt(12)
+                np.testing.assert_allclose(sinais[f'downside_{meses}'][m, j], esperado, atol=1e-12)
+
+            for meses in LOOKBACKS['max_drawdown']:
+                janela = retornos[m - meses + 1:m + 1, j:j + 1] if m >= meses - 1 else None
+                esperado = (max_drawdown_matriz(janela)[0]
+                            if janela is not None and not np.isnan(janela).any() else np.nan)
+                np.testing.assert_allclose(sinais[f'max_drawdown_{meses}'][m, j], esperado, atol=1e-12)
+
@@ -0,0 +1,82 @@
+"""Painel em memória mapeada: gravação atômica por versão sem invalidar frames já abertos"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import painel_mercado
+from painel_mercado import PainelMercado, gravacao_atomica, ler_metadados, versao_atual
+
+
+def _salvar(diretorio, n_datas, valor=None):
+    datas = pd.bdate_range('2018-01-01', periods=n_datas)
+    precos = np.arange(2 * n_datas, dtype=np.float64).reshape(n_datas, 2) + 1
+    if valor is not None:
+        precos[:] = valor
+    return PainelMercado.salvar(diretorio, datas, ['AAAA3', 'BBBB3'],
+                                {'Preço': precos, 'Volume$': precos * 1000})
+
+
+def test_reconstrucao_nao_altera_frames_abertos(tmp_path):
+    diretorio = tmp_path / "painel"
+    painel = _salvar(diretorio, 50)
+    antigo = painel.para_dataframe('Preço')
+    fatia = painel.fatia('Preço', '2018-01-01', '2018-01-31')
+    esperado = antigo.copy()
+
+    # Reconstrução com menos datas (arquivo menor) e valores diferentes
+    novo = _salvar(diretorio, 10, valor=99.0)
+
+    pd.testing.assert_frame_equal(antigo, esperado)
+    assert antigo.iloc[0].tolist() == [1.0, 2.0]
+    np.testing.assert_array_equal(fatia, esperado.loc[:'2018-01-31'].to_numpy())
+
+    assert novo.forma == (10, 2)
+    assert (PainelMercado.abrir(diretorio).campos['Preço'] == 99.0).all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['painel']
+
+
+def test_gravacao_atomica_preserva_diretorio_em_erro(tmp_path):
+    diretorio = tmp_path / "painel"
+    _salvar(diretorio, 5)
+
+    try:
+        with gravacao_atomica(diretorio) as temporario:
+            (temporario / "parcial.npy").write_bytes(b'')
+            raise RuntimeError("falha na gravação")
+    except RuntimeError:
+        pass
+
+    assert PainelMercado.abrir(diretorio).forma == (5, 2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['painel']
+
+
+def test_reconstrucao_sem_mover_diretorios_mapeados(tmp_path, monkeypatch):
+    """No Windows, diretórios com arquivos mapeados não podem ser renomeados nem apagados"""
+    diretorio = tmp_path / "painel"
+    painel = _salvar(diretorio, 20)
+    antigo = painel.para_dataframe('Preço')
+    versao_antiga = versao_atual(diretorio)
+
+    substituir = os.replace
+
+    def replace_sem_diretorios(origem, destino):
+        assert not os.path.isdir(origem), "diretório renomeado"
+        substituir(origem, destino)
+
+    monkeypatch.setattr(painel_mercado.os, 'replace', replace_sem_diretorios)
+    monkeypatch.setattr(painel_mercado.shutil, 'rmtree', lambda *args, **kwargs: None)
+
+    _salvar(diretorio, 10, valor=99.0)
+
+    assert versao_antiga.is_dir() and versao_atual(diretorio) != versao_antiga
+    assert ler_metadados(diretorio)['n_datas'] == 10
+    assert antigo.iloc[0].tolist() == [1.0, 2.0]
+
+    # A versão antiga, já liberada, sai na gravação seguinte
+    del painel, antigo
+    monkeypatch.undo()
+    _salvar(diretorio, 5)
+    assert sorted(p.name for p in diretorio.iterdir()) == sorted(
+        [versao_atual(diretorio).name, painel_mercado.ARQUIVO_VERSAO])
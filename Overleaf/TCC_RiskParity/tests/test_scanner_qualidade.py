@@ -0,0 +1,22 @@
+"""Scanner de qualidade: outliers com MAD nulo e lacunas no meio do histórico de um ativo"""
+
+import numpy as np
+
+from scanner_qualidade import escanear_painel
+
+
+def test_mad_nulo_nao_marca_retornos_ausentes():
+    precos = np.array([np.nan, 10, 10, 10, 10, np.nan, 10, 10, 12, 10])[:, None]
+    mascaras = escanear_painel(precos, np.ones_like(precos))
+
+    outliers = np.flatnonzero(mascaras['outlier_retorno'][:, 0])
+    # Só os dois movimentos reais (10 → 12 → 10); sem retorno nas linhas 0, 1 e 5
+    assert outliers.tolist() == [8, 9]
+
+
+def test_lacuna_dentro_do_historico():
+    precos = np.array([np.nan, 10, 10, 10, 10, np.nan, 10, 10, 12, 10])[:, None]
+    mascaras = escanear_painel(precos, np.ones_like(precos))
+
+    assert np.flatnonzero(mascaras['lacuna'][:, 0]).tolist() == [5]
+
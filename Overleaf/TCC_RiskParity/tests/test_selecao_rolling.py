@@ -0,0 +1,112 @@
+"""Seleção rolling point-in-time: ativos cancelados ficam fora e a liquidez segue a etapa 01"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import carregar_modulo, configuracao
+from selecao_rolling import SelecaoRolling
+
+carregador01 = carregar_modulo('carregador01', '01_carregador_economatica_v2.py')
+
+
+def _painel(n_ativos=12, inicio='2013-06-01', fim='2018-12-31', semente=7):
+    rng = np.random.default_rng(semente)
+    datas = pd.bdate_range(inicio, fim)
+    ativos = [f'ATV{k:02d}3' for k in range(n_ativos)]
+    retornos = rng.normal(0.0005, 0.015, size=(len(datas), n_ativos))
+    precos = pd.DataFrame(20 * np.exp(np.cumsum(retornos, axis=0)), index=datas, columns=ativos)
+    volumes = pd.DataFrame(1e7, index=datas, columns=ativos)
+    return precos, volumes
+
+
+def test_ativo_cancelado_nao_e_selecionado():
+    precos, volumes = _painel()
+    # Melhor ativo do painel deixa de ser negociado após 2017-09-29
+    ruido = np.random.default_rng(1).normal(0.004, 0.005, size=len(precos))
+    precos['ATV003'] = 20 * np.exp(np.cumsum(ruido))
+    cancelado = precos.index > '2017-09-29'
+    precos.loc[cancelado, 'ATV003'] = np.nan
+    volumes.loc[cancelado, 'ATV003'] = np.nan
+
+    selecao = SelecaoRolling(precos, volumes, janela_meses=48)
+    membros = selecao.executar(n_ativos=5)
+
+    datas = sorted(membros['data_rebalance'].unique())
+    assert [d.strftime('%Y-%m-%d') for d in datas] == ['2017-07-03', '2018-01-01', '2018-07-02']
+    # Ainda negociado em julho/2017; fora das seleções seguintes
+    assert 'ATV003' in set(membros.loc[membros['data_rebalance'] == '2017-07-03', 'ativo'])
+    assert 'ATV003' not in set(membros.loc[membros['data_rebalance'] > '2017-09-29', 'ativo'])
+    assert (membros.groupby('data_rebalance').size() == 5).all()
+
+
+def test_liquidez_reporta_cotacoes_do_ultimo_mes():
+    precos, volumes = _painel()
+    precos.loc[precos.index > '2017-09-29', 'ATV013'] = np.nan
+
+    selecao = SelecaoRolling(precos, volumes, janela_meses=48)
+    mes = int(np.flatnonzero(selecao.calendario.rotulos_fim_mes == '2018-01-31')[0])
+    liquidez = selecao.metricas_liquidez(mes)
+
+    assert liquidez.loc['ATV013', 'cotacoes_ultimo_mes'] == 0
+    assert liquidez.loc['ATV023', 'cotacoes_ultimo_mes'] == len(pd.bdate_range('2017-12-01', '2017-12-31'))
+    assert not selecao.filtrar_liquidez(liquidez)[1]
+
+
+def _frame_longo(semente=11):
+    """Frame longo com lacunas, retornos nulos, preço zero e listagem tardia"""
+    rng = np.random.default_rng(semente)
+    datas = pd.bdate_range('2012-01-02', '2019-12-31')
+    partes = []
+    for k in range(16):
+        n = len(datas)
+        precos = np.round(20 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n))), 1 if k % 3 == 0 else 2)
+        volumes = rng.lognormal(15.6, 0.6, n) * (rng.random(n) > 0.04)
+        manter = rng.random(n) > 0.06
+
+        if k == 1:
+            manter[:1300] = False      # Listagem tardia
+        elif k == 4:
+            precos[1100] = 0.0         # Preço zero isolado
+        elif k == 6:
+            manter[1500:] = False      # Cancelado
+
+        partes.append(pd.DataFrame({'Data': datas[manter], 'Ativo': f'ATV{k:02d}3',
+                                    'Preço': precos[manter], 'Volume$': volumes[manter]}))
+    return pd.concat(partes, ignore_index=True)
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_liquidez_igual_a_etapa_01_no_frame_truncado():
+    df = _frame_longo()
+    precos = df.pivot(index='Data', columns='Ativo', values='Preço')
+    volumes = df.pivot(index='Data', columns='Ativo', values='Volume$')
+    selecao = SelecaoRolling(precos, volumes, janela_meses=48)
+
+    carregador = carregador01.CarregadorEconomaticaProfissional.__new__(
+        carregador01.CarregadorEconomaticaProfissional)
+    carregador.logger = configuracao.get_logger('teste')
+    carregador.config = configuracao.get_config()
+
+    calendario = selecao.calendario
+    posicoes = selecao.posicoes_rebalance()
+    assert len(posicoes) == 8
+    for posicao in posicoes:
+        mes = int(np.searchsorted(calendario.posicoes_inicio_mes, posicao, side='right') - 1)
+        inicio = calendario.rotulos_fim_mes[mes - 48].to_period('M').start_time
+        truncado = df[(df['Data'] >= inicio) & (df['Data'] < calendario.datas[posicao])]
+
+        esperado = carregador.calcular_metricas_liquidez(truncado).set_index('ativo')
+        obtido = selecao.metricas_liquidez(mes)
+        colunas = ['volume_medio_diario', 'presenca_bolsa', 'pct_dias_sem_retorno',
+                   'autocorr_retornos', 'observacoes_totais']
+        pd.testing.assert_frame_equal(obtido.loc[esperado.index, colunas], esperado[colunas],
+                                      check_dtype=False, check_names=False, rtol=1e-9)
+
+        ultimo_mes = truncado['Data'] >= calendario.rotulos_fim_mes[mes - 1].to_period('M').start_time
+        negociados = set(truncado.loc[ultimo_mes, 'Ativo'])
+        elegiveis = set(carregador.filtrar_por_liquidez(esperado.reset_index())['ativo']) & negociados
+        assert set(selecao.ativos[selecao.filtrar_liquidez(obtido)]) == elegiveis
+
+    # Preço zero na janela: autocorrelação indefinida (-999), como na etapa 01
+    assert obtido.loc['ATV043', 'autocorr_retornos'] == -999
@@ -0,0 +1,109 @@
+"""Seleção top N com teto por setor e piso de setores: caso calculado à mão e força bruta em universos pequenos"""
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from selecao_setorial import limite_por_setor, selecionar_com_setores
+
+AUSENTE = 'Desconhecido'
+
+# Quatro bancos no topo do score: sem teto, a carteira de 5 teria 80% em Financeiro
+BANCOS_NO_TOPO = {
+    'ITUB4': ('Financeiro', 0.95), 'BBDC4': ('Financeiro', 0.90), 'BBAS3': ('Financeiro', 0.85),
+    'SANB11': ('Financeiro', 0.80), 'PETR4': ('Petróleo', 0.75), 'VALE3': ('Materiais', 0.70),
+    'WEGE3': ('Bens Industriais', 0.65), 'ABEV3': ('Consumo', 0.60),
+}
+
+
+def _bancos_no_topo():
+    ativos = list(BANCOS_NO_TOPO)
+    setores = {ativo: setor for ativo, (setor, _) in BANCOS_NO_TOPO.items()}
+    scores = [score for _, score in BANCOS_NO_TOPO.values()]
+    return ativos, scores, setores
+
+
+def test_teto_de_40_por_cento_troca_bancos_pelos_proximos_setores():
+    ativos, scores, setores = _bancos_no_topo()
+
+    # 40% de 5 ativos: no máximo 2 por setor
+    resultado = selecionar_com_setores(ativos, scores, setores, 5, 0.4, 3, AUSENTE)
+
+    assert resultado['ativos'] == ['ITUB4', 'BBDC4', 'PETR4', 'VALE3', 'WEGE3']
+    assert resultado['limite_por_setor'] == 2 and resultado['trocas_reparo'] == 0
+    financeiro = resultado['folgas'].set_index('setor').loc['Financeiro']
+    assert (financeiro['candidatos'], financeiro['selecionados'], financeiro['folga_ativos']) == (4, 2, 0)
+    assert financeiro['folga_peso'] == pytest.approx(0.0)
+
+
+def test_piso_de_setores_troca_o_pior_banco():
+    ativos, scores, setores = _bancos_no_topo()
+
+    # Teto de 2 por setor dá ITUB4, BBDC4, PETR4, VALE3 (3 setores); o piso pede 4
+    resultado = selecionar_com_setores(ativos, scores, setores, 4, 0.5, 4, AUSENTE)
+
+    assert resultado['ativos'] == ['ITUB4', 'PETR4', 'VALE3', 'WEGE3']
+    assert resultado['trocas_reparo'] == 1 and resultado['viavel']
+
+
+def _universo_sorteado(semente):
+    rng = np.random.default_rng(semente)
+    n_universo = int(rng.integers(5, 11))
+    ativos = [f'ATV{i}3' for i in range(n_universo)]
+    scores = rng.permutation(n_universo) + rng.random(n_universo) * 0.1   # Scores distintos
+    if rng.random() < 0.3:
+        scores[rng.integers(n_universo)] = np.nan
+    setores = {a: f'S{rng.integers(0, 4)}' for a in ativos if rng.random() > 0.15}
+    n_ativos = int(rng.integers(2, min(n_universo, 6) + 1))
+    peso_setor_max = float(rng.choice([0.25, 0.34, 0.5, 1.0]))
+    return ativos, scores, setores, n_ativos, peso_setor_max
+
+
+def _viaveis(ativos, scores, setores, n_ativos, peso_setor_max, setores_min):
+    """Força bruta: todos os subconjuntos de N ativos que respeitam teto e piso"""
+    limite = limite_por_setor(n_ativos, peso_setor_max)
+    validos = [i for i in range(len(ativos)) if not np.isnan(scores[i])]
+    for combinacao in combinations(validos, n_ativos):
+        contagem = Counter(setores.get(ativos[i], AUSENTE) for i in combinacao)
+        if any(n > limite for setor, n in contagem.items() if setor != AUSENTE):
+            continue
+        if sum(1 for setor in contagem if setor != AUSENTE) < setores_min:
+            continue
+        yield combinacao
+
+
+@pytest.mark.parametrize('semente', range(150))
+def test_teto_setorial_igual_a_forca_bruta(semente):
+    ativos, scores, setores, n_ativos, peso_setor_max = _universo_sorteado(semente)
+
+    resultado = selecionar_com_setores(ativos, scores, setores, n_ativos, peso_setor_max, 0, AUSENTE)
+
+    viaveis = list(_viaveis(ativos, scores, setores, n_ativos, peso_setor_max, 0))
+    if not viaveis:
+        assert not resultado['viavel']
+        return
+    melhor = max(viaveis, key=lambda c: sum(scores[i] for i in c))
+    assert resultado['viavel']
+    assert set(resultado['ativos']) == {ativos[i] for i in melhor}
+    assert [scores[ativos.index(a)] for a in resultado['ativos']] == sorted(
+        (scores[i] for i in melhor), reverse=True)
+
+
+@pytest.mark.parametrize('semente', range(150))
+def test_piso_de_setores_respeitado_quando_viavel(semente):
+    ativos, scores, setores, n_ativos, peso_setor_max = _universo_sorteado(semente)
+    setores_min = 1 + semente % 3
+
+    resultado = selecionar_com_setores(ativos, scores, setores, n_ativos, peso_setor_max,
+                                       setores_min, AUSENTE)
+
+    existe = next(_viaveis(ativos, scores, setores, n_ativos, peso_setor_max, setores_min), None)
+    assert resultado['viavel'] == (existe is not None)
+    if resultado['viavel']:
+        contagem = Counter(setores.get(a, AUSENTE) for a in resultado['ativos'])
+        limite = limite_por_setor(n_ativos, peso_setor_max)
+        assert len(resultado['ativos']) == n_ativos
+        assert all(n <= limite for setor, n in contagem.items() if setor != AUSENTE)
+        assert resultado['n_setores'] >= setores_min
@@ -0,0 +1,71 @@
+"""Testes da série do IBOVESPA: parser das grades anuais, retornos mensais e métricas relativas"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from serie_ibovespa import SerieBenchmarkIbovespa, ler_grade_evolucao_diaria, metricas_relativas
+
+CABECALHO = "Day;Jan;Feb;Mar;Apr;May;Jun;Jul;Aug;Sep;Oct;Nov;Dec"
+
+# 2017: março sem nenhum pregão; 30/fev é célula inválida da grade
+GRADE_2017 = [
+    "IBOVESPA - 2017", CABECALHO, "",
+    "2;60,000.00;;;;;;;;;;;",
+    "28;;63,000.00;;64,000.00;;;;;;;;",
+    "30;;1,000.00;;;;;;;;;;",
+    "31;62,000.00;;;;65,000.00;;;;;;;",
+    "LOWEST;60,000.00;63,000.00;;64,000.00;65,000.00;;;;;;;",
+    "HIGHEST;62,000.00;63,000.00;;64,000.00;65,000.00;;;;;;;",
+]
+GRADE_2016 = [
+    "IBOVESPA - 2016", CABECALHO, "",
+    "29;;;;;;;;;;;;59,500.00",
+    "30;;;;;;;;;;;;60,227.28",
+    "LOWEST;;;;;;;;;;;;59,500.00",
+]
+
+
+def _gravar(caminho, linhas):
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return caminho
+
+
+def test_grade_anual_em_serie_diaria(tmp_path):
+    serie = ler_grade_evolucao_diaria(_gravar(tmp_path / "Evolucao_Diaria.csv", GRADE_2017))
+
+    esperado = pd.Series([60000.0, 62000.0, 63000.0, 64000.0, 65000.0],
+                         index=pd.to_datetime(['2017-01-02', '2017-01-31', '2017-02-28',
+                                               '2017-04-28', '2017-05-31']))
+    pd.testing.assert_series_equal(serie, esperado, check_names=False, check_index_type=False,
+                                   check_freq=False)
+
+
+def test_retornos_mensais_nao_absorvem_mes_sem_pregao(config_temporaria, tmp_path):
+    arquivos = [_gravar(tmp_path / "Evolucao_Diaria.csv", GRADE_2017),
+                _gravar(tmp_path / "Evolucao_Diaria (1).csv", GRADE_2016)]
+    indice = pd.date_range('2017-01-31', periods=5, freq='ME')
+
+    retornos = SerieBenchmarkIbovespa(arquivos).retornos_mensais(indice)
+
+    assert list(retornos.index) == list(indice)
+    np.testing.assert_allclose(
+        retornos.to_numpy(),
+        [62000 / 60227.28 - 1, 63000 / 62000 - 1, np.nan, np.nan, 65000 / 64000 - 1])
+
+
+def test_metricas_relativas_usam_meses_em_comum():
+    indice = pd.date_range('2018-01-31', periods=5, freq='ME')
+    benchmark = pd.Series([np.nan, 0.02, -0.01, 0.03, 0.01], index=indice)
+    carteira = pd.Series([0.05, 0.03, -0.02, 0.05, 0.02], index=indice)
+
+    metricas = metricas_relativas(carteira, benchmark)
+
+    ativo = np.array([0.01, -0.01, 0.02, 0.01])
+    assert metricas['n_meses'] == 4
+    assert metricas['retorno_ativo_anual'] == pytest.approx(ativo.mean() * 12)
+    assert metricas['tracking_error_anual'] == pytest.approx(ativo.std(ddof=1) * np.sqrt(12))
+    assert metricas['information_ratio'] == pytest.approx(
+        ativo.mean() * 12 / (ativo.std(ddof=1) * np.sqrt(12)))
+    assert metricas['beta'] == pytest.approx(np.polyfit([0.02, -0.01, 0.03, 0.01],
+                                                        [0.03, -0.02, 0.05, 0.02], 1)[0])
@@ -0,0 +1,66 @@
+"""Testes da taxa livre de risco: composição do CDI por período e fallback constante"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import taxa_livre_risco
+from taxa_livre_risco import TaxaLivreRisco, obter_taxa_livre_risco
+
+
+def _gravar_cdi(caminho, taxas_pct):
+    """CSV no formato do BCB: data dd/mm/aaaa e % ao dia com vírgula decimal"""
+    linhas = ["data;valor"] + [f"{data:%d/%m/%Y};{str(valor).replace('.', ',')}"
+                               for data, valor in taxas_pct.items()]
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return caminho
+
+
+@pytest.fixture
+def cdi(config_temporaria, tmp_path):
+    """CDI de fev a abr/2019 com taxa diferente a cada dia (% ao dia)"""
+    dias = pd.bdate_range('2019-02-01', '2019-04-30')
+    taxas_pct = pd.Series(np.round(0.020 + 0.0005 * np.arange(len(dias)), 6), index=dias)
+    return TaxaLivreRisco(_gravar_cdi(tmp_path / 'cdi.csv', taxas_pct)), taxas_pct / 100
+
+
+def test_composicao_igual_ao_produto_por_mes(cdi):
+    rf, diaria = cdi
+    fins_mes = pd.date_range('2019-02-28', periods=3, freq='ME')
+
+    esperado = [np.prod(1 + diaria[diaria.index.to_period('M') == fim.to_period('M')]) - 1
+                for fim in fins_mes]
+    np.testing.assert_allclose(rf.compor(fins_mes).to_numpy(), esperado, rtol=1e-12)
+
+
+def test_alinhar_e_excesso_em_indice_desalinhado(cdi):
+    rf, diaria = cdi
+    # Datas de rebalance no meio do mês; jan/2019 e mai/2019 estão fora do arquivo
+    datas = pd.DatetimeIndex(['2019-01-15', '2019-02-15', '2019-03-15', '2019-05-15'])
+    constante = rf.taxa_mensal_constante
+
+    taxa = rf.alinhar(datas)
+    periodo = (diaria.index > pd.Timestamp('2019-02-15')) & (diaria.index <= pd.Timestamp('2019-03-15'))
+    assert taxa.iloc[0] == constante
+    assert taxa.iloc[1] == pytest.approx(np.prod(1 + diaria[diaria.index <= '2019-02-15']) - 1)
+    assert taxa.iloc[2] == pytest.approx(np.prod(1 + diaria[periodo]) - 1)
+    # Abr/2019 tem CDI: o período (15/mar, 15/mai] é composto só com os dias disponíveis
+    assert taxa.iloc[3] == pytest.approx(np.prod(1 + diaria[diaria.index > '2019-03-15']) - 1)
+
+    retornos = pd.DataFrame({'EW': [0.01, 0.02, -0.01, 0.03], 'ERC': [0.0, 0.01, 0.02, -0.02]},
+                            index=datas)
+    excesso = rf.excesso(retornos)
+    pd.testing.assert_frame_equal(excesso, retornos.sub(taxa.to_numpy(), axis=0))
+    pd.testing.assert_series_equal(rf.excesso(retornos['EW']), retornos['EW'] - taxa,
+                                   check_names=False)
+
+
+def test_sem_arquivo_usa_a_constante_antiga(config_temporaria, monkeypatch):
+    monkeypatch.setattr(taxa_livre_risco, '_TAXAS', {})
+    rf = obter_taxa_livre_risco()
+    datas = pd.date_range('2019-01-31', periods=12, freq='ME')
+
+    assert rf.constante
+    assert rf.alinhar(datas).eq(0.0624 / 12).all()
+    assert rf.media_mensal(datas) == pytest.approx(0.0624 / 12)
+    assert obter_taxa_livre_risco() is rf
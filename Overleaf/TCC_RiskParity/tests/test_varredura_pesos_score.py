@@ -0,0 +1,66 @@
+"""Varredura de pesos do Score Composto: mesma seleção da etapa 01 e sorteios reprodutíveis"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import carregar_modulo, configuracao
+from metricas_selecao import PESOS_RANK
+from varredura_pesos_score import executar_varredura, grade_simplex, varrer_pesos
+
+carregador01 = carregar_modulo('carregador01', '01_carregador_economatica_v2.py')
+
+# ITUB4/BBDC4 e GGBR4/CSNA3 têm métricas idênticas (empates em qualquer ponderação)
+METRICAS = pd.DataFrame(
+    [['ITUB4', 0.30, 0.25, 0.20, 0.15],
+     ['BBDC4', 0.30, 0.25, 0.20, 0.15],
+     ['BBAS3', 0.25, 0.22, 0.18, 0.14],
+     ['EGIE3', 0.10, 0.15, 0.10, 0.08],
+     ['TAEE11', 0.12, 0.18, 0.12, 0.10],
+     ['LREN3', 0.20, 0.30, 0.25, 0.20],
+     ['MGLU3', 0.05, 0.12, 0.08, 0.06],
+     ['GGBR4', 0.15, 0.28, 0.22, 0.18],
+     ['CSNA3', 0.15, 0.28, 0.22, 0.18]],
+    columns=['ativo', 'momentum_12_1', 'volatilidade_anual', 'max_drawdown', 'downside_deviation'])
+
+# CSNA3 fora do cadastro; com N = 5 e peso_setor_max = 40%, no máximo 2 bancos
+SETORES = {'ITUB4': 'Financeiro', 'BBDC4': 'Financeiro', 'BBAS3': 'Financeiro',
+           'EGIE3': 'Utilidade Pública', 'TAEE11': 'Utilidade Pública',
+           'LREN3': 'Consumo Cíclico', 'MGLU3': 'Consumo Cíclico', 'GGBR4': 'Materiais Básicos'}
+
+
+@pytest.mark.parametrize('setores', [None, SETORES], ids=['sem_setores', 'com_setores'])
+def test_cada_ponderacao_seleciona_o_mesmo_que_a_etapa_01(config_temporaria, monkeypatch, setores):
+    carregador = carregador01.CarregadorEconomaticaProfissional.__new__(
+        carregador01.CarregadorEconomaticaProfissional)
+    carregador.logger = configuracao.get_logger('teste')
+    carregador.config = config_temporaria
+
+    pesos_base = dict(config_temporaria.SCORE_WEIGHTS)
+    pesos = grade_simplex(0.25)
+    resultado = varrer_pesos(METRICAS, pesos, n_ativos=5, setores=setores)
+
+    for k, linha in enumerate(pesos):
+        monkeypatch.setattr(config_temporaria, 'SCORE_WEIGHTS', dict(zip(PESOS_RANK, linha)))
+        # Sem setores: o cadastro não existe no data_dir temporário e a etapa 01 usa o top N puro
+        selecao = carregador.selecionar_top_ativos(carregador.calcular_score_composto(METRICAS),
+                                                   n_ativos=5, setores=setores)
+        assert resultado['resumo'].loc[k, 'ativos'] == ';'.join(selecao['ativos_selecionados'])
+
+    monkeypatch.setattr(config_temporaria, 'SCORE_WEIGHTS', pesos_base)
+    base = carregador.selecionar_top_ativos(carregador.calcular_score_composto(METRICAS),
+                                           n_ativos=5, setores=setores)
+    assert resultado['selecao_base'] == base['ativos_selecionados']
+
+
+def test_sorteios_nao_dependem_do_gerador_compartilhado(config_temporaria):
+    primeira = executar_varredura(METRICAS, n_pesos=300, n_ativos=5, setores=SETORES)
+    config_temporaria.rng.random(1000)   # Outro código consumindo o gerador do processo
+    segunda = executar_varredura(METRICAS, n_pesos=300, n_ativos=5, setores=SETORES)
+
+    pd.testing.assert_frame_equal(primeira['resumo'], segunda['resumo'])
+    assert primeira['estatisticas'] == segunda['estatisticas']
+
+    outra = executar_varredura(METRICAS, n_pesos=300, n_ativos=5, setores=SETORES,
+                               semente=config_temporaria.SEED + 1)
+    assert not np.allclose(outra['resumo']['peso_momentum'], primeira['resumo']['peso_momentum'])